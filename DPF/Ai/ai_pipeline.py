@@ -1,9 +1,23 @@
-import torch
-import spacy
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM, pipeline, T5ForConditionalGeneration
-from langdetect import detect, LangDetectException
+import hashlib
+import logging
+import math
 import os
-from typing import List, Union, Dict
+import re
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, List, Optional, Union, Dict, Tuple
+
+from Ai.backends import get_backend, load_seq2seq
+from Ai import budget
+from Ai.batching import MicroBatcher
+from Ai.candidate_ranking import Candidate, acceptance_stats, rank_candidates
+from Ai import langid, question_engine, tracing, translation
+from Ai.model_client import get_client
+from Ai.model_registry import registry
+
+logger = logging.getLogger(__name__)
 
 # --- CONFIGURATION (PATHS & HYPERPARAMETERS) ---
 
@@ -13,6 +27,7 @@ AI_MODULE_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 # Căi de model calculate (ESENȚIAL pentru rezolvarea erorii Repo ID)
 QUIZ_MODEL_PATH = os.path.join(AI_MODULE_BASE_DIR, "quiz_model")          
 SUMM_MODEL_PATH = os.path.join(AI_MODULE_BASE_DIR, "t5-large")
+SMALL_SUMM_MODEL_PATH = os.path.join(AI_MODULE_BASE_DIR, "t5_small_summarizer")  # nivelul rapid, sub termen limită
 TRANSLATION_MODEL_NAME = "Helsinki-NLP/opus-mt-mul-en"
 TRANSLATION_BACK_MODEL_NAME = "Helsinki-NLP/opus-mt-en-mul" 
 
@@ -20,76 +35,111 @@ TRANSLATION_BACK_MODEL_NAME = "Helsinki-NLP/opus-mt-en-mul"
 MAX_SRC_LEN_SUMM = 1024
 MAX_SRC_LEN_QUIZ = 196
 MAX_TARGET_LEN_QUIZ = 96
-
-# Setare Dispozitiv
-device = torch.device(
-    "mps" if torch.backends.mps.is_available()
-    else "cuda" if torch.cuda.is_available()
-    else "cpu"
-)
+# Rezumare: câte texte intră într-un apel generate și câte niveluri map-reduce sunt permise
+SUMM_BATCH_SIZE = int(os.getenv("DPF_SUMM_BATCH_SIZE", "8"))
+SUMM_MAX_DEPTH = int(os.getenv("DPF_SUMM_MAX_DEPTH", "3"))
+# Câți candidați (propoziție, răspuns) intră într-un apel generate al modelului de quiz
+QUIZ_BATCH_SIZE = int(os.getenv("DPF_QUIZ_BATCH_SIZE", "8"))
+# Câți candidați (cei mai buni după scor) pot ajunge la model, ca multiplu al numărului de întrebări cerute
+QUIZ_TOP_K_FACTOR = float(os.getenv("DPF_QUIZ_TOP_K_FACTOR", "2"))
+# Câte întrebări returnează pipeline-ul (și afișează pagina lecției)
+MAX_QUIZ_RESULTS = 3
+
+# Micro-batching între cereri concurente pentru summarize()/generate_question();
+# fereastra 0 îl dezactivează (fiecare apel rulează imediat, ca înainte)
+BATCH_WINDOW_MS = float(os.getenv("DPF_AI_BATCH_WINDOW_MS", "0"))
+BATCH_MAX_SIZE = int(os.getenv("DPF_AI_MAX_BATCH", "8"))
+
+# Se incrementează când se schimbă logica pipeline-ului (invalidează rezultatele salvate)
+PIPELINE_VERSION = "9"
 
 # ==============================================================================
-# 1. INITIALIZARE TOATE MODELELE & VARIABILE GLOBALE
+# 1. INCARCARE LENEȘĂ A MODELELOR (la prima utilizare, prin registry)
 # ==============================================================================
-
-models = {}
-ORIGINAL_LANG = 'en' # Variabila globală
-nlp = None
-translator = None
-translator_back = None
-tok_quiz, model_quiz = None, None
-tok_summ, model_summ = None, None
+# torch / transformers / spaCy se importă abia în loadere, ca procesele care nu
+# folosesc AI (migrate, import_elevi, workerii fără cereri AI) să pornească rapid.
+
+# Componente spaCy de care quiz-ul nu are nevoie (sents/noun_chunks vin din parser, tipurile din ner)
+SPACY_UNUSED_PIPES = ["lemmatizer"]
+PRIMARY_NER_LABELS = ('PERSON', 'ORG', 'DATE', 'GPE', 'LOC', 'CARDINAL', 'EVENT', 'TIME', 'PRODUCT', 'NORP', 'LANGUAGE')
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+_batchers = {}
+_batchers_lock = threading.Lock()
+
+
+def _make_summarizer_loader(path: str):
+    def _load():
+        from transformers import AutoTokenizer
+        tok = AutoTokenizer.from_pretrained(path)
+        return tok, load_seq2seq(path)
+    return _load
+
+
+def _load_quiz_model():
+    from transformers import AutoTokenizer
+    tok = AutoTokenizer.from_pretrained(QUIZ_MODEL_PATH)
+    return tok, load_seq2seq(QUIZ_MODEL_PATH)
+
+
+def _load_spacy():
+    import spacy
+    return spacy.load("en_core_web_sm")
+
+
+def _make_translation_loader(model_name: str):
+    def _load():
+        # Modelul MarianMT direct (fără pipeline), ca Ai/translation.py să poată face loturi cu padding
+        from transformers import AutoTokenizer
+        tok = AutoTokenizer.from_pretrained(model_name)
+        return tok, load_seq2seq(model_name, backend="torch")
+    return _load
+
+
+registry.register('summarize', _make_summarizer_loader(SUMM_MODEL_PATH))
+# Nivelul mic este opțional: planificarea îl ia în calcul doar dacă modelul este pe disc
+registry.register('summarize_small', _make_summarizer_loader(SMALL_SUMM_MODEL_PATH),
+                  check=lambda: os.path.isfile(os.path.join(SMALL_SUMM_MODEL_PATH, "config.json")))
+registry.register('quiz', _load_quiz_model)
+registry.register('nlp', _load_spacy)
+registry.register('translate', _make_translation_loader(TRANSLATION_MODEL_NAME))
+registry.register('translate_back', _make_translation_loader(TRANSLATION_BACK_MODEL_NAME))
+
+
+def _fingerprint_model(path_or_name: str) -> str:
+    """Amprenta unui model: config.json + dimensiune/mtime ale fișierelor de greutăți."""
+    if not os.path.isdir(path_or_name):
+        return path_or_name  # model de pe Hub, identificat prin nume
+    parts = [os.path.basename(path_or_name)]
+    for fname in sorted(os.listdir(path_or_name)):
+        fpath = os.path.join(path_or_name, fname)
+        if fname == "config.json":
+            with open(fpath, "rb") as f:
+                parts.append(hashlib.sha256(f.read()).hexdigest())
+        elif fname.endswith((".safetensors", ".bin")):
+            st = os.stat(fpath)
+            parts.append(f"{fname}:{st.st_size}:{int(st.st_mtime)}")
+    return "|".join(parts)
+
+
+@lru_cache(maxsize=None)
+def model_version() -> str:
+    """
+    Versiunea modelelor folosite de pipeline. Intră în cheia rezultatelor
+    salvate, astfel încât schimbarea unui model invalidează cache-ul.
+    """
+    parts = [PIPELINE_VERSION, get_backend()] + [
+        _fingerprint_model(p) for p in (SUMM_MODEL_PATH, SMALL_SUMM_MODEL_PATH, QUIZ_MODEL_PATH,
+                                        TRANSLATION_MODEL_NAME, TRANSLATION_BACK_MODEL_NAME)
+    ]
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()[:16]
 
 
-def load_model_components():
-    global nlp, translator, translator_back, tok_quiz, model_quiz, tok_summ, model_summ
-    
-    # --- Încărcare Modele de Rezumare ---
-    try:
-        tok_summ = AutoTokenizer.from_pretrained(SUMM_MODEL_PATH)
-        model_summ = AutoModelForSeq2SeqLM.from_pretrained(SUMM_MODEL_PATH).to(device)
-        model_summ.eval()
-        models['summarize'] = True
-    except Exception as e:
-        print(f"EROARE: Nu s-a putut încărca modelul de rezumare ({SUMM_MODEL_PATH}): {e}")
-        models['summarize'] = False
-        return
-
-    # --- Încărcare Modele de Generare Quiz ---
-    try:
-        tok_quiz = AutoTokenizer.from_pretrained(QUIZ_MODEL_PATH)
-        model_quiz = T5ForConditionalGeneration.from_pretrained(QUIZ_MODEL_PATH).to(device)
-        model_quiz.eval()
-        nlp = spacy.load("en_core_web_sm")
-        models['quiz'] = True
-    except Exception as e:
-        print(f"EROARE: Nu s-a putut încărca modelul de quiz/spaCy ({QUIZ_MODEL_PATH}): {e}")
-        models['quiz'] = False
-        return
-        
-    # --- Încărcare Modele de Traducere ---
-    try:
-        trans_tok = AutoTokenizer.from_pretrained(TRANSLATION_MODEL_NAME)
-        trans_model = AutoModelForSeq2SeqLM.from_pretrained(TRANSLATION_MODEL_NAME).to(device)
-        global translator
-        translator = pipeline("translation", model=trans_model, tokenizer=trans_tok, device=0 if device.type != 'cpu' else -1)
-        
-        back_trans_tok = AutoTokenizer.from_pretrained(TRANSLATION_BACK_MODEL_NAME)
-        back_trans_model = AutoModelForSeq2SeqLM.from_pretrained(TRANSLATION_BACK_MODEL_NAME).to(device)
-        global translator_back
-        translator_back = pipeline("translation", model=back_trans_model, tokenizer=back_trans_tok, device=0 if device.type != 'cpu' else -1)
-        
-        models['translate'] = True
-        models['translate_back'] = True
-        print(f"🎉 Toate modelele necesare au fost încărcate cu succes.")
-    except Exception as e:
-        print(f"Atenție: Eroare la încărcarea modelelor de traducere. Traducerea este dezactivată: {e}")
-        models['translate'] = False
-        models['translate_back'] = False
-        translator = None 
-
-# Apelare funcție de încărcare
-load_model_components()
+def warm_up(components=None) -> Dict:
+    """
+    Încarcă explicit modelele (implicit toate) înainte de primele cereri.
+    Returnează timpul de încărcare per componentă (None = eșec).
+    """
+    return registry.warm_up(components)
 
 
 # ==============================================================================
@@ -111,86 +161,303 @@ def keep_complete_sentences(text: str) -> str:
     return t[:i]
 
 
-def translate_back_to_original(text_list: List[str]) -> List[str]:
+@dataclass
+class PipelineContext:
+    """
+    Starea unei singure rulări a pipeline-ului (limba detectată etc.).
+    Înlocuiește fostul global ORIGINAL_LANG, ca run_full_pipeline să poată rula
+    în paralel din mai multe fire fără ca rulările să-și suprascrie limba.
+    """
+    original_lang: str = 'en'
+    translated: bool = False  # textul a fost tradus în engleză la intrare
+    content_key: Optional[str] = None  # hash-ul materialului, cheia cache-ului de limbă (altfel hash-ul textului)
+
+
+def detect_language(text: str, key: str = None) -> str:
+    """Codul limbii textului ('en' dacă nu poate fi detectată); eșantionat și memorat de Ai/langid.py."""
+    return langid.detect(text, key)
+
+
+def translate_back_to_original(text_list: List[str], ctx: PipelineContext) -> List[str]:
     """
-    Traduci o listă de stringuri din Engleză înapoi în limba originală (ORIGINAL_LANG).
+    Traduci o listă de stringuri din Engleză înapoi în limba originală (ctx.original_lang).
     """
-    if not models.get('translate_back') or ORIGINAL_LANG == 'en': return text_list
-    target_prefix = f">>{ORIGINAL_LANG}<<"
-    prefixed_texts = [target_prefix + " " + t for t in text_list]
+    if not ctx.translated or ctx.original_lang == 'en' or not registry.available('translate_back'): return text_list
     try:
-        print(f"Traducere înapoi în [{ORIGINAL_LANG}]...")
-        results = translator_back(prefixed_texts, max_length=1024, truncation=True)
-        translated_texts = [res['translation_text'] for res in results]
-        return translated_texts
+        print(f"Traducere înapoi în [{ctx.original_lang}]...")
+        return translation.translate_many(text_list, 'translate_back', TRANSLATION_BACK_MODEL_NAME,
+                                          'en', ctx.original_lang, target_token=True)
     except Exception as e:
         print(f"Eroare la traducerea înapoi. Se returnează textul în Engleză: {e}")
         return text_list
 
 
-def detect_and_translate(text: str) -> str:
-    """Detectează limba și traduce textul în Engleză dacă nu este deja 'en'."""
-    global ORIGINAL_LANG
-    if not models['translate'] or not text.strip(): ORIGINAL_LANG = 'en'; return text
+def detect_and_translate(text: str, ctx: PipelineContext) -> str:
+    """Detectează limba (salvată în ctx) și traduce textul în Engleză dacă nu este deja 'en'."""
+    ctx.original_lang = detected_lang = detect_language(text, ctx.content_key)
+    if detected_lang == 'en' or not registry.available('translate'): return text
+
+    print(f"Traducere din {detected_lang} în Engleză...")
     try:
-        detected_lang = detect(text)
-        ORIGINAL_LANG = detected_lang
-    except LangDetectException:
-        detected_lang = "unknown"; ORIGINAL_LANG = 'en'
-    if detected_lang == 'en': return text
-
-    if translator:
-        print(f"Traducere din {detected_lang} în Engleză...")
-        try:
-            result = translator(text, max_length=1024, truncation=True)
-            print ("Traducere finalizată (EN):" , result[0]['translation_text'][:50] + "..." )
-            return result[0]['translation_text']
-        except Exception as e:
-            print(f"Eroare la traducere. Se folosește textul original: {e}")
-            return text
-    return text
+        # Propoziție cu propoziție, în loturi și prin memoria de traduceri
+        result = translation.translate_many([text], 'translate', TRANSLATION_MODEL_NAME, detected_lang, 'en')[0]
+        print ("Traducere finalizată (EN):" , result[:50] + "..." )
+        ctx.translated = True
+        return result
+    except Exception as e:
+        print(f"Eroare la traducere. Se folosește textul original: {e}")
+        return text
+
+
+def _get_batcher(name: str):
+    """Scheduler-ul de micro-batching pentru `name`, sau None dacă este dezactivat (fereastra 0)."""
+    if BATCH_WINDOW_MS <= 0: return None
+    with _batchers_lock:
+        if name not in _batchers:
+            process = {
+                'summarize': lambda texts, key: _summarize_direct(texts, *key),
+                'quiz': lambda pairs, key: _generate_questions_direct(pairs, *key),
+            }[name]
+            _batchers[name] = MicroBatcher(name, process, BATCH_WINDOW_MS, BATCH_MAX_SIZE)
+        return _batchers[name]
+
+
+def batching_stats() -> Dict:
+    """Adâncimea cozii, histograma loturilor și timpii de așteptare, per scheduler."""
+    return {name: batcher.stats() for name, batcher in _batchers.items()}
 
 
-def summarize(texts: Union[str, List[str]], max_new_tokens: int = 150, num_beams: int = 4) -> List[str]:
-    """Efectuează rezumarea pe textul procesat (deja tradus)."""
-    if isinstance(texts, str): texts = [texts]; summaries = []
-    for original_text in texts:
+def summarize(texts: Union[str, List[str]], max_new_tokens: int = 150, num_beams: int = 4,
+              tier: str = "large") -> List[str]:
+    """
+    Efectuează rezumarea pe textul procesat (deja tradus), cu rezumatorul nivelului `tier`.
+    Cu micro-batching activ, textele sunt grupate cu cele ale altor cereri concurente.
+    """
+    if isinstance(texts, str): texts = [texts]
+    batcher = _get_batcher('summarize')
+    if batcher:
+        return batcher.run_many(texts, key=(max_new_tokens, num_beams, tier))
+    return _summarize_direct(texts, max_new_tokens, num_beams, tier)
+
+
+def _summarize_direct(texts: List[str], max_new_tokens: int, num_beams: int, tier: str = "large") -> List[str]:
+    """Listele sunt procesate în loturi de SUMM_BATCH_SIZE, cu padding la cel mai lung text din lot."""
+    import torch
+    component = budget.SUMM_TIERS[tier]
+    tok_summ, model_summ = registry.get(component)
+    device = model_summ.device  # cpu pentru backend-urile int8/onnx
+    summaries = []
+    for start in range(0, len(texts), SUMM_BATCH_SIZE):
         # Aici se folosește textul deja tradus/procesat (din apelul run_full_pipeline)
-        processed_text = original_text 
-        
-        enc = tok_summ([processed_text], return_tensors="pt", padding=True, truncation=True, max_length=MAX_SRC_LEN_SUMM).to(device)
-        with torch.no_grad():
+        batch = texts[start:start + SUMM_BATCH_SIZE]
+
+        enc = tok_summ(batch, return_tensors="pt", padding=True, truncation=True, max_length=MAX_SRC_LEN_SUMM).to(device)
+        with tracing.stage("summarize.generate") as st, torch.no_grad():
+            start_gen = time.perf_counter()
             out = model_summ.generate(
                 **enc, max_new_tokens=max_new_tokens, num_beams=num_beams, length_penalty=0.3,
             )
-        summary_raw = tok_summ.decode(out[0], skip_special_tokens=True)
-        summaries.append(keep_complete_sentences(summary_raw)) 
+            budget.cost_model.observe(component, time.perf_counter() - start_gen, out.shape[-1], num_beams)
+            st.add(**_token_counts(enc, out, tok_summ))
+        for summary_raw in tok_summ.batch_decode(out, skip_special_tokens=True):
+            summaries.append(keep_complete_sentences(summary_raw))
     return summaries
 
-def get_answer_type(answer: str) -> str:
-    doc = nlp(answer)
-    if doc.ents: return doc.ents[0].label_
+
+def _token_counts(enc, out, tok) -> Dict:
+    """Tokenii reali (fără padding) intrați și ieșiți dintr-un apel generate, pentru trace."""
+    return {
+        "calls": 1, "inputs": len(enc["input_ids"]),
+        "tokens_in": int(enc["attention_mask"].sum()),
+        "tokens_out": int((out != tok.pad_token_id).sum()),
+    }
+
+
+def split_sentences(text: str) -> List[str]:
+    """Împarte textul în propoziții (după . ! ? urmate de spațiu); fără spaCy, e doar pentru chunking."""
+    return [s.strip() for s in _SENTENCE_END_RE.split(text) if s.strip()]
+
+
+def _summ_input_limit(model_summ) -> int:
+    """Numărul maxim de tokeni pe care modelul de rezumare îi vede efectiv (n_positions pentru T5)."""
+    n_positions = getattr(model_summ.config, "n_positions", None) or MAX_SRC_LEN_SUMM
+    return min(MAX_SRC_LEN_SUMM, n_positions)
+
+
+def chunk_sentences(sentences: List[str], tok, max_tokens: int) -> List[str]:
+    """
+    Grupează propozițiile consecutive în bucăți de cel mult `max_tokens` tokeni.
+    O propoziție mai lungă decât limita devine singură o bucată (și va fi trunchiată).
+    """
+    if not sentences: return []
+    lengths = [len(ids) for ids in tok(sentences, add_special_tokens=False)["input_ids"]]
+    chunks, current, current_len = [], [], 0
+    for sentence, n_tokens in zip(sentences, lengths):
+        if current and current_len + n_tokens > max_tokens:
+            chunks.append(" ".join(current)); current, current_len = [], 0
+        current.append(sentence); current_len += n_tokens
+    if current: chunks.append(" ".join(current))
+    return chunks
+
+
+def _summarize_streaming(text: str, max_new_tokens: int, on_token: Callable[[str], None], tier: str = "large") -> str:
+    """
+    Rezumă un singur text cu decodare greedy și trimite fiecare fragment nou la
+    `on_token` cât timp generate încă rulează (TextIteratorStreamer nu suportă beam search).
+    """
+    import torch
+    from transformers import TextIteratorStreamer
+    component = budget.SUMM_TIERS[tier]
+    tok_summ, model_summ = registry.get(component)
+    enc = tok_summ([text], return_tensors="pt", truncation=True, max_length=MAX_SRC_LEN_SUMM).to(model_summ.device)
+    streamer = TextIteratorStreamer(tok_summ, skip_prompt=True, skip_special_tokens=True)
+    errors = []
+
+    def _generate():
+        try:
+            with torch.no_grad():
+                model_summ.generate(**enc, max_new_tokens=max_new_tokens, num_beams=1, length_penalty=0.3,
+                                    streamer=streamer)
+        except Exception as e:
+            errors.append(e)
+            streamer.end()
+
+    thread = threading.Thread(target=_generate, name="summarize-stream", daemon=True)
+    with tracing.stage("summarize.generate") as st:
+        start = time.perf_counter()
+        thread.start()
+        parts = []
+        for piece in streamer:
+            if not piece: continue
+            if not parts:
+                ttft = time.perf_counter() - start
+                st.add(ttft_ms=round(ttft * 1000))
+                logger.info("Rezumare: primul token după %.3fs de generare", ttft)
+            parts.append(piece)
+            on_token(piece)
+        thread.join()
+        if errors: raise errors[0]
+        text_out = "".join(parts)
+        tokens_out = len(tok_summ(text_out, add_special_tokens=False)["input_ids"])
+        budget.cost_model.observe(component, time.perf_counter() - start, tokens_out, 1)
+        st.add(calls=1, inputs=1, tokens_in=int(enc["attention_mask"].sum()), tokens_out=tokens_out)
+    return keep_complete_sentences(text_out)
+
+
+def summarize_long(text: str, max_new_tokens: int = 150, num_beams: int = 4, max_depth: int = SUMM_MAX_DEPTH,
+                   prefix: str = "summarize: ", on_token: Callable[[str], None] = None, tier: str = "large") -> str:
+    """
+    Rezumare ierarhică (map-reduce) pentru texte mai lungi decât fereastra modelului.
+
+    Textul este împărțit în bucăți aliniate la propoziții, bucățile sunt rezumate
+    împreună (în loturi cu padding), apoi rezumatele parțiale concatenate sunt
+    rezumate din nou, până încap într-o singură fereastră sau se atinge `max_depth`.
+    Fiecare nivel procesează textul o singură dată, deci costul crește liniar cu lungimea.
+    Un text care încape deja într-o fereastră face un singur apel, ca înainte.
+    Cu `on_token` și num_beams=1, ultimul nivel (rezumatul final) este transmis token cu token.
+    Cu beam search, `on_token` primește în schimb rezumatele bucăților din primul
+    nivel, pe măsură ce se termină fiecare lot (progres pe bucăți, nu pe tokeni).
+    `tier` alege rezumatorul ("large" sau "small", vezi Ai/budget.py).
+    """
+    tok_summ, model_summ = registry.get(budget.SUMM_TIERS[tier])
+    limit = _summ_input_limit(model_summ) - len(tok_summ(prefix, add_special_tokens=False)["input_ids"]) - 1
+
+    current = text
+    report_chunks = on_token is not None and num_beams > 1
+    for _ in range(max_depth):
+        chunks = chunk_sentences(split_sentences(current), tok_summ, limit)
+        if len(chunks) <= 1: break
+        inputs = [prefix + chunk for chunk in chunks]
+        if report_chunks:
+            partials = []
+            for start in range(0, len(inputs), SUMM_BATCH_SIZE):
+                batch = summarize(inputs[start:start + SUMM_BATCH_SIZE], max_new_tokens, num_beams, tier)
+                on_token((" " if partials else "") + " ".join(p for p in batch if p))
+                partials.extend(batch)
+            report_chunks = False
+        else:
+            partials = summarize(inputs, max_new_tokens, num_beams, tier)
+        current = " ".join(p for p in partials if p)
+    if on_token and num_beams == 1:
+        return _summarize_streaming(prefix + current, max_new_tokens, on_token, tier)
+    return summarize(prefix + current, max_new_tokens, num_beams, tier)[0]
+
+
+def annotate(text: str):
+    """Un singur parse spaCy, fără componentele nefolosite de quiz."""
+    return registry.get('nlp')(text, disable=SPACY_UNUSED_PIPES)
+
+def get_answer_type(answer) -> str:
+    """Tipul răspunsului: eticheta primei entități din span (sau dintr-un parse nou, pentru string)."""
+    span = annotate(answer) if isinstance(answer, str) else answer
+    if span.ents: return span.ents[0].label_
     return "CONCEPT" 
 
-def extract_answers_using_ner(context: str) -> list[str]:
-    doc = nlp(context); potential_answers = []; seen_answers = set()
-    primary_ner_labels = ['PERSON', 'ORG', 'DATE', 'GPE', 'LOC', 'CARDINAL', 'EVENT', 'TIME', 'PRODUCT', 'NORP', 'LANGUAGE']
-    for ent in doc.ents:
+def extract_answer_candidates(span) -> List[Tuple[str, str]]:
+    """
+    Candidații (răspuns, tip) dintr-un span deja adnotat (de obicei o propoziție
+    din Doc-ul întregului text): entitățile NER, apoi noun chunk-urile.
+    Tipul se citește direct din etichetele span-ului, fără un nou nlp(answer).
+    """
+    candidates = []; seen_answers = set()
+    for ent in span.ents:
         answer_text = ent.text.strip()
-        if ent.label_ in primary_ner_labels and len(answer_text) > 3 and answer_text not in seen_answers:
-            potential_answers.append(answer_text); seen_answers.add(answer_text)
-    for chunk in doc.noun_chunks:
+        if ent.label_ in PRIMARY_NER_LABELS and len(answer_text) > 3 and answer_text not in seen_answers:
+            candidates.append((answer_text, ent.label_)); seen_answers.add(answer_text)
+    for chunk in span.noun_chunks:
         answer_text = chunk.text.strip()
         if len(answer_text.split()) > 1 and len(answer_text) > 6 and answer_text not in seen_answers and not answer_text.lower().startswith(('the ', 'a ', 'an ')):
-            potential_answers.append(answer_text); seen_answers.add(answer_text)
-    return potential_answers
+            candidates.append((answer_text, get_answer_type(chunk))); seen_answers.add(answer_text)
+    return candidates
+
+def extract_answers_using_ner(context) -> list[str]:
+    """Răspunsurile candidate dintr-un text (parsat acum) sau dintr-un span deja adnotat."""
+    span = annotate(context) if isinstance(context, str) else context
+    return [answer for answer, _ in extract_answer_candidates(span)]
+
+def generate_questions_batch(pairs: List[Tuple[str, str]], num_beams: int = 4) -> List[str]:
+    """
+    Generează câte o întrebare pentru fiecare pereche (context, răspuns) într-un
+    singur apel generate. Padding-ul este dinamic (la cel mai lung input din lot).
+    Cu micro-batching activ, perechile sunt grupate cu cele ale altor cereri concurente.
+    """
+    if not pairs: return []
+    batcher = _get_batcher('quiz')
+    if batcher:
+        return batcher.run_many(list(pairs), key=(num_beams,))
+    return _generate_questions_direct(pairs, num_beams)
+
+def _generate_questions_direct(pairs: List[Tuple[str, str]], num_beams: int) -> List[str]:
+    import torch
+    tok_quiz, model_quiz = registry.get('quiz')
+    if hasattr(model_quiz, "get_encoder") and get_backend() != "onnx":
+        return _generate_questions_grouped(pairs, num_beams, tok_quiz, model_quiz)
+    input_texts = [f"answer: {answer} context: {context}" for context, answer in pairs]
+    enc = tok_quiz(input_texts, max_length=MAX_SRC_LEN_QUIZ, truncation=True, padding=True, return_tensors="pt").to(model_quiz.device)
+    with tracing.stage("quiz.generate") as st, torch.no_grad():
+        start_gen = time.perf_counter()
+        outputs = model_quiz.generate(**enc, max_length=MAX_TARGET_LEN_QUIZ, num_beams=num_beams, early_stopping=True)
+        budget.cost_model.observe('quiz', time.perf_counter() - start_gen, outputs.shape[-1], num_beams)
+        st.add(**_token_counts(enc, outputs, tok_quiz))
+    return tok_quiz.batch_decode(outputs, skip_special_tokens=True)
+
+def _generate_questions_grouped(pairs, num_beams: int, tok_quiz, model_quiz) -> List[str]:
+    """Encoder-ul rulează o dată per propoziție (Ai/question_engine.py), generate o dată pe lot."""
+    import torch
+    with tracing.stage("quiz.generate") as st, torch.no_grad():
+        start_gen = time.perf_counter()
+        outputs, stats = question_engine.generate(tok_quiz, model_quiz, pairs, MAX_SRC_LEN_QUIZ,
+                                                  max_length=MAX_TARGET_LEN_QUIZ, num_beams=num_beams,
+                                                  early_stopping=True)
+        budget.cost_model.observe('quiz', time.perf_counter() - start_gen, outputs.shape[-1], num_beams)
+        st.add(calls=1, inputs=len(pairs), tokens_in=stats["tokens_real"],
+               tokens_out=int((outputs != tok_quiz.pad_token_id).sum()),
+               encoder_tokens=stats["tokens_grouped"], encoder_tokens_saved=stats["tokens_batch"] - stats["tokens_grouped"],
+               groups=stats["groups"], duplicates=stats["duplicates"])
+    return tok_quiz.batch_decode(outputs, skip_special_tokens=True)
 
 def generate_question(context: str, answer: str) -> str:
-    input_text = f"answer: {answer} context: {context}"
-    input_ids = tok_quiz(input_text, max_length=MAX_SRC_LEN_QUIZ, truncation=True, return_tensors="pt").input_ids.to(device)
-    with torch.no_grad():
-        outputs = model_quiz.generate(input_ids=input_ids, max_length=MAX_TARGET_LEN_QUIZ, num_beams=4, early_stopping=True)
-    return tok_quiz.decode(outputs[0], skip_special_tokens=True)
+    return generate_questions_batch([(context, answer)])[0]
 
 def is_semantically_valid(question: str, answer_type: str) -> bool:
     question_lower = question.lower()
@@ -203,101 +470,253 @@ def is_semantically_valid(question: str, answer_type: str) -> bool:
     expected_starts = semantic_map.get(answer_type, ('what', 'which')); 
     return any(question_lower.startswith(start) for start in expected_starts)
 
-def generate_quiz_from_context(large_context: str, max_questions: int) -> list[Dict]:
-    doc = nlp(large_context)
-    quiz_results = []
-    
-    for sent in doc.sents:
-        if len(quiz_results) >= max_questions: break
-        sentence_text = sent.text.strip()
-        if len(sentence_text.split()) < 5: continue
-
-        answers_in_sentence = extract_answers_using_ner(sentence_text)
-        
-        for answer in answers_in_sentence:
-            if len(quiz_results) >= max_questions: break
-                
-            answer_type = get_answer_type(answer)
-            question = generate_question(sentence_text, answer)
-            
-            if is_semantically_valid(question, answer_type):
-                quiz_results.append({
-                    "source_sentence": sentence_text, "answer": answer, "answer_type": answer_type, "question": question
-                })
-            
-    return quiz_results
+def generate_quiz_from_context(large_context: str, max_questions: int, batch_size: int = QUIZ_BATCH_SIZE,
+                               top_k: int = None, rank: bool = True,
+                               on_question: Callable[[Dict], None] = None, num_beams: int = 4) -> list[Dict]:
+    """
+    Colectează întâi toți candidații (propoziție, răspuns) din document, îi
+    ordonează după scorul din Ai/candidate_ranking.py și trece primii `top_k`
+    (implicit max_questions * QUIZ_TOP_K_FACTOR) prin modelul de quiz, în loturi
+    de `batch_size`. Dacă după filtrare rămân mai puțin de max_questions întrebări
+    valide, se continuă cu următorii `top_k` candidați din clasament.
+    Scorul folosește doar valorile a priori, deci același text dă același quiz în orice proces.
+    rank=False păstrează ordinea propozițiilor și toți candidații (comportamentul inițial).
+    `on_question` primește fiecare întrebare imediat ce este acceptată.
+    `large_context` poate fi text sau un Doc spaCy deja adnotat.
+    """
+    # Un singur parse spaCy: propozițiile, entitățile și noun chunk-urile vin din același Doc
+    with tracing.stage("quiz.parse") as st:
+        doc = annotate(large_context) if isinstance(large_context, str) else large_context
+        sentences = list(doc.sents)
+        st.add(sentences=len(sentences), tokens_in=len(doc))
+
+    with tracing.stage("quiz.candidates") as st:
+        candidates = []
+        for index, sent in enumerate(sentences):
+            sentence_text = sent.text.strip()
+            if len(sentence_text.split()) < 5: continue
+            for answer, answer_type in extract_answer_candidates(sent):
+                candidates.append(Candidate(sentence_text, answer, answer_type, index))
+        st.add(candidates=len(candidates))
+
+        if rank:
+            candidates = rank_candidates(candidates, len(sentences))
+            top_k = top_k or math.ceil(max_questions * QUIZ_TOP_K_FACTOR)
+        top_k = top_k or len(candidates) or 1
+        st.add(selected=min(top_k, len(candidates)))
+
+    accepted = []
+    batch_size = max(1, batch_size)
+    for wave_start in range(0, len(candidates), top_k):
+        if len(accepted) >= max_questions: break
+        if wave_start:
+            logger.info("Quiz: %d/%d întrebări după primii %d candidați; se continuă cu următorii",
+                        len(accepted), max_questions, wave_start)
+        # Candidații aceleiași propoziții ajung în același lot (encoder-ul rulează o dată per propoziție)
+        wave = question_engine.order_by_group(candidates[wave_start:wave_start + top_k])
+        for start in range(0, len(wave), batch_size):
+            if len(accepted) >= max_questions: break
+            batch = wave[start:start + batch_size]
+            questions = generate_questions_batch([(c.sentence, c.answer) for c in batch], num_beams)
+
+            with tracing.stage("quiz.filter") as st:
+                new = []
+                for c, question in zip(batch, questions):
+                    if len(accepted) + len(new) >= max_questions: break
+                    valid = is_semantically_valid(question, c.answer_type)
+                    acceptance_stats.record(c.answer_type, valid)
+                    if valid: new.append((c, question))
+                st.add(checked=len(batch), accepted=len(new))
+            accepted.extend(new)
+            if on_question:
+                for c, question in new: on_question(_quiz_item(c, question))
+
+    # Întrebările se afișează în ordinea din text, nu în ordinea scorului
+    accepted.sort(key=lambda item: item[0].sentence_index)
+    return [_quiz_item(c, question) for c, question in accepted]
+
+
+def _quiz_item(c: Candidate, question: str) -> Dict:
+    return {"source_sentence": c.sentence, "answer": c.answer, "answer_type": c.answer_type, "question": question}
 
 
 # ==============================================================================
 # 3. FUNCȚIA PRINCIPALĂ DE EXECUȚIE A PIPELINE-ULUI (MODIFICATĂ PENTRU RETURN)
 # ==============================================================================
 
-def run_full_pipeline(input_file_path: str, num_questions: int, max_tokens_summ: int = 150, num_beams_summ: int = 4) -> Dict:
+def run_full_pipeline(input_file_path: str, num_questions: int, max_tokens_summ: int = 150, num_beams_summ: int = 4,
+                      ctx: PipelineContext = None, on_event: Callable[[str, object], None] = None,
+                      trace: tracing.PipelineTrace = None, deadline_s: float = None, queue_depth: int = 0) -> Dict:
     """
     Execută fluxul complet și returnează dicționarul de rezultate.
+    Toată starea rulării stă în `ctx` (creat aici dacă lipsește), deci funcția
+    poate fi apelată concurent, de ex. dintr-un ThreadPoolExecutor.
+
+    `on_event(tip, date)` primește progresul pe măsură ce apare:
+      - "summary_token": fragment din rezumatul în engleză (cu num_beams_summ=1) sau, cu beam
+        search, rezumatul unui lot de bucăți dintr-un text lung (înlocuit apoi de "summary")
+      - "summary": rezumatul final, tradus înapoi în limba originală
+      - "question": o întrebare acceptată (dict ca în quiz_results), tradusă înapoi
+
+    Timpii și tokenii pe etape sunt în result['trace'] și în log. Un `trace`
+    primit de la apelant (ex. cu extragerea PDF deja înregistrată) este continuat.
+
+    Cu `deadline_s` (secunde de acum), nivelul rezumatorului, beam-urile și
+    max_new_tokens se aleg astfel încât rularea să încapă în timp (Ai/budget.py);
+    `queue_depth` = câte cereri așteaptă după aceasta. max_tokens_summ și
+    num_beams_summ rămân limitele superioare. Configurația folosită este în result['serving'],
+    cu serving['degraded'] = True dacă a coborât sub parametrii ceruți.
+    """
+    trace = trace or tracing.PipelineTrace(os.path.basename(input_file_path))
+    deadline = time.monotonic() + deadline_s if deadline_s is not None else None
+    with trace.activate():
+        result = _run_full_pipeline(input_file_path, num_questions, max_tokens_summ, num_beams_summ,
+                                    ctx or PipelineContext(), on_event, deadline, queue_depth)
+    trace.log()
+    if result is not None:
+        result['trace'] = trace.to_dict()
+    return result
+
+
+def plan_generation(budget_s: float, summary_calls: int, quiz_calls: int, max_new_tokens: int = 150,
+                    num_beams: int = 4, queue_depth: int = 0) -> budget.GenerationPlan:
+    """
+    Planul pentru bugetul dat, cu costurile măsurate și nivelurile disponibile în procesul curent.
+    Disponibilitatea se verifică fără încărcare (registry.loadable): planificarea nu
+    consumă din termen și nici din bugetul de memorie al registrului.
     """
+    queue_depth += sum(b.queue_depth() for b in _batchers.values())
+    tiers = tuple(t for t, component in budget.SUMM_TIERS.items() if registry.loadable(component)) or ("large",)
+    return budget.plan_generation(budget_s, summary_calls, quiz_calls, max_new_tokens, num_beams,
+                                  quiz_tokens=MAX_TARGET_LEN_QUIZ // 2, queue_depth=queue_depth,
+                                  available_tiers=tiers)
+
+
+def _plan_for_text(text: str, budget_s: float, quiz_count: int, max_new_tokens: int, num_beams: int,
+                   queue_depth: int, client) -> budget.GenerationPlan:
+    """Estimează apelurile generate pentru text (fără tokenizer: ~4 caractere/token) și cere planul."""
+    chunks = max(1, math.ceil(len(text) / 4 / MAX_SRC_LEN_SUMM))
+    summary_calls = 1 if chunks == 1 else math.ceil(chunks / SUMM_BATCH_SIZE) + 1
+    quiz_calls = math.ceil(math.ceil(quiz_count * QUIZ_TOP_K_FACTOR) / QUIZ_BATCH_SIZE)
+    args = dict(budget_s=budget_s, summary_calls=summary_calls, quiz_calls=quiz_calls,
+                max_new_tokens=max_new_tokens, num_beams=num_beams, queue_depth=queue_depth)
+    if client:
+        # Costurile măsurate sunt în serverul de modele, unde rulează generate
+        return budget.GenerationPlan(**client.plan_generation(**args))
+    return plan_generation(**args)
+
+
+def _run_full_pipeline(input_file_path: str, num_questions: int, max_tokens_summ: int, num_beams_summ: int,
+                       ctx: PipelineContext, on_event, deadline: float = None, queue_depth: int = 0) -> Dict:
     try:
-        original_text = read_text_from_file(input_file_path)
+        with tracing.stage("read_file") as st:
+            original_text = read_text_from_file(input_file_path)
+            st.add(chars=len(original_text))
     except FileNotFoundError:
         print(f"\nEROARE: Fișierul de intrare nu a fost găsit la calea: {input_file_path}")
         return None
 
+    # Cu DPF_AI_SOCKET setat, modelele rulează în serverul de modele, nu în procesul curent
+    client = get_client()
+
+    def translate_back(strings: List[str]) -> List[str]:
+        if not ctx.translated: return strings
+        with tracing.stage("translate_back") as st:
+            st.add(strings=len(strings))
+            if client: return client.translate_back(strings, ctx.original_lang, ctx.translated)
+            return translate_back_to_original(strings, ctx)
+
+    def emit_question(item: Dict):
+        question, answer = translate_back([item['question'], item['answer']])
+        on_event("question", {**item, "question": question, "answer": answer})
+
+    on_token = (lambda piece: on_event("summary_token", piece)) if on_event else None
+    on_question = emit_question if on_event else None
+
     # --- PASUL 1: DETECTARE ȘI TRADUCERE ÎNAINTE ---
-    translated_text_for_processing = "summarize: " + original_text
-    
-    # 2. Rezumare
-    summarized_results_en = summarize(translated_text_for_processing, max_tokens_summ, num_beams_summ)
-    final_summary_en = summarized_results_en[0]
-    
-    # 3. Generare Quiz
-    quiz_list_en = generate_quiz_from_context(final_summary_en, max_questions=num_questions)
+    with tracing.stage("translate"):
+        if client:
+            translated = client.detect_and_translate(original_text, ctx.content_key)
+            ctx.original_lang, ctx.translated = translated["original_lang"], translated["translated"]
+            translated_text_for_processing = translated["text"]
+        else:
+            translated_text_for_processing = detect_and_translate(original_text, ctx)
+
+    quiz_count = min(num_questions, MAX_QUIZ_RESULTS)
+    if deadline is not None:
+        with tracing.stage("plan"):
+            plan = _plan_for_text(translated_text_for_processing, deadline - time.monotonic(), quiz_count,
+                                  max_tokens_summ, num_beams_summ, queue_depth, client)
+    else:
+        plan = budget.GenerationPlan(num_beams=num_beams_summ, max_new_tokens=max_tokens_summ, quiz_beams=4)
+    if plan.tier != "large" and not client and not registry.available(plan.component):
+        plan.tier = "large"  # modelul mic era pe disc, dar nu s-a putut încărca
+    serving = {**plan.to_dict(), "degraded": plan.is_degraded(num_beams_summ, max_tokens_summ)}
+    trace = tracing.current()
+    if trace: trace.meta["serving"] = serving
+    if deadline is not None:
+        logger.info("Plan generare (termen limită): %s", serving)
+
+    # 2. Rezumare (map-reduce dacă textul depășește fereastra modelului)
+    with tracing.stage("summarize"):
+        if client:
+            final_summary_en = client.summarize_long(translated_text_for_processing, plan.max_new_tokens,
+                                                     plan.num_beams, on_token=on_token, tier=plan.tier)
+        else:
+            final_summary_en = summarize_long(translated_text_for_processing, plan.max_new_tokens, plan.num_beams,
+                                              on_token=on_token, tier=plan.tier)
+
+    final_summary_ro = translate_back([final_summary_en])[0]
+    if on_event: on_event("summary", final_summary_ro)
+
+    # 3. Generare Quiz: doar câte întrebări se returnează, ca nicio generare să nu fie aruncată
+    with tracing.stage("quiz") as st:
+        if client:
+            quiz_list_en = client.quiz(final_summary_en, max_questions=quiz_count, on_question=on_question,
+                                       num_beams=plan.quiz_beams)
+        else:
+            quiz_list_en = generate_quiz_from_context(final_summary_en, max_questions=quiz_count,
+                                                      on_question=on_question, num_beams=plan.quiz_beams)
+        st.add(questions=len(quiz_list_en))
 
     # --- PASUL 4: TRADUCERE ÎNAPOI (POST-PROCESARE) ---
-    
-    final_results = quiz_list_en[:3]
-    final_summary_ro = final_summary_en
+    final_results = quiz_list_en
 
-    """
-    if ORIGINAL_LANG != 'en' and models.get('translate_back'):
-        # Logica de traducere înapoi (folosind datele EN)
-        strings_to_translate = [final_summary_en]
-        for item in quiz_list_en:
+    if ctx.translated:
+        # Logica de traducere înapoi (folosind datele EN), într-un singur apel pentru toate stringurile;
+        # propozițiile traduse deja pentru on_event vin din memoria de traduceri
+        strings_to_translate = []
+        for item in final_results:
             strings_to_translate.append(item['question'])
             strings_to_translate.append(item['answer'])
-            
-        translated_back_list = translate_back_to_original(strings_to_translate)
-        
-        final_summary_ro = translated_back_list[0]
+
+        translated_back_list = translate_back(strings_to_translate)
         quiz_list_ro = []
-        
-        for i in range(len(quiz_list_en)):
-            q_index = 1 + 2 * i 
-            a_index = 2 + 2 * i
-            
+
+        for i, item in enumerate(final_results):
             quiz_list_ro.append({
-                "question": translated_back_list[q_index],
-                "answer": translated_back_list[a_index],
-                "source_sentence": quiz_list_en[i]['source_sentence'] 
+                "question": translated_back_list[2 * i],
+                "answer": translated_back_list[2 * i + 1],
+                "answer_type": item.get('answer_type'),
+                "source_sentence": item['source_sentence']
             })
-            
+
         final_results = quiz_list_ro
-        
-    else:
-        # Nu a fost nevoie de traducere
-        pass
-    """
+
     # 7. Returnează un dicționar cu toate datele necesare (Vizibil în views.py)
     return {
         'quiz_results': final_results,
         'final_summary': final_summary_ro,
-        'original_lang': ORIGINAL_LANG
+        'original_lang': ctx.original_lang,
+        'serving': serving,
     }
 
 
 if __name__ == '__main__':
     # ... (Blocul de execuție) ...
-    FILE_PATH_INPUT = "input.txt"
-    FILE_PATH_OUTPUT = 'output.txt'
+    # Rulare din directorul DPF/: python -m Ai.ai_pipeline
+    FILE_PATH_INPUT = os.path.join(AI_MODULE_BASE_DIR, "input.txt")
+    FILE_PATH_OUTPUT = os.path.join(AI_MODULE_BASE_DIR, 'output.txt')
     QUESTION_COUNT = 3
     MAX_TOKENS_SUMMARY = 150
 
@@ -0,0 +1,148 @@
+"""
+Backend-uri de inferență pentru modelele seq2seq (rezumare și quiz).
+
+Se alege prin variabila de mediu DPF_AI_BACKEND:
+  - "torch" (implicit): greutăți fp32, pe dispozitivul ales de get_device()
+  - "int8":  straturile nn.Linear cuantizate dinamic la int8 (doar CPU)
+  - "onnx":  graf exportat și rulat cu ONNX Runtime (necesită optimum[onnxruntime])
+
+Cu DPF_AI_MMAP=1, backend-ul "torch" pe CPU mapează în memorie fișierul
+model.safetensors în loc să-l citească în heap: paginile greutăților rămân în
+page cache-ul sistemului și sunt partajate de toate procesele care încarcă
+același model (inclusiv procesele create cu fork după încărcare).
+"""
+import json
+import logging
+import mmap
+import os
+
+from Ai.model_registry import get_device
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("torch", "int8", "onnx")
+ONNX_SUBDIR = "onnx"
+SAFETENSORS_FILE = "model.safetensors"
+
+_SAFETENSORS_DTYPES = {
+    "F64": "float64", "F32": "float32", "F16": "float16", "BF16": "bfloat16",
+    "I64": "int64", "I32": "int32", "I16": "int16", "I8": "int8", "U8": "uint8", "BOOL": "bool",
+}
+
+
+def get_backend() -> str:
+    backend = os.getenv("DPF_AI_BACKEND", "torch").lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"DPF_AI_BACKEND='{backend}' nu este valid. Alegeți din: {', '.join(BACKENDS)}.")
+    return backend
+
+
+def load_seq2seq(model_path: str, backend: str = None):
+    """
+    Încarcă un model seq2seq cu backend-ul cerut. Modelul returnat expune
+    `.generate()` și `.device`, deci codul de inferență nu depinde de backend.
+    """
+    backend = backend or get_backend()
+
+    if backend == "onnx":
+        try:
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM
+        except ImportError as e:
+            raise RuntimeError("Backend-ul 'onnx' necesită pachetul optimum[onnxruntime].") from e
+        onnx_dir = os.path.join(model_path, ONNX_SUBDIR)
+        if os.path.isdir(onnx_dir):
+            return ORTModelForSeq2SeqLM.from_pretrained(onnx_dir)
+        # Primul load exportă graful și îl salvează lângă model, pentru porniri ulterioare rapide
+        model = ORTModelForSeq2SeqLM.from_pretrained(model_path, export=True)
+        model.save_pretrained(onnx_dir)
+        return model
+
+    import torch
+    from transformers import AutoModelForSeq2SeqLM
+
+    model = None
+    if backend == "torch" and mmap_enabled() and get_device().type == "cpu":
+        model = _load_seq2seq_mmap(model_path)
+    if model is None:
+        model = AutoModelForSeq2SeqLM.from_pretrained(model_path)
+    model.eval()
+    if backend == "int8":
+        # Cuantizarea dinamică rulează doar pe CPU
+        return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model.to(get_device())
+
+
+def mmap_enabled() -> bool:
+    return os.getenv("DPF_AI_MMAP", "0") == "1"
+
+
+def _safetensors_path(model_path: str):
+    """Fișierul model.safetensors local al modelului (director sau nume din cache-ul HF), sau None."""
+    if os.path.isdir(model_path):
+        path = os.path.join(model_path, SAFETENSORS_FILE)
+        return path if os.path.exists(path) else None
+    try:
+        from huggingface_hub import try_to_load_from_cache
+    except ImportError:
+        return None
+    path = try_to_load_from_cache(model_path, SAFETENSORS_FILE)
+    return path if isinstance(path, str) else None
+
+
+def load_state_dict_mmap(path: str):
+    """
+    Tensorii unui fișier safetensors, ca view-uri torch.frombuffer peste un mmap privat.
+    Nimic nu se copiază la încărcare; o pagină se copiază doar dacă tensorul este modificat.
+    """
+    import torch
+
+    with open(path, "rb") as f:
+        header_len = int.from_bytes(f.read(8), "little")
+        header = json.loads(f.read(header_len))
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    base = 8 + header_len
+
+    state_dict = {}
+    for name, info in header.items():
+        if name == "__metadata__":
+            continue
+        dtype = getattr(torch, _SAFETENSORS_DTYPES[info["dtype"]])
+        start, end = info["data_offsets"]
+        if end == start:
+            state_dict[name] = torch.empty(info["shape"], dtype=dtype)
+            continue
+        count = (end - start) // torch.tensor([], dtype=dtype).element_size()
+        state_dict[name] = torch.frombuffer(buf, dtype=dtype, count=count, offset=base + start).view(info["shape"])
+    return state_dict
+
+
+def _load_seq2seq_mmap(model_path: str):
+    """
+    Construiește modelul pe dispozitivul "meta" (fără alocare) și îi atașează
+    greutățile mapate (load_state_dict(assign=True)). None dacă modelul nu are
+    safetensors local sau dacă rămân parametri neîncărcați; atunci se folosește from_pretrained.
+    """
+    path = _safetensors_path(model_path)
+    if path is None:
+        return None
+
+    import torch
+    from transformers import AutoConfig, AutoModelForSeq2SeqLM, GenerationConfig
+
+    config = AutoConfig.from_pretrained(model_path)
+    with torch.device("meta"):
+        model = AutoModelForSeq2SeqLM.from_config(config)
+    model.load_state_dict(load_state_dict_mmap(path), strict=False, assign=True)
+    model.tie_weights()  # embedding-urile partajate nu apar de două ori în fișier
+
+    missing = [n for n, t in list(model.named_parameters()) + list(model.named_buffers()) if t.is_meta]
+    if missing:
+        logger.warning("Încărcarea mmap pentru %s a lăsat %d tensori neîncărcați (ex. %s); se folosește from_pretrained.",
+                       model_path, len(missing), missing[0])
+        return None
+    try:
+        model.generation_config = GenerationConfig.from_pretrained(model_path)
+    except OSError:
+        pass  # modelul nu are generation_config.json; rămân valorile derivate din config
+    logger.info("Greutățile %s sunt mapate în memorie (%s).", model_path, path)
+    return model
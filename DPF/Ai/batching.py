@@ -0,0 +1,109 @@
+"""
+Micro-batching între cereri concurente.
+
+Cererile care sosesc în aceeași fereastră scurtă de timp (sau până se atinge
+dimensiunea maximă a lotului) sunt rulate împreună, într-un singur apel
+generate cu padding, iar rezultatele sunt distribuite înapoi fiecărui apelant.
+Doar cererile cu aceiași parametri de generare (aceeași `key`) intră în același lot.
+"""
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, List
+
+
+class MicroBatcher:
+    def __init__(self, name: str, process_batch: Callable[[List, Hashable], List],
+                 window_ms: float = 10.0, max_batch_size: int = 16):
+        self.name = name
+        self.process_batch = process_batch
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max(1, max_batch_size)
+
+        self._pending: Dict[Hashable, deque] = {}
+        self._cond = threading.Condition()
+        self._worker = None
+
+        # Metrici pentru reglajul throughput / latență
+        self._batch_sizes = Counter()
+        self._wait_times = deque(maxlen=1000)
+        self._items_done = 0
+
+    # --- API public ---
+
+    def submit(self, item, key: Hashable = ()) -> Future:
+        future = Future()
+        with self._cond:
+            self._pending.setdefault(key, deque()).append((item, future, time.perf_counter()))
+            self._ensure_worker()
+            self._cond.notify()
+        return future
+
+    def run_many(self, items: List, key: Hashable = ()) -> List:
+        """Trimite toate elementele și așteaptă rezultatele, în aceeași ordine."""
+        futures = [self.submit(item, key) for item in items]
+        return [f.result() for f in futures]
+
+    def queue_depth(self) -> int:
+        with self._cond:
+            return sum(len(q) for q in self._pending.values())
+
+    def stats(self) -> Dict:
+        waits = sorted(self._wait_times)
+
+        def pct(p):
+            return waits[min(len(waits) - 1, int(p * len(waits)))] * 1000 if waits else None
+
+        return {
+            "queue_depth": self.queue_depth(),
+            "items": self._items_done,
+            "batches": sum(self._batch_sizes.values()),
+            "batch_size_histogram": dict(sorted(self._batch_sizes.items())),
+            "wait_ms_avg": sum(waits) / len(waits) * 1000 if waits else None,
+            "wait_ms_p50": pct(0.50),
+            "wait_ms_p95": pct(0.95),
+            "window_ms": self.window * 1000,
+            "max_batch_size": self.max_batch_size,
+        }
+
+    # --- Firul care formează și rulează loturile ---
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._loop, name=f"batcher-{self.name}", daemon=True)
+            self._worker.start()
+
+    def _next_batch(self):
+        """Așteaptă până când lotul cel mai vechi e plin sau i-a expirat fereastra, apoi îl scoate."""
+        with self._cond:
+            while True:
+                queues = [(q[0][2], key) for key, q in self._pending.items() if q]
+                if not queues:
+                    self._cond.wait()
+                    continue
+                oldest, key = min(queues, key=lambda x: x[0])
+                queue = self._pending[key]
+                remaining = oldest + self.window - time.perf_counter()
+                if len(queue) >= self.max_batch_size or remaining <= 0:
+                    batch = [queue.popleft() for _ in range(min(len(queue), self.max_batch_size))]
+                    return key, batch
+                self._cond.wait(remaining)
+
+    def _loop(self):
+        while True:
+            key, batch = self._next_batch()
+            started = time.perf_counter()
+            for _, _, enqueued in batch:
+                self._wait_times.append(started - enqueued)
+            self._batch_sizes[len(batch)] += 1
+            self._items_done += len(batch)
+
+            try:
+                results = self.process_batch([item for item, _, _ in batch], key)
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
@@ -0,0 +1,95 @@
+"""
+Raport: FLOPs-ii encoder-ului modelului de quiz per întrebare acceptată, cu loturi
+în ordinea scorului (padding pe tot lotul) față de loturi grupate pe propoziție
+(Ai/question_engine.py), pe propozițiile cu mulți candidați (noun chunks + entități).
+
+Rulare din directorul DPF/:
+    python -m Ai.bench_encoder --corpus materiale_didactice --min-candidates 4
+    python -m Ai.bench_encoder --corpus materiale_didactice --genereaza   # acceptare reală, cu modelul
+
+Fără --genereaza nu se încarcă modelul de quiz: numărul de întrebări acceptate este
+estimat din rata de acceptare per tip de răspuns (Ai/candidate_ranking.py).
+"""
+import argparse
+
+from Ai import ai_pipeline as ap
+from Ai import question_engine
+from Ai.bench_ranking import read_corpus
+from Ai.candidate_ranking import Candidate, acceptance_stats, rank_candidates
+
+
+def encoder_flops(config, rows):
+    """FLOPs pentru un apel al encoder-ului pe rândurile date (toate aduse la cel mai lung)."""
+    width = max(len(r) for r in rows)
+    return len(rows) * width * question_engine.encoder_flops_per_token(config, width)
+
+
+def batch_costs(config, tok, candidates, batch_size):
+    """(FLOPs fără grupare, FLOPs cu grupare) pentru candidații dați, în loturi de batch_size."""
+    baseline = grouped = 0.0
+    for start in range(0, len(candidates), batch_size):
+        batch = candidates[start:start + batch_size]
+        pairs = [(c.sentence, c.answer) for c in batch]
+        ids, groups = question_engine.build_inputs(tok, pairs, ap.MAX_SRC_LEN_QUIZ)
+        baseline += encoder_flops(config, [tok(f"answer: {a} context: {s}", max_length=ap.MAX_SRC_LEN_QUIZ,
+                                               truncation=True)["input_ids"] for s, a in pairs])
+        grouped += sum(encoder_flops(config, [ids[i] for i in g]) for g in groups.values())
+    return baseline, grouped
+
+
+def accepted_count(candidates, generate: bool, num_beams: int) -> float:
+    if not generate:
+        return sum(acceptance_stats.rate(c.answer_type) for c in candidates)
+    questions = ap.generate_questions_batch([(c.sentence, c.answer) for c in candidates], num_beams)
+    return sum(ap.is_semantically_valid(q, c.answer_type) for c, q in zip(candidates, questions))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default="materiale_didactice")
+    parser.add_argument("--limit", type=int, default=20, help="Numărul maxim de documente")
+    parser.add_argument("--min-candidates", type=int, default=4,
+                        help="Doar propozițiile cu cel puțin atâția candidați")
+    parser.add_argument("--batch-size", type=int, default=ap.QUIZ_BATCH_SIZE)
+    parser.add_argument("--genereaza", action="store_true", help="Rulează modelul de quiz pentru acceptarea reală")
+    parser.add_argument("--num-beams", type=int, default=4)
+    args = parser.parse_args()
+
+    from transformers import AutoConfig, AutoTokenizer
+    tok = AutoTokenizer.from_pretrained(ap.QUIZ_MODEL_PATH)
+    config = AutoConfig.from_pretrained(ap.QUIZ_MODEL_PATH)
+    ap.warm_up(['nlp'] + (['quiz'] if args.genereaza else []))
+
+    totals = [0, 0.0, 0.0, 0.0]  # candidați, acceptate, FLOPs fără grupare, FLOPs cu grupare
+    print(f"{'document':<45} {'cand.':>6} {'accept.':>8} {'GFLOPs/întreb.':>15} {'grupat':>8} {'economie':>9}")
+    for name, text in read_corpus(args.corpus, args.limit):
+        doc = ap.annotate(text)
+        sentences = list(doc.sents)
+        candidates = []
+        for index, sent in enumerate(sentences):
+            found = ap.extract_answer_candidates(sent)
+            if len(found) < args.min_candidates or len(sent.text.split()) < 5:
+                continue
+            candidates += [Candidate(sent.text.strip(), answer, answer_type, index) for answer, answer_type in found]
+        if not candidates:
+            continue
+
+        ranked = rank_candidates(candidates, len(sentences))
+        baseline, _ = batch_costs(config, tok, ranked, args.batch_size)
+        _, grouped = batch_costs(config, tok, question_engine.order_by_group(ranked), args.batch_size)
+        accepted = max(accepted_count(ranked, args.genereaza, args.num_beams), 1e-9)
+
+        totals[0] += len(ranked); totals[1] += accepted; totals[2] += baseline; totals[3] += grouped
+        print(f"{name[:45]:<45} {len(ranked):>6} {accepted:>8.1f} {baseline / accepted / 1e9:>15.3f} "
+              f"{grouped / accepted / 1e9:>8.3f} {1 - grouped / baseline:>8.1%}")
+
+    if totals[0]:
+        accepted = max(totals[1], 1e-9)
+        print(f"\nTotal: {totals[0]} candidați, {accepted:.1f} întrebări acceptate"
+              f"{'' if args.genereaza else ' (estimat)'}")
+        print(f"  GFLOPs encoder / întrebare acceptată: {totals[2] / accepted / 1e9:.3f} -> {totals[3] / accepted / 1e9:.3f}"
+              f" (economie {(totals[2] - totals[3]) / accepted / 1e9:.3f} GFLOPs, {1 - totals[3] / totals[2]:.1%})")
+
+
+if __name__ == "__main__":
+    main()
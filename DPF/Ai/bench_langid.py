@@ -0,0 +1,65 @@
+"""
+Benchmark: detectarea limbii pe ferestre eșantionate (Ai/langid.py) față de
+langdetect pe textul întreg, pe lecțiile PDF/TXT din corpus.
+
+Rulare din directorul DPF/:
+    python -m Ai.bench_langid --corpus materiale_didactice
+    python -m Ai.bench_langid --corpus materiale_didactice --repeats 5   # și stabilitatea fără seed
+
+Cu --repeats N, textul întreg se detectează de N ori fără seed (ca înainte) și se
+numără documentele care au primit mai multe limbi diferite.
+"""
+import argparse
+import time
+
+from langdetect import DetectorFactory
+
+from Ai import langid
+from Ai.bench_ranking import read_corpus
+
+
+def timed(fn, text):
+    start = time.perf_counter()
+    lang = fn(text)
+    return lang, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default="materiale_didactice")
+    parser.add_argument("--limit", type=int, default=50, help="Numărul maxim de documente")
+    parser.add_argument("--repeats", type=int, default=0, help="Rulări fără seed pe textul întreg (stabilitate)")
+    args = parser.parse_args()
+
+    langid.detect_full("warm up")  # încărcarea profilurilor langdetect nu intră în timpul primului document
+    rows = []
+    print(f"{'document':<45} {'caractere':>9} {'întreg':>7} {'ms':>8} {'eșantion':>8} {'ms':>7} {'x':>6}"
+          + (f" {'instabil':>8}" if args.repeats else ""))
+    for name, text in read_corpus(args.corpus, args.limit):
+        if not text.strip():
+            continue
+        full, t_full = timed(langid.detect_full, text)
+        sampled, t_sampled = timed(langid.detect_sampled, text)
+        unstable = ""
+        if args.repeats:
+            DetectorFactory.seed = None
+            try:
+                seen = {langid.detect_full(text) for _ in range(args.repeats)}
+            finally:
+                DetectorFactory.seed = 0
+            unstable = ",".join(sorted(seen)) if len(seen) > 1 else "-"
+        rows.append((full, sampled, t_full, t_sampled, unstable not in ("", "-")))
+        print(f"{name[:45]:<45} {len(text):>9} {full:>7} {t_full * 1000:>8.1f} {sampled:>8} {t_sampled * 1000:>7.1f} "
+              f"{t_full / max(t_sampled, 1e-9):>6.1f}" + (f" {unstable:>8}" if args.repeats else ""))
+
+    if rows:
+        agree = sum(f == s for f, s, *_ in rows)
+        total_full, total_sampled = sum(r[2] for r in rows), sum(r[3] for r in rows)
+        print(f"\n{len(rows)} documente: aceeași limbă în {agree}/{len(rows)}, "
+              f"{total_full:.2f}s -> {total_sampled:.2f}s ({total_full / max(total_sampled, 1e-9):.1f}x)")
+        if args.repeats:
+            print(f"Fără seed, {sum(r[4] for r in rows)} documente au primit limbi diferite în {args.repeats} rulări.")
+
+
+if __name__ == "__main__":
+    main()
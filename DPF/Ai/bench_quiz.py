@@ -0,0 +1,59 @@
+"""
+Benchmark: throughput-ul generării de întrebări în funcție de batch size.
+
+Rulare din directorul DPF/:
+    python -m Ai.bench_quiz --batch-sizes 1 2 4 8 16 --candidates 32
+"""
+import argparse
+import os
+import time
+
+from Ai import ai_pipeline as ap
+
+
+def collect_candidates(text: str, limit: int):
+    """Aceiași candidați (propoziție, răspuns) pe care îi folosește generate_quiz_from_context."""
+    doc = ap.annotate(text)
+    pairs = []
+    for sent in doc.sents:
+        sentence_text = sent.text.strip()
+        if len(sentence_text.split()) < 5: continue
+        for answer in ap.extract_answers_using_ner(sent):
+            pairs.append((sentence_text, answer))
+    return pairs[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", default=os.path.join(ap.AI_MODULE_BASE_DIR, "input.txt"))
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--candidates", type=int, default=32, help="Numărul de candidați generați per rulare")
+    parser.add_argument("--repeat", type=int, default=2)
+    args = parser.parse_args()
+
+    with open(args.input, encoding="utf-8") as f:
+        text = f.read()
+
+    ap.warm_up(['quiz', 'nlp'])
+    pairs = collect_candidates(text, args.candidates)
+    print(f"Candidați: {len(pairs)} | dispozitiv: {ap.get_device()}")
+
+    # O rulare de încălzire, ca primul batch size să nu plătească inițializarea kernel-urilor
+    ap.generate_questions_batch(pairs[:2])
+
+    baseline = None
+    print(f"{'batch':>6} {'sec':>8} {'întrebări/s':>12} {'speedup':>8}")
+    for bs in args.batch_sizes:
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for i in range(0, len(pairs), bs):
+                ap.generate_questions_batch(pairs[i:i + bs])
+            best = min(best, time.perf_counter() - start)
+        qps = len(pairs) / best
+        baseline = baseline or qps
+        print(f"{bs:>6} {best:>8.2f} {qps:>12.2f} {qps / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
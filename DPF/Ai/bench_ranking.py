@@ -0,0 +1,92 @@
+"""
+Raport: câte apeluri generate costă o întrebare acceptată, cu și fără
+ordonarea candidaților (Ai/candidate_ranking.py), pe corpusul de lecții.
+
+Rulare din directorul DPF/:
+    python -m Ai.bench_ranking --corpus materiale_didactice --questions 7
+    python -m Ai.bench_ranking --corpus materiale_didactice --no-summary   # quiz direct pe text
+
+Fișierele .txt se citesc ca atare, iar din .pdf se extrage textul cu PyPDF2.
+Implicit quiz-ul rulează pe rezumat, ca în run_full_pipeline.
+"""
+import argparse
+import os
+import time
+
+from Ai import ai_pipeline as ap
+
+
+def read_corpus(root: str, limit: int):
+    for dirpath, _, files in sorted(os.walk(root)):
+        for fname in sorted(files):
+            path = os.path.join(dirpath, fname)
+            if fname.lower().endswith(".txt"):
+                with open(path, encoding="utf-8") as f:
+                    yield fname, f.read()
+            elif fname.lower().endswith(".pdf"):
+                from PyPDF2 import PdfReader
+                yield fname, "\n".join(page.extract_text() or "" for page in PdfReader(path).pages)
+            else:
+                continue
+            limit -= 1
+            if limit == 0: return
+
+
+class CountingGenerate:
+    """Numără candidații trimiși modelului de quiz (un candidat = o generare)."""
+
+    def __init__(self, fn):
+        self.fn = fn
+        self.calls = 0
+
+    def __call__(self, pairs, *args, **kwargs):
+        self.calls += len(pairs)
+        return self.fn(pairs, *args, **kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default="materiale_didactice")
+    parser.add_argument("--limit", type=int, default=20, help="Numărul maxim de documente")
+    parser.add_argument("--questions", type=int, default=7)
+    parser.add_argument("--no-summary", action="store_true")
+    args = parser.parse_args()
+
+    ap.warm_up(['quiz', 'nlp'] + ([] if args.no_summary else ['summarize']))
+    counter = CountingGenerate(ap.generate_questions_batch)
+    ap.generate_questions_batch = counter
+
+    totals = {False: [0, 0, 0.0], True: [0, 0, 0.0]}  # rank -> [generări, acceptate, secunde]
+    print(f"{'document':<50} {'fără ordonare':>16} {'cu ordonare':>16}")
+    for name, text in read_corpus(args.corpus, args.limit):
+        if not text.strip(): continue
+        if ap.detect_language(text) != 'en':
+            text = ap.detect_and_translate(text, ap.PipelineContext())
+        context = text if args.no_summary else ap.summarize_long(text)
+        doc = ap.annotate(context)
+
+        row = []
+        for rank in (False, True):
+            counter.calls = 0
+            start = time.perf_counter()
+            accepted = len(ap.generate_quiz_from_context(doc, args.questions, rank=rank))
+            totals[rank][0] += counter.calls
+            totals[rank][1] += accepted
+            totals[rank][2] += time.perf_counter() - start
+            row.append(f"{counter.calls:>4} gen/{accepted:>2} ok")
+        print(f"{name[:50]:<50} {row[0]:>16} {row[1]:>16}")
+
+    print()
+    for rank, label in ((False, "fără ordonare"), (True, "cu ordonare")):
+        calls, accepted, secs = totals[rank]
+        per_q = calls / accepted if accepted else float("inf")
+        print(f"{label:<14} generări: {calls:>5} | acceptate: {accepted:>4} | generări/întrebare: {per_q:>5.2f} | {secs:.1f}s")
+    base, ranked = totals[False], totals[True]
+    if base[1] and ranked[1]:
+        saved = base[0] / base[1] - ranked[0] / ranked[1]
+        print(f"Generări economisite per întrebare acceptată: {saved:.2f}")
+    print(f"Rate de acceptare observate: {ap.acceptance_stats.snapshot()}")
+
+
+if __name__ == "__main__":
+    main()
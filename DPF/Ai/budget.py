@@ -0,0 +1,114 @@
+"""
+Generare cu termen limită: alege nivelul modelului, numărul de beam-uri și
+max_new_tokens astfel încât o rulare să se încadreze în timpul rămas.
+
+Costul unui apel generate este aproximat ca pași de decodare x beam-uri x
+cost pe pas, unde costul pe pas este o medie mobilă (EWMA) a măsurătorilor
+reale, separat pentru fiecare model (rezumator mare, rezumator mic, quiz).
+Cu mai multe cereri în coadă, bugetul fiecăreia se micșorează, ca să se
+golească coada mai repede.
+"""
+import math
+import threading
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional
+
+# Nivelurile rezumatorului, de la cel mai bun la cel mai rapid -> componenta din registry
+SUMM_TIERS = {"large": "summarize", "small": "summarize_small"}
+
+# Costuri inițiale pe pas de decodare și beam (secunde, CPU), înlocuite de măsurători
+DEFAULT_STEP_COST = {"summarize": 0.030, "summarize_small": 0.004, "quiz": 0.004}
+EWMA_ALPHA = 0.2
+# Cât din bugetul unei cereri „cedează” fiecare cerere care așteaptă în spatele ei
+QUEUE_PRESSURE = 0.25
+MIN_NEW_TOKENS = 32
+SAFETY = 0.8  # planificăm pentru 80% din buget; restul acoperă traducerea, spaCy etc.
+
+
+class CostModel:
+    """Costul măsurat pe pas de decodare (și beam) pentru fiecare componentă."""
+
+    def __init__(self):
+        self._cost: Dict[str, float] = dict(DEFAULT_STEP_COST)
+        self._samples: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, component: str, wall_s: float, steps: int, num_beams: int) -> None:
+        if steps <= 0: return
+        sample = wall_s / (steps * max(1, num_beams))
+        with self._lock:
+            n = self._samples.get(component, 0)
+            previous = self._cost.get(component, sample)
+            # Prima măsurătoare înlocuiește valoarea implicită
+            self._cost[component] = sample if n == 0 else (1 - EWMA_ALPHA) * previous + EWMA_ALPHA * sample
+            self._samples[component] = n + 1
+
+    def step_cost(self, component: str) -> float:
+        with self._lock:
+            return self._cost.get(component, max(DEFAULT_STEP_COST.values()))
+
+    def estimate(self, component: str, calls: int, max_new_tokens: int, num_beams: int) -> float:
+        return calls * max_new_tokens * max(1, num_beams) * self.step_cost(component)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {c: {"step_cost_s": round(v, 5), "samples": self._samples.get(c, 0)} for c, v in self._cost.items()}
+
+
+cost_model = CostModel()
+
+
+@dataclass
+class GenerationPlan:
+    tier: str = "large"
+    num_beams: int = 4
+    max_new_tokens: int = 150
+    quiz_beams: int = 4
+    greedy_fallback: bool = False
+    estimated_s: float = 0.0
+    budget_s: Optional[float] = None
+
+    @property
+    def component(self) -> str:
+        return SUMM_TIERS[self.tier]
+
+    def is_degraded(self, num_beams: int, max_new_tokens: int, quiz_beams: int = 4) -> bool:
+        """True dacă planul coboară sub configurația cerută (nivel, beam-uri, lungimea rezumatului)."""
+        return (self.tier != "large" or self.greedy_fallback or self.num_beams < num_beams
+                or self.max_new_tokens < max_new_tokens or self.quiz_beams < quiz_beams)
+
+    def to_dict(self) -> Dict:
+        return {**asdict(self), "estimated_s": round(self.estimated_s, 3),
+                "budget_s": None if self.budget_s is None else round(self.budget_s, 3)}
+
+
+def plan_generation(budget_s: float, summary_calls: int, quiz_calls: int, max_new_tokens: int = 150,
+                    num_beams: int = 4, quiz_tokens: int = 48, queue_depth: int = 0,
+                    available_tiers=("large", "small")) -> GenerationPlan:
+    """
+    Cea mai bună configurație (nivel, beam-uri rezumat, beam-uri quiz) al cărei cost
+    estimat încape în buget. `summary_calls` / `quiz_calls` = apeluri generate estimate.
+    Dacă nimic nu încape, decodare greedy cu rezumatorul cel mai rapid și
+    max_new_tokens redus cât să încapă (dar nu sub MIN_NEW_TOKENS).
+    """
+    budget = max(0.0, budget_s) * SAFETY / (1 + QUEUE_PRESSURE * max(0, queue_depth))
+    beam_options = sorted({b for b in (num_beams, 2, 1) if b <= num_beams}, reverse=True)
+
+    for tier in available_tiers:
+        component = SUMM_TIERS[tier]
+        for beams in beam_options:
+            for quiz_beams in beam_options:
+                cost = (cost_model.estimate(component, summary_calls, max_new_tokens, beams)
+                        + cost_model.estimate("quiz", quiz_calls, quiz_tokens, quiz_beams))
+                if cost <= budget:
+                    return GenerationPlan(tier, beams, max_new_tokens, quiz_beams, False, cost, budget)
+
+    # Fallback: greedy pe nivelul cel mai rapid, cu rezumatul scurtat la bugetul rămas
+    tier = available_tiers[-1]
+    component = SUMM_TIERS[tier]
+    quiz_cost = cost_model.estimate("quiz", quiz_calls, quiz_tokens, 1)
+    per_token = cost_model.estimate(component, summary_calls, 1, 1)
+    tokens = math.floor((budget - quiz_cost) / per_token) if per_token else max_new_tokens
+    tokens = max(MIN_NEW_TOKENS, min(max_new_tokens, tokens))
+    cost = cost_model.estimate(component, summary_calls, tokens, 1) + quiz_cost
+    return GenerationPlan(tier, 1, tokens, 1, True, cost, budget)
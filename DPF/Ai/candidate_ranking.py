@@ -0,0 +1,119 @@
+"""
+Ordonarea candidaților de quiz înainte de generare.
+
+Fiecare candidat (propoziție, răspuns, tip) primește un scor ieftin, calculat
+fără model: probabilitatea ca tipul răspunsului să dea o întrebare validă
+(is_semantically_valid), lungimea răspunsului, poziția propoziției în text
+și frecvența termenilor din răspuns în tot documentul. Doar primii k candidați
+ajung la modelul de quiz.
+
+Probabilitățile per tip sunt valorile a priori (prior_stats), ca același
+document să dea aceiași candidați în orice proces: rezultatele se salvează
+(RezultatAI) sub o cheie care nu depinde de istoria workerului. Ratele observate
+(întrebare acceptată sau respinsă) se strâng în acceptance_stats, pentru
+benchmark-uri și pentru ajustarea valorilor a priori.
+"""
+import math
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List
+
+# Cât de des un tip de răspuns produce o întrebare care trece de is_semantically_valid.
+# Tipurile cu un singur cuvânt interogativ așteptat (DATE -> when) sunt mai riscante
+# decât cele care acceptă "what"/"which", pe care T5 le generează cel mai des.
+TYPE_PRIOR = {
+    'CONCEPT': 0.70, 'ORG': 0.65, 'GPE': 0.60, 'LOC': 0.60, 'PERSON': 0.55,
+    'DATE': 0.45, 'CARDINAL': 0.35,
+}
+DEFAULT_PRIOR = 0.50
+PRIOR_WEIGHT = 10  # câte observații "valorează" valoarea a priori
+
+# Ponderile trăsăturilor de conținut (se adună la 1); scorul final = p(tip) * conținut
+WEIGHTS = {'length': 0.35, 'position': 0.20, 'frequency': 0.45}
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_STOPWORDS = frozenset(
+    "the a an of in on at to for and or is are was were be by with from as that this these those it its".split()
+)
+
+
+@dataclass
+class Candidate:
+    sentence: str
+    answer: str
+    answer_type: str
+    sentence_index: int
+    score: float = 0.0
+
+
+class AcceptanceStats:
+    """Rata de acceptare per tip de răspuns, actualizată după fiecare întrebare validată."""
+
+    def __init__(self):
+        self._accepted = Counter()
+        self._total = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, answer_type: str, accepted: bool) -> None:
+        with self._lock:
+            self._total[answer_type] += 1
+            self._accepted[answer_type] += int(accepted)
+
+    def rate(self, answer_type: str) -> float:
+        prior = TYPE_PRIOR.get(answer_type, DEFAULT_PRIOR)
+        with self._lock:
+            accepted, total = self._accepted[answer_type], self._total[answer_type]
+        return (accepted + PRIOR_WEIGHT * prior) / (total + PRIOR_WEIGHT)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            types = sorted(self._total)
+            return {t: {"accepted": self._accepted[t], "total": self._total[t]} for t in types}
+
+
+acceptance_stats = AcceptanceStats()
+
+
+class PriorStats:
+    """Doar valorile a priori (fără observații): aceeași ordine în orice proces."""
+
+    def rate(self, answer_type: str) -> float:
+        return TYPE_PRIOR.get(answer_type, DEFAULT_PRIOR)
+
+
+prior_stats = PriorStats()
+
+
+def _terms(text: str) -> List[str]:
+    return [w for w in _WORD_RE.findall(text.lower()) if w not in _STOPWORDS and len(w) > 2]
+
+
+def _length_score(answer: str) -> float:
+    """Răspunsurile de 1-3 cuvinte sunt ideale; cele lungi dau rar întrebări bune."""
+    n = len(answer.split())
+    return 1.0 if n <= 3 else max(0.0, 1.0 - 0.2 * (n - 3))
+
+
+def rank_candidates(candidates: List[Candidate], n_sentences: int, stats=prior_stats) -> List[Candidate]:
+    """Calculează scorul fiecărui candidat și îi întoarce în ordine descrescătoare a scorului."""
+    if not candidates: return []
+    term_freq = Counter()
+    for sentence in dict.fromkeys(c.sentence for c in candidates):
+        term_freq.update(_terms(sentence))
+    max_log_tf = math.log1p(max(term_freq.values(), default=1))
+
+    for c in candidates:
+        terms = _terms(c.answer)
+        tf = sum(math.log1p(term_freq[t]) for t in terms) / len(terms) if terms else 0.0
+        features = {
+            'length': _length_score(c.answer),
+            'position': 1.0 - c.sentence_index / max(n_sentences, 1),  # ideile principale apar devreme
+            'frequency': tf / max_log_tf if max_log_tf else 0.0,
+        }
+        content = sum(WEIGHTS[name] * value for name, value in features.items())
+        c.score = stats.rate(c.answer_type) * content
+
+    # Sortare stabilă: la scor egal rămâne ordinea din text
+    return sorted(candidates, key=lambda c: -c.score)
@@ -0,0 +1,124 @@
+"""
+Compară backend-urile de inferență (torch fp32, int8, onnx) pentru
+t5_small_summarizer și quiz_model: echivalența ieșirilor față de fp32 pe
+Ai/input.txt, latența medie și memoria rezidentă maximă (RSS).
+
+Rulare din directorul DPF/:
+    python -m Ai.compare_backends --backends torch int8 onnx --repeat 3
+
+Fiecare (model, backend) rulează într-un subproces separat, ca RSS-ul
+măsurat să aparțină doar acelui backend.
+"""
+import argparse
+import difflib
+import json
+import os
+import re
+import resource
+import subprocess
+import sys
+import time
+
+from Ai.ai_pipeline import AI_MODULE_BASE_DIR, MAX_SRC_LEN_QUIZ, MAX_TARGET_LEN_QUIZ, split_sentences
+from Ai.backends import BACKENDS, load_seq2seq
+
+MODELS = {
+    "t5_small_summarizer": os.path.join(AI_MODULE_BASE_DIR, "t5_small_summarizer"),
+    "quiz_model": os.path.join(AI_MODULE_BASE_DIR, "quiz_model"),
+}
+
+
+def build_inputs(model_name: str, text: str):
+    """Input-urile de test: rezumarea întregului text, sau câteva perechi răspuns/context pentru quiz."""
+    if model_name != "quiz_model":
+        return ["summarize: " + text], dict(max_new_tokens=150, num_beams=4, length_penalty=0.3)
+    inputs = []
+    for sentence in split_sentences(text)[:4]:
+        # Răspunsul: cea mai lungă secvență de cuvinte cu majusculă din propoziție
+        spans = re.findall(r"(?:[A-Z][\w-]+\s?)+", sentence)
+        answer = max(spans, key=len).strip() if spans else sentence.split()[-1]
+        inputs.append(f"answer: {answer} context: {sentence}")
+    return inputs, dict(max_length=MAX_TARGET_LEN_QUIZ, num_beams=4, early_stopping=True)
+
+
+def run_worker(model_name: str, backend: str, input_path: str, repeat: int) -> dict:
+    import torch
+    from transformers import AutoTokenizer
+
+    path = MODELS[model_name]
+    with open(input_path, encoding="utf-8") as f:
+        text = f.read()
+    inputs, gen_kwargs = build_inputs(model_name, text)
+
+    start = time.perf_counter()
+    tok = AutoTokenizer.from_pretrained(path)
+    model = load_seq2seq(path, backend)
+    load_time = time.perf_counter() - start
+
+    max_len = 1024 if model_name != "quiz_model" else MAX_SRC_LEN_QUIZ
+    enc = tok(inputs, return_tensors="pt", padding=True, truncation=True, max_length=max_len).to(model.device)
+    latencies, outputs = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with torch.no_grad():
+            out = model.generate(**enc, **gen_kwargs)
+        latencies.append(time.perf_counter() - start)
+        outputs = tok.batch_decode(out, skip_special_tokens=True)
+
+    return {
+        "load_time": load_time,
+        "latency": sum(latencies) / len(latencies),
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "outputs": outputs,
+    }
+
+
+def similarity(a, b) -> float:
+    return sum(difflib.SequenceMatcher(None, x, y).ratio() for x, y in zip(a, b)) / max(len(a), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--models", nargs="+", default=list(MODELS), choices=list(MODELS))
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument("--input", default=os.path.join(AI_MODULE_BASE_DIR, "input.txt"))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--min-similarity", type=float, default=0.9,
+                        help="Pragul de similaritate față de fp32 sub care comparația eșuează")
+    parser.add_argument("--worker", nargs=2, metavar=("MODEL", "BACKEND"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker[0], args.worker[1], args.input, args.repeat)))
+        return
+
+    failed = False
+    for model_name in args.models:
+        print(f"\n=== {model_name} ===")
+        print(f"{'backend':>8} {'load s':>8} {'lat. s':>8} {'RSS MB':>8} {'identic':>8} {'similar':>8}")
+        reference = None
+        for backend in ["torch"] + [b for b in args.backends if b != "torch"]:
+            proc = subprocess.run(
+                [sys.executable, "-m", "Ai.compare_backends", "--worker", model_name, backend,
+                 "--input", args.input, "--repeat", str(args.repeat)],
+                capture_output=True, text=True,
+            )
+            if proc.returncode != 0:
+                print(f"{backend:>8} EȘEC: {proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else '?'}")
+                if backend == "torch":
+                    failed = True  # fără referința fp32 nu avem cu ce compara
+                    break
+                continue
+            r = json.loads(proc.stdout.strip().splitlines()[-1])
+            if reference is None:
+                reference = r["outputs"]
+            identical = sum(a == b for a, b in zip(r["outputs"], reference))
+            sim = similarity(r["outputs"], reference)
+            failed = failed or sim < args.min_similarity
+            print(f"{backend:>8} {r['load_time']:>8.2f} {r['latency']:>8.2f} {r['max_rss_mb']:>8.0f} "
+                  f"{identical:>4}/{len(reference):<3} {sim:>8.3f}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Detectarea limbii pe eșantioane din text, deterministă și cu cache.
+
+langdetect este lent pe texte lungi (costul crește cu lungimea) și aleator
+(fără seed, același text poate primi limbi diferite). Aici se detectează limba pe
+câteva ferestre egal distanțate din text (începutul, mijlocul, finalul...) și
+câștigă limba majoritară; DetectorFactory.seed = 0 face rezultatul reproductibil.
+
+Rezultatul se memorează după o cheie: hash-ul materialului când apelantul îl
+știe (ai_jobs), altfel hash-ul textului. Pe lângă cache-ul din proces se poate
+instala un store persistent (aplicația Django citește limba din RezultatAI).
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional
+
+from langdetect import DetectorFactory, LangDetectException, detect as _langdetect
+
+logger = logging.getLogger(__name__)
+
+DetectorFactory.seed = 0
+
+WINDOW_CHARS = int(os.getenv("DPF_LANGID_WINDOW_CHARS", "1000"))
+WINDOWS = int(os.getenv("DPF_LANGID_WINDOWS", "3"))
+CACHE_SIZE = 1024
+DEFAULT_LANG = 'en'
+
+_cache: "OrderedDict[str, str]" = OrderedDict()
+_lock = threading.Lock()
+_store = None
+_stats = {"calls": 0, "hits": 0, "store_hits": 0, "detect_s": 0.0}
+
+
+def set_store(store) -> None:
+    """Store persistent pentru limbile detectate (orice obiect cu get(key) / put(key, lang))."""
+    global _store
+    _store = store
+
+
+def stats() -> Dict:
+    with _lock:
+        return dict(_stats, detect_s=round(_stats["detect_s"], 4), cached=len(_cache),
+                    store=type(_store).__name__ if _store else None)
+
+
+def sample_windows(text: str, window_chars: int = WINDOW_CHARS, windows: int = WINDOWS) -> List[str]:
+    """Ferestre de ~window_chars caractere, egal distanțate, tăiate la spații (textul întreg dacă e scurt)."""
+    if len(text) <= window_chars * windows:
+        return [text]
+    step = (len(text) - window_chars) / max(1, windows - 1)
+    samples = []
+    for i in range(windows):
+        start = int(i * step)
+        end = start + window_chars
+        # Fără cuvinte tăiate la capete: se extinde până la primul spațiu
+        if start:
+            space = text.find(' ', start)
+            start = space + 1 if 0 <= space < end else start
+        space = text.rfind(' ', start, end)
+        samples.append(text[start:space if space > start else end])
+    return samples
+
+
+def _detect_one(sample: str) -> Optional[str]:
+    if not sample.strip():
+        return None
+    try:
+        return _langdetect(sample)
+    except LangDetectException:
+        return None
+
+
+def detect_full(text: str) -> str:
+    """langdetect pe textul întreg (comportamentul vechi; folosit în benchmark)."""
+    return _detect_one(text) or DEFAULT_LANG
+
+
+def detect_sampled(text: str) -> str:
+    """Limba majoritară pe ferestrele din sample_windows, ponderată cu lungimea lor (fără cache)."""
+    votes = Counter()
+    for sample in sample_windows(text):
+        found = _detect_one(sample)
+        if found:
+            votes[found] += len(sample)
+    # La egalitate câștigă limba întâlnită prima (începutul textului)
+    return votes.most_common(1)[0][0] if votes else DEFAULT_LANG
+
+
+def detect(text: str, key: Optional[str] = None) -> str:
+    """Codul limbii textului ('en' dacă nu poate fi detectată)."""
+    if not text.strip():
+        return DEFAULT_LANG
+    key = key or hashlib.sha256(text.encode("utf-8")).hexdigest()
+    with _lock:
+        _stats["calls"] += 1
+        if key in _cache:
+            _cache.move_to_end(key)
+            _stats["hits"] += 1
+            return _cache[key]
+
+    lang = _store.get(key) if _store else None
+    if lang:
+        with _lock:
+            _stats["store_hits"] += 1
+    else:
+        start = time.perf_counter()
+        lang = detect_sampled(text)
+        elapsed = time.perf_counter() - start
+        with _lock:
+            _stats["detect_s"] += elapsed
+        logger.debug("Limba %s detectată în %.3fs", lang, elapsed)
+        if _store:
+            _store.put(key, lang)
+
+    with _lock:
+        _cache[key] = lang
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return lang
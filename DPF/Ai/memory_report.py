@@ -0,0 +1,88 @@
+"""
+Raport de memorie per proces, din /proc/<pid>/smaps_rollup (Linux).
+
+  Rss     - toate paginile rezidente ale procesului
+  Pss     - Rss cu paginile partajate împărțite la numărul de procese care le folosesc
+  Privat  - pagini folosite doar de acest proces (Private_Clean + Private_Dirty);
+            memoria eliberată dacă procesul se oprește
+  Partajat- pagini comune cu alte procese (Shared_Clean + Shared_Dirty)
+
+Comparație înainte/după (workerii AI pornesc cu --procese, vezi run_ai_worker):
+    DPF_AI_MMAP=0 python manage.py run_ai_worker --procese 4 --raport-memorie
+    DPF_AI_MMAP=1 python manage.py run_ai_worker --procese 4 --raport-memorie
+sau pentru procese deja pornite:
+    python -m Ai.memory_report --copii-ale <pid_parinte>
+    python -m Ai.memory_report <pid> [<pid> ...]
+"""
+import argparse
+import os
+import sys
+from typing import Dict, Iterable, List
+
+CAMPURI = ("Rss", "Pss", "Private_Clean", "Private_Dirty", "Shared_Clean", "Shared_Dirty")
+
+
+def smaps_rollup(pid: int) -> Dict[str, int]:
+    """Câmpurile din smaps_rollup, în kB."""
+    valori = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for linie in f:
+            parti = linie.split()
+            if len(parti) >= 2 and parti[0].rstrip(":") in CAMPURI:
+                valori[parti[0].rstrip(":")] = int(parti[1])
+    return valori
+
+
+def copii(pid: int) -> List[int]:
+    """Procesele copil directe ale unui proces."""
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(p) for p in f.read().split()]
+    except FileNotFoundError:
+        return []
+
+
+def raport(pids: Iterable[int]) -> List[Dict]:
+    randuri = []
+    for pid in pids:
+        try:
+            v = smaps_rollup(pid)
+        except (FileNotFoundError, ProcessLookupError, PermissionError):
+            continue
+        randuri.append({
+            "pid": pid,
+            "rss_mb": v.get("Rss", 0) / 1024,
+            "pss_mb": v.get("Pss", 0) / 1024,
+            "privat_mb": (v.get("Private_Clean", 0) + v.get("Private_Dirty", 0)) / 1024,
+            "partajat_mb": (v.get("Shared_Clean", 0) + v.get("Shared_Dirty", 0)) / 1024,
+        })
+    return randuri
+
+
+def formateaza(randuri: List[Dict], eticheta: str = "") -> str:
+    linii = [f"{'pid':>8} {'Rss MB':>9} {'Pss MB':>9} {'Privat MB':>10} {'Partajat MB':>12}  {eticheta}".rstrip()]
+    for r in randuri:
+        linii.append(f"{r['pid']:>8} {r['rss_mb']:>9.1f} {r['pss_mb']:>9.1f} {r['privat_mb']:>10.1f} {r['partajat_mb']:>12.1f}")
+    if randuri:
+        # Suma Pss = memoria reală ocupată de grup; suma Rss ar număra paginile partajate de mai multe ori
+        linii.append(f"{'total':>8} {sum(r['rss_mb'] for r in randuri):>9.1f} {sum(r['pss_mb'] for r in randuri):>9.1f} "
+                     f"{sum(r['privat_mb'] for r in randuri):>10.1f}")
+    return "\n".join(linii)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Memoria unică (privată) și partajată per proces.")
+    parser.add_argument("pids", nargs="*", type=int)
+    parser.add_argument("--copii-ale", type=int, help="Include procesul dat și copiii lui")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        sys.exit("smaps_rollup nu este disponibil (necesită Linux >= 4.14).")
+    pids = list(args.pids)
+    if args.copii_ale:
+        pids += [args.copii_ale] + copii(args.copii_ale)
+    print(formateaza(raport(pids or [os.getpid()])))
+
+
+if __name__ == "__main__":
+    main()
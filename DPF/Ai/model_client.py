@@ -0,0 +1,147 @@
+"""
+Client subțire pentru serverul local de modele (Ai/model_server.py).
+
+Când DPF_AI_SOCKET este setat, pipeline-ul trimite rezumarea, quiz-ul și
+traducerea către server printr-un socket Unix, iar procesul curent (worker
+gunicorn sau run_ai_worker) nu mai încarcă niciun model.
+
+Protocol: fiecare mesaj este JSON UTF-8 precedat de lungimea lui pe 4 octeți
+(big-endian). Cerere: {"op": ..., "args": {...}}; răspuns: {"ok": true,
+"result": ...} sau {"ok": false, "error": "..."}. Conexiunea rămâne deschisă
+între cereri (câte una per fir de execuție).
+
+O cerere cu "stream": true (rezumat token cu token, întrebări pe măsură ce sunt
+acceptate) primește înaintea răspunsului final mesaje {"event": ...}.
+"""
+import json
+import os
+import socket
+import struct
+import threading
+
+_HEADER = struct.Struct(">I")
+_server_process = False  # setat de model_server, ca serverul să nu se apeleze pe sine
+
+
+class ModelServerError(RuntimeError):
+    """Serverul de modele a răspuns cu o eroare sau nu poate fi contactat."""
+
+
+def send_message(sock: socket.socket, payload) -> None:
+    data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("Conexiunea cu serverul de modele a fost închisă.")
+        buf.extend(chunk)
+    return bytes(buf)
+
+
+def recv_message(sock: socket.socket):
+    (length,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    return json.loads(_recv_exact(sock, length).decode("utf-8"))
+
+
+class ModelClient:
+    """Client cu o conexiune persistentă per fir de execuție, refăcută automat la nevoie."""
+
+    def __init__(self, socket_path: str, timeout: float = 300.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self._local.sock = sock
+        return sock
+
+    def close(self) -> None:
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            try: sock.close()
+            except OSError: pass
+            self._local.sock = None
+
+    def call(self, op: str, on_event=None, **args):
+        # O conexiune refolosită poate să fi fost închisă de server între timp (restart etc.);
+        # doar în acest caz reîncercăm, pe o conexiune nouă. Un timeout nu se reîncearcă și
+        # nici o cerere care a livrat deja evenimente (s-ar dubla).
+        while True:
+            sock = getattr(self._local, "sock", None)
+            reused = sock is not None
+            streamed = False
+            try:
+                sock = sock or self._connect()
+                send_message(sock, {"op": op, "args": args, "stream": on_event is not None})
+                response = recv_message(sock)
+                while "event" in response:
+                    streamed = True
+                    on_event(response["event"])
+                    response = recv_message(sock)
+                break
+            except (ConnectionError, OSError) as e:
+                self.close()
+                if not reused or streamed or isinstance(e, socket.timeout):
+                    raise ModelServerError(f"Serverul de modele ({self.socket_path}) nu răspunde: {e}") from e
+            except BaseException:
+                # Eroare în on_event: restul mesajelor din stream ar rămâne necitite pe conexiune
+                self.close()
+                raise
+        if not response.get("ok"):
+            raise ModelServerError(response.get("error") or "Eroare necunoscută în serverul de modele.")
+        return response.get("result")
+
+    # --- Operațiile expuse de server ---
+
+    def ping(self):
+        return self.call("ping")
+
+    def summarize_long(self, text: str, max_new_tokens: int = 150, num_beams: int = 4, on_token=None,
+                       tier: str = "large") -> str:
+        return self.call("summarize_long", on_event=on_token, text=text, max_new_tokens=max_new_tokens,
+                         num_beams=num_beams, tier=tier)
+
+    def summarize(self, texts, max_new_tokens: int = 150, num_beams: int = 4):
+        return self.call("summarize", texts=texts, max_new_tokens=max_new_tokens, num_beams=num_beams)
+
+    def quiz(self, context: str, max_questions: int, on_question=None, num_beams: int = 4):
+        return self.call("quiz", on_event=on_question, context=context, max_questions=max_questions,
+                         num_beams=num_beams)
+
+    def plan_generation(self, **args) -> dict:
+        """Planul de generare (Ai/budget.py) calculat cu costurile măsurate în server."""
+        return self.call("plan_generation", **args)
+
+    def detect_and_translate(self, text: str, content_key: str = None) -> dict:
+        """Returnează {"text", "original_lang", "translated"}."""
+        return self.call("detect_and_translate", text=text, content_key=content_key)
+
+    def translate_back(self, texts, original_lang: str, translated: bool = True):
+        return self.call("translate_back", texts=texts, original_lang=original_lang, translated=translated)
+
+    def stats(self):
+        return self.call("stats")
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Clientul partajat al procesului, sau None dacă DPF_AI_SOCKET nu este setat."""
+    global _client
+    socket_path = os.getenv("DPF_AI_SOCKET")
+    if not socket_path or _server_process:
+        return None
+    if _client is None or _client.socket_path != socket_path:
+        with _client_lock:
+            if _client is None or _client.socket_path != socket_path:
+                _client = ModelClient(socket_path, float(os.getenv("DPF_AI_SOCKET_TIMEOUT", "300")))
+    return _client
@@ -0,0 +1,262 @@
+"""
+Registru de modele cu încărcare leneșă (la prima utilizare).
+
+Fiecare componentă (rezumare, quiz, spaCy, traducători) are propriul loader și
+propriul lock, astfel încât două fire de execuție care cer aceeași componentă
+o încarcă o singură dată, iar procesele care nu folosesc AI (migrate,
+import_elevi etc.) nu plătesc deloc costul încărcării.
+
+Cu DPF_AI_MEMORY_BUDGET_MB, registrul devine un cache LRU: când memoria
+componentelor încărcate depășește bugetul, cea folosită cel mai demult este
+eliberată și reîncărcată la următoarea cerere. Memoria unei componente este
+mărimea tensorilor ei (modele torch) sau, altfel, creșterea RSS-ului la încărcare.
+"""
+import gc
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+MEMORY_BUDGET_MB = float(os.getenv("DPF_AI_MEMORY_BUDGET_MB", "0"))  # 0 = fără limită
+
+
+@lru_cache(maxsize=None)
+def get_device():
+    """
+    Alege dispozitivul torch (mps > cuda > cpu). Importă torch doar la prima cerere.
+    Pe CPU, torch folosește implicit toate nucleele fizice pentru un apel generate;
+    DPF_TORCH_THREADS suprascrie numărul de fire.
+    """
+    import torch
+    threads = os.getenv("DPF_TORCH_THREADS")
+    if threads:
+        torch.set_num_threads(int(threads))
+    return torch.device(
+        "mps" if torch.backends.mps.is_available()
+        else "cuda" if torch.cuda.is_available()
+        else "cpu"
+    )
+
+
+def set_torch_threads(threads: int) -> None:
+    """
+    Fixează numărul de fire torch al procesului curent. Folosit în procesele
+    create cu fork după încărcarea modelelor, ca să nu folosească fiecare toate nucleele.
+    """
+    os.environ["DPF_TORCH_THREADS"] = str(threads)
+    if "torch" in sys.modules:
+        sys.modules["torch"].set_num_threads(threads)
+
+
+def _rss_bytes() -> int:
+    """RSS-ul procesului curent (Linux); 0 dacă nu poate fi citit."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _tensor_bytes(component) -> int:
+    """Mărimea parametrilor și buffer-elor modelelor torch din componentă (tensorii partajați o dată)."""
+    parts = component if isinstance(component, (tuple, list)) else (component,)
+    seen, total = set(), 0
+    for part in parts:
+        if not hasattr(part, "parameters") or not hasattr(part, "buffers"):
+            continue
+        for t in list(part.parameters()) + list(part.buffers()):
+            key = t.data_ptr()
+            if key not in seen:
+                seen.add(key)
+                total += t.numel() * t.element_size()
+    return total
+
+
+class ModelRegistry:
+    """Ține componentele AI încărcate (LRU, cu buget de memorie opțional) și statisticile lor."""
+
+    def __init__(self, memory_budget_mb: float = MEMORY_BUDGET_MB):
+        self._loaders: Dict[str, Callable] = {}
+        self._checks: Dict[str, Callable[[], bool]] = {}
+        self._components: "OrderedDict[str, object]" = OrderedDict()  # ordinea = de la cea folosită cel mai demult
+        self._errors: Dict[str, Exception] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self.load_times: Dict[str, float] = {}
+        self.sizes: Dict[str, int] = {}
+        self._loaded_ok = set()  # componente încărcate cel puțin o dată (chiar dacă au fost eliberate)
+        self._counters: Dict[str, Dict[str, float]] = {}
+
+    def register(self, name: str, loader: Callable, check: Optional[Callable[[], bool]] = None) -> None:
+        """
+        Înregistrează un loader; componenta nu este încărcată acum. `check` (opțional)
+        spune ieftin, fără încărcare, dacă loader-ul are ce încărca (ex. directorul modelului există).
+        """
+        with self._registry_lock:
+            self._loaders[name] = loader
+            if check is not None:
+                self._checks[name] = check
+            self._locks.setdefault(name, threading.Lock())
+            self._counters.setdefault(name, {"hits": 0, "misses": 0, "loads": 0, "load_s": 0.0, "evictions": 0})
+
+    def get(self, name: str):
+        """Returnează componenta, încărcând-o la prima cerere sau după evacuare (thread-safe)."""
+        with self._registry_lock:
+            component = self._components.get(name)
+            if component is not None:
+                self._components.move_to_end(name)
+                self._counters[name]["hits"] += 1
+                return component
+        if name not in self._loaders:
+            raise KeyError(f"Componentă AI necunoscută: {name}")
+
+        with self._locks[name]:
+            # Alt fir a putut termina încărcarea cât am așteptat lock-ul
+            with self._registry_lock:
+                component = self._components.get(name)
+                if component is not None:
+                    self._components.move_to_end(name)
+                    self._counters[name]["hits"] += 1
+                    return component
+                self._counters[name]["misses"] += 1
+            if name in self._errors:
+                raise RuntimeError(f"Componenta '{name}' nu a putut fi încărcată: {self._errors[name]}")
+
+            rss_before = _rss_bytes()
+            start = time.perf_counter()
+            try:
+                component = self._loaders[name]()
+            except Exception as e:
+                self._errors[name] = e
+                logger.error("EROARE: Nu s-a putut încărca componenta '%s': %s", name, e)
+                raise RuntimeError(f"Componenta '{name}' nu a putut fi încărcată: {e}") from e
+            elapsed = time.perf_counter() - start
+            size = _tensor_bytes(component) or max(0, _rss_bytes() - rss_before)
+
+            with self._registry_lock:
+                self._components[name] = component
+                self._loaded_ok.add(name)
+                self.load_times[name] = elapsed
+                self.sizes[name] = size
+                self._counters[name]["loads"] += 1
+                self._counters[name]["load_s"] += elapsed
+                evicted = self._evict_over_budget(keep=name)
+            logger.info("Componenta '%s' a fost încărcată în %.2fs (%.0f MB)", name, elapsed, size / 2**20)
+            if evicted:
+                logger.info("Componente eliberate pentru bugetul de %.0f MB: %s",
+                            self.memory_budget / 2**20, ", ".join(evicted))
+                gc.collect()
+            return component
+
+    def _evict_over_budget(self, keep: str):
+        """Scoate componentele folosite cel mai demult până când cele rămase încap în buget (sub _registry_lock)."""
+        if not self.memory_budget:
+            return []
+        evicted = []
+        for name in list(self._components):
+            if self.memory_used() <= self.memory_budget:
+                break
+            if name == keep:
+                continue
+            # Apelurile în curs păstrează propria referință; memoria se eliberează când se termină
+            del self._components[name]
+            self._counters[name]["evictions"] += 1
+            evicted.append(name)
+        return evicted
+
+    def memory_used(self) -> int:
+        return sum(self.sizes.get(n, 0) for n in self._components)
+
+    def available(self, name: str) -> bool:
+        """
+        True dacă componenta este (sau poate fi) încărcată fără eroare.
+        O componentă eliberată din cache nu este reîncărcată doar pentru această verificare.
+        """
+        if name in self._loaded_ok and name not in self._errors:
+            return True
+        try:
+            self.get(name)
+            return True
+        except (KeyError, RuntimeError):
+            return False
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._components
+
+    def loadable(self, name: str) -> bool:
+        """
+        Ca available, dar fără să încarce componenta: True dacă este încărcată (sau
+        a fost) ori dacă are loader, nicio eroare memorată și `check`-ul trece.
+        """
+        if name not in self._loaders or name in self._errors:
+            return False
+        if name in self._loaded_ok:
+            return True
+        check = self._checks.get(name)
+        return check is None or bool(check())
+
+    def warm_up(self, names: Optional[Iterable[str]] = None) -> Dict[str, Optional[float]]:
+        """
+        Încarcă explicit componentele cerute (implicit toate) și returnează
+        timpul de încărcare pentru fiecare (None dacă încărcarea a eșuat).
+        Cu buget de memorie, ultimele componente încărcate le pot evacua pe primele.
+        """
+        names = list(names) if names is not None else list(self._loaders)
+        report = {}
+        for name in names:
+            report[name] = self.load_times.get(name) if self.available(name) else None
+        return report
+
+    def reset(self, name: Optional[str] = None) -> None:
+        """Uită o componentă (sau toate), inclusiv erorile memorate."""
+        names = [name] if name else list(self._loaders)
+        for n in names:
+            with self._locks[n], self._registry_lock:
+                self._components.pop(n, None)
+                self._errors.pop(n, None)
+                self._loaded_ok.discard(n)
+                self.load_times.pop(n, None)
+                self.sizes.pop(n, None)
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._registry_lock:
+            out = {}
+            for name in self._loaders:
+                c = self._counters[name]
+                out[name] = {
+                    "loaded": name in self._components,
+                    "load_time": self.load_times.get(name),
+                    "error": str(self._errors[name]) if name in self._errors else None,
+                    "size_mb": round(self.sizes[name] / 2**20, 1) if name in self.sizes else None,
+                    "hits": c["hits"],
+                    "misses": c["misses"],
+                    "evictions": c["evictions"],
+                    "avg_load_s": round(c["load_s"] / c["loads"], 3) if c["loads"] else None,
+                }
+            return out
+
+    def cache_stats(self) -> Dict:
+        """Totalurile cache-ului: memoria folosită față de buget, hit rate și evacuări."""
+        with self._registry_lock:
+            hits = sum(c["hits"] for c in self._counters.values())
+            misses = sum(c["misses"] for c in self._counters.values())
+            return {
+                "budget_mb": round(self.memory_budget / 2**20, 1) if self.memory_budget else None,
+                "used_mb": round(self.memory_used() / 2**20, 1),
+                "loaded": list(self._components),
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 3) if hits + misses else None,
+                "evictions": sum(c["evictions"] for c in self._counters.values()),
+                "load_s": round(sum(c["load_s"] for c in self._counters.values()), 3),
+            }
+
+
+registry = ModelRegistry()
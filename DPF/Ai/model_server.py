@@ -0,0 +1,114 @@
+"""
+Server local de modele: un singur proces ține rezumatorul, modelul de quiz,
+spaCy și traducătorii, iar workerii Django îl apelează prin Ai/model_client.py.
+Memoria pentru modele nu mai crește cu numărul de workeri gunicorn.
+
+Rulare din directorul DPF/:
+    python -m Ai.model_server --socket /tmp/dpf-ai.sock --warm-up
+iar procesele Django pornesc cu DPF_AI_SOCKET=/tmp/dpf-ai.sock. Cu DJANGO_SETTINGS_MODULE
+setat, serverul folosește memoria de traduceri din baza de date.
+"""
+import argparse
+import logging
+import os
+import socketserver
+
+from Ai import ai_pipeline as ap
+from Ai import model_client, translation
+from Ai.model_client import recv_message, send_message
+
+logger = logging.getLogger(__name__)
+
+
+def _detect_and_translate(text, content_key=None):
+    ctx = ap.PipelineContext(content_key=content_key)
+    translated_text = ap.detect_and_translate(text, ctx)
+    return {"text": translated_text, "original_lang": ctx.original_lang, "translated": ctx.translated}
+
+
+def _translate_back(texts, original_lang, translated=True):
+    ctx = ap.PipelineContext(original_lang=original_lang, translated=translated)
+    return ap.translate_back_to_original(texts, ctx)
+
+
+OPS = {
+    "ping": lambda: "pong",
+    "summarize": ap.summarize,
+    "summarize_long": ap.summarize_long,
+    "quiz": lambda context, max_questions, on_question=None, num_beams=4: ap.generate_quiz_from_context(
+        context, max_questions=max_questions, on_question=on_question, num_beams=num_beams),
+    "plan_generation": lambda **args: ap.plan_generation(**args).to_dict(),
+    "detect_and_translate": _detect_and_translate,
+    "translate_back": _translate_back,
+    "stats": lambda: {"models": ap.registry.stats(), "cache": ap.registry.cache_stats(), "batching": ap.batching_stats(),
+                      "translation": translation.stats(), "langid": ap.langid.stats(), "ranking": ap.acceptance_stats.snapshot(),
+                      "costs": ap.budget.cost_model.snapshot()},
+}
+
+# Operațiile care pot trimite progres: numele argumentului callback pentru fiecare
+STREAM_CALLBACKS = {"summarize_long": "on_token", "quiz": "on_question"}
+
+
+class ModelRequestHandler(socketserver.BaseRequestHandler):
+    """Servește cereri pe aceeași conexiune până când clientul o închide."""
+
+    def handle(self):
+        while True:
+            try:
+                request = recv_message(self.request)
+            except (ConnectionError, OSError):
+                return
+            op = OPS.get(request.get("op"))
+            if op is None:
+                response = {"ok": False, "error": f"Operație necunoscută: {request.get('op')}"}
+            else:
+                args = request.get("args", {})
+                if request.get("stream") and request.get("op") in STREAM_CALLBACKS:
+                    args[STREAM_CALLBACKS[request["op"]]] = lambda data: send_message(self.request, {"event": data})
+                try:
+                    response = {"ok": True, "result": op(**args)}
+                except Exception as e:
+                    logger.exception("Eroare la operația '%s'", request.get("op"))
+                    response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            try:
+                send_message(self.request, response)
+            except OSError:
+                return
+
+
+class ModelServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--socket", default=os.getenv("DPF_AI_SOCKET", "/tmp/dpf-ai.sock"))
+    parser.add_argument("--warm-up", action="store_true", help="Încarcă toate modelele înainte de prima cerere")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=os.getenv("AI_LOG_LEVEL", "INFO"), format="%(asctime)s %(name)s %(message)s")
+    # Serverul rulează modelele local, chiar dacă DPF_AI_SOCKET este setat în mediu
+    model_client._server_process = True
+    if os.getenv("DJANGO_SETTINGS_MODULE"):
+        # Cu setările Django disponibile, memoria de traduceri se păstrează în baza de date
+        import django
+        django.setup()
+
+    if args.warm_up:
+        for name, elapsed in ap.warm_up().items():
+            logger.info("  %s: %s", name, f"{elapsed:.2f}s" if elapsed is not None else "EȘEC")
+
+    if os.path.exists(args.socket):
+        os.unlink(args.socket)
+    with ModelServer(args.socket, ModelRequestHandler) as server:
+        logger.info("Serverul de modele ascultă pe %s", args.socket)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Generarea întrebărilor grupată pe propoziția sursă.
+
+Inputul modelului de quiz este "answer: {răspuns} context: {propoziție}". Encoder-ul
+T5 este bidirecțional, deci reprezentarea contextului depinde de răspunsul din fața
+lui: encodarea unei propoziții NU poate fi refolosită exact între răspunsuri diferite.
+Ce se poate împărți fără să schimbe rezultatul:
+
+  - tokenizarea: "context: {propoziție}" se tokenizează o dată per propoziție și se
+    lipește la tokenii fiecărui "answer: {răspuns}" (identic cu tokenizarea șirului întreg);
+  - pasul encoder-ului: candidații aceleiași propoziții au aproape aceeași lungime,
+    deci encodați împreună nu plătesc padding (un token de padding costă cât unul real);
+  - perechile (propoziție, răspuns) identice se encodează și se generează o singură dată.
+
+Stările encoder-ului se pun apoi într-un singur tensor (zero + mască pe poziții
+de padding) și întregul lot trece printr-un singur generate(encoder_outputs=...).
+"""
+from collections import OrderedDict
+from typing import Dict, List, Sequence, Tuple
+
+Pair = Tuple[str, str]  # (context, răspuns)
+
+
+def build_inputs(tok, pairs: Sequence[Pair], max_length: int) -> Tuple[List[List[int]], "OrderedDict[str, List[int]]"]:
+    """
+    Id-urile de tokeni pentru fiecare pereche unică și grupurile de indici pe context.
+    Rezultatul este același ca tok(f"answer: {a} context: {c}", max_length, truncation=True).
+    """
+    context_ids: Dict[str, List[int]] = {}
+    groups: "OrderedDict[str, List[int]]" = OrderedDict()
+    ids = []
+    for context, answer in pairs:
+        if context not in context_ids:
+            context_ids[context] = tok(f"context: {context}", add_special_tokens=False)["input_ids"]
+        prefix = tok(f"answer: {answer}", add_special_tokens=False)["input_ids"]
+        groups.setdefault(context, []).append(len(ids))
+        ids.append((prefix + context_ids[context])[:max_length - 1] + [tok.eos_token_id])
+    return ids, groups
+
+
+def padded_tokens(ids: List[List[int]], groups) -> Dict[str, int]:
+    """Tokenii procesați de encoder: reali, cu padding per grup și cu padding pe tot lotul."""
+    lengths = [len(x) for x in ids]
+    return {
+        "tokens_real": sum(lengths),
+        "tokens_grouped": sum(len(g) * max(lengths[i] for i in g) for g in groups.values()),
+        "tokens_batch": len(ids) * max(lengths, default=0),
+    }
+
+
+def _pad(rows: List[List[int]], pad_id: int, device):
+    import torch
+    width = max(len(r) for r in rows)
+    input_ids = torch.full((len(rows), width), pad_id, dtype=torch.long)
+    mask = torch.zeros((len(rows), width), dtype=torch.long)
+    for i, r in enumerate(rows):
+        input_ids[i, :len(r)] = torch.tensor(r, dtype=torch.long)
+        mask[i, :len(r)] = 1
+    return input_ids.to(device), mask.to(device)
+
+
+def encode_grouped(tok, model, ids: List[List[int]], groups):
+    """
+    Rulează encoder-ul câte un grup (o propoziție) pe rând și întoarce
+    (stări ascunse, mască) pentru toate perechile, aliniate la cea mai lungă.
+    """
+    import torch
+    encoder = model.get_encoder()
+    states = [None] * len(ids)
+    with torch.no_grad():
+        for group in groups.values():
+            input_ids, mask = _pad([ids[i] for i in group], tok.pad_token_id, model.device)
+            hidden = encoder(input_ids=input_ids, attention_mask=mask).last_hidden_state
+            for row, i in enumerate(group):
+                states[i] = hidden[row, :len(ids[i])]
+
+    width = max(len(x) for x in ids)
+    hidden = states[0].new_zeros((len(ids), width, states[0].shape[-1]))
+    mask = torch.zeros((len(ids), width), dtype=torch.long, device=hidden.device)
+    for i, s in enumerate(states):
+        hidden[i, :s.shape[0]] = s
+        mask[i, :s.shape[0]] = 1
+    return hidden, mask
+
+
+def generate(tok, model, pairs: Sequence[Pair], max_length: int, **generate_kwargs):
+    """
+    (ieșirile generate, statistici de tokeni) pentru perechile date; ieșirile
+    sunt în ordinea perechilor, cele duplicate primesc aceeași întrebare.
+    """
+    from transformers.modeling_outputs import BaseModelOutput
+
+    unique = list(OrderedDict.fromkeys(pairs))
+    ids, groups = build_inputs(tok, unique, max_length)
+    hidden, mask = encode_grouped(tok, model, ids, groups)
+    outputs = model.generate(encoder_outputs=BaseModelOutput(last_hidden_state=hidden), attention_mask=mask,
+                             **generate_kwargs)
+    position = {pair: i for i, pair in enumerate(unique)}
+    order = [position[pair] for pair in pairs]
+    stats = dict(padded_tokens(ids, groups), groups=len(groups), duplicates=len(pairs) - len(unique))
+    return outputs[order], stats
+
+
+def order_by_group(candidates: list) -> list:
+    """
+    Pune candidații aceleiași propoziții unul lângă altul, grupurile în ordinea
+    celui mai bun candidat, ca un lot de generare să conțină propoziții întregi.
+    """
+    groups: "OrderedDict[str, list]" = OrderedDict()
+    for c in candidates:
+        groups.setdefault(c.sentence, []).append(c)
+    return [c for group in groups.values() for c in group]
+
+
+def encoder_flops_per_token(config, seq_len: int) -> float:
+    """
+    FLOPs aproximativi ai encoder-ului T5 pentru un token într-o secvență de seq_len:
+    proiecțiile atenției și feed-forward-ul (2 FLOPs / parametru) + QK^T și AV.
+    """
+    inner = config.num_heads * config.d_kv
+    ff_mats = 3 if getattr(config, "is_gated_act", False) else 2
+    per_layer = 2 * (4 * config.d_model * inner + ff_mats * config.d_model * config.d_ff) + 4 * inner * seq_len
+    return config.num_layers * per_layer
@@ -0,0 +1,79 @@
+"""
+Test de stres: rulează run_full_pipeline concurent pe documente în limbi diferite
+și verifică faptul că fiecare rezultat raportează propria limbă.
+
+Rulare din directorul DPF/:
+    python -m Ai.stress_pipeline --docs 12 --threads 4
+Iese cu cod 1 dacă un rezultat are limba altui document.
+"""
+import argparse
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from langdetect import DetectorFactory
+
+from Ai import ai_pipeline as ap
+
+SAMPLES = {
+    "en": None,  # Ai/input.txt
+    "ro": (
+        "Algoritmul este o succesiune finită de pași care descrie rezolvarea unei probleme. "
+        "Fiecare pas trebuie să fie clar, precis și să poată fi executat într-un timp finit. "
+        "Datele de intrare sunt prelucrate de algoritm, iar rezultatul obținut reprezintă datele de ieșire. "
+        "Elevii învață la informatică să reprezinte algoritmii prin pseudocod și scheme logice."
+    ),
+    "fr": (
+        "Un algorithme est une suite finie d'instructions qui permet de résoudre un problème. "
+        "Chaque étape doit être claire et précise, et pouvoir être exécutée en un temps fini. "
+        "Les données d'entrée sont traitées par l'algorithme afin de produire les données de sortie. "
+        "Les élèves apprennent à représenter les algorithmes avec du pseudocode et des organigrammes."
+    ),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=12)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--num-questions", type=int, default=1)
+    parser.add_argument("--max-tokens", type=int, default=40)
+    args = parser.parse_args()
+
+    DetectorFactory.seed = 0
+    with open(os.path.join(ap.AI_MODULE_BASE_DIR, "input.txt"), encoding="utf-8") as f:
+        SAMPLES["en"] = f.read()
+
+    # Limbile așteptate: câte un document din fiecare limbă, pe rând
+    langs = list(SAMPLES)
+    jobs = []
+    for i in range(args.docs):
+        lang = langs[i % len(langs)]
+        tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".txt", mode="w", encoding="utf-8")
+        tmp.write(SAMPLES[lang]); tmp.close()
+        jobs.append((lang, tmp.name))
+
+    ap.warm_up(['summarize', 'quiz', 'nlp'])
+
+    def run(job):
+        expected, path = job
+        result = ap.run_full_pipeline(path, args.num_questions, args.max_tokens)
+        return expected, result["original_lang"]
+
+    try:
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            results = list(pool.map(run, jobs))
+    finally:
+        for _, path in jobs:
+            os.unlink(path)
+
+    mismatches = [(i, exp, got) for i, (exp, got) in enumerate(results) if exp != got]
+    for i, exp, got in mismatches:
+        print(f"Documentul {i}: așteptat {exp}, raportat {got}")
+    print(f"{len(results) - len(mismatches)}/{len(results)} documente au raportat limba corectă.")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
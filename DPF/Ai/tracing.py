@@ -0,0 +1,121 @@
+"""
+Instrumentarea pipeline-ului AI: timp real, timp CPU și tokeni pe etape.
+
+O rulare activează un PipelineTrace (`with trace.activate():`); funcțiile din
+pipeline marchează etapele cu `with tracing.stage("summarize.generate") as s:`
+și adaugă contoare cu `s.add(tokens_in=..., tokens_out=...)`. Fără un trace
+activ, `stage()` nu face nimic, deci funcțiile pot fi apelate și direct.
+
+Timpul CPU este al întregului proces (time.process_time), pentru că torch
+rulează inferența pe fire proprii; cu mai multe rulări concurente în același
+proces, valorile includ și munca celorlalte.
+Etapele rulate în alt fir (scheduler-ul de micro-batching, serverul de modele)
+nu apar în trace-ul apelantului, care vede doar durata apelului.
+"""
+import contextvars
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+_current = contextvars.ContextVar("pipeline_trace", default=None)
+
+
+class Stage:
+    def __init__(self, name: str):
+        self.name = name
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        self.counters = Counter()
+
+    def add(self, **counters) -> None:
+        self.counters.update({k: v for k, v in counters.items() if v})
+
+    def to_dict(self) -> Dict:
+        return {"name": self.name, "wall_s": round(self.wall_s, 4), "cpu_s": round(self.cpu_s, 4), **self.counters}
+
+
+class _NoStage:
+    """Etapa returnată când nu există un trace activ."""
+
+    def add(self, **counters) -> None:
+        pass
+
+
+_NO_STAGE = _NoStage()
+
+
+class PipelineTrace:
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.stages: List[Stage] = []
+        self.meta: Dict = {}  # informații despre rulare care nu sunt etape (ex. nivelul de servire)
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def activate(self):
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+    @contextmanager
+    def stage(self, name: str):
+        s = Stage(name)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield s
+        finally:
+            s.wall_s = time.perf_counter() - wall
+            s.cpu_s = time.process_time() - cpu
+            self.stages.append(s)
+
+    def summary(self) -> Dict[str, Dict]:
+        """Etapele agregate după nume (ex. toate apelurile quiz.generate), în ordinea primei apariții."""
+        out = {}
+        for s in self.stages:
+            agg = out.setdefault(s.name, {"count": 0, "wall_s": 0.0, "cpu_s": 0.0})
+            agg["count"] += 1
+            agg["wall_s"] = round(agg["wall_s"] + s.wall_s, 4)
+            agg["cpu_s"] = round(agg["cpu_s"] + s.cpu_s, 4)
+            for k, v in s.counters.items():
+                agg[k] = agg.get(k, 0) + v
+        return out
+
+    def to_dict(self) -> Dict:
+        return {
+            "label": self.label,
+            "total_s": round(time.perf_counter() - self._start, 4),
+            "summary": self.summary(),
+            "stages": [s.to_dict() for s in self.stages],
+            "meta": self.meta,
+        }
+
+    def log(self, level: int = logging.INFO) -> None:
+        parts = []
+        for name, agg in self.summary().items():
+            extra = "".join(f" {k}={v}" for k, v in agg.items() if k not in ("count", "wall_s", "cpu_s"))
+            calls = f" x{agg['count']}" if agg["count"] > 1 else ""
+            parts.append(f"{name}{calls} {agg['wall_s']:.2f}s (cpu {agg['cpu_s']:.2f}s){extra}")
+        meta = "".join(f" | {k}={v}" for k, v in self.meta.items())
+        logger.log(level, "Trace %s: total %.2fs | %s%s", self.label, time.perf_counter() - self._start,
+                   " | ".join(parts), meta)
+
+
+def current():
+    """Trace-ul activ în contextul curent, sau None."""
+    return _current.get()
+
+
+@contextmanager
+def stage(name: str):
+    trace = _current.get()
+    if trace is None:
+        yield _NO_STAGE
+        return
+    with trace.stage(name) as s:
+        yield s
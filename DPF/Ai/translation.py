@@ -0,0 +1,164 @@
+"""
+Serviciu de traducere pe propoziții, cu memorie de traduceri.
+
+Textul este împărțit în paragrafe (după rânduri goale) și propoziții;
+propozițiile unice care nu sunt deja în memorie se traduc în loturi cu padding
+(sortate după lungime), direct cu modelul MarianMT. Traducerile se memorează
+după (hash propoziție, pereche de limbi, model), deci o lecție rulată din nou,
+textele comune mai multor lecții sau același text împărțit altfel pe rânduri
+nu mai ajung la model.
+
+Memoria implicită este în proces (MemoryStore); aplicația Django instalează
+la pornire o memorie persistentă în baza de date (main.ai_cache.MemorieTraduceriStore).
+"""
+import hashlib
+import logging
+import os
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from Ai import tracing
+from Ai.model_registry import registry
+
+logger = logging.getLogger(__name__)
+
+TRANSLATE_BATCH_SIZE = int(os.getenv("DPF_TRANSLATE_BATCH_SIZE", "16"))
+MAX_SENTENCE_TOKENS = 512  # fereastra modelelor opus-mt
+
+# Paragrafele sunt separate de rânduri goale; un singur \n (textul brut din PyPDF2)
+# rupe doar rândul, deci se unește înainte de împărțirea în propoziții
+_PARAGRAPH_RE = re.compile(r'(\s*\n[ \t\r\f\v]*\n\s*)')
+_HYPHEN_BREAK_RE = re.compile(r'(?<=\w)-[ \t]*\n[ \t]*(?=\w)')
+_LINE_BREAK_RE = re.compile(r'\s*\n\s*')
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Modelele opus-mt-*-mul cer codul ISO 639-3 al limbii țintă (>>ron<<), nu cel din langdetect
+_ISO3 = {
+    'ro': 'ron', 'fr': 'fra', 'de': 'deu', 'es': 'spa', 'it': 'ita', 'pt': 'por',
+    'ru': 'rus', 'uk': 'ukr', 'hu': 'hun', 'pl': 'pol', 'bg': 'bul', 'nl': 'nld',
+}
+
+Key = Tuple[str, str, str]  # (sha256 propoziție, pereche de limbi, model)
+
+
+def sentence_hash(sentence: str) -> str:
+    return hashlib.sha256(sentence.encode("utf-8")).hexdigest()
+
+
+class MemoryStore:
+    """Memorie de traduceri în proces; se pierde la repornire."""
+
+    def __init__(self, max_entries: int = 50_000):
+        self.max_entries = max_entries
+        self._data: Dict[Key, str] = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Iterable[Key]) -> Dict[Key, str]:
+        with self._lock:
+            return {k: self._data[k] for k in keys if k in self._data}
+
+    def put_many(self, items: Dict[Key, str]) -> None:
+        with self._lock:
+            if len(self._data) + len(items) > self.max_entries:
+                self._data.clear()
+            self._data.update(items)
+
+
+_store = MemoryStore()
+_stats = {"sentences": 0, "hits": 0, "translated": 0}
+_stats_lock = threading.Lock()
+
+
+def set_store(store) -> None:
+    """Înlocuiește memoria de traduceri (orice obiect cu get_many/put_many)."""
+    global _store
+    _store = store
+
+
+def stats() -> Dict:
+    with _stats_lock:
+        return dict(_stats, store=type(_store).__name__)
+
+
+def _split(text: str) -> List[List[str]]:
+    """Paragrafe (separatorii păstrați ca atare) -> propoziții, cu rândurile din paragraf unite."""
+    parts = []
+    for part in _PARAGRAPH_RE.split(text):
+        if not part.strip():
+            parts.append(part)  # separator de paragraf
+        else:
+            part = _LINE_BREAK_RE.sub(' ', _HYPHEN_BREAK_RE.sub('', part))
+            parts.append([s.strip() for s in _SENTENCE_END_RE.split(part) if s.strip()])
+    return parts
+
+
+def _target_prefix(tok, lang: str) -> str:
+    vocab = tok.get_vocab()
+    for code in (lang, _ISO3.get(lang)):
+        if code and f">>{code}<<" in vocab:
+            return f">>{code}<< "
+    return ""
+
+
+def _translate_sentences(sentences: List[str], component: str, target_lang: Optional[str]) -> List[str]:
+    """Traduce propozițiile date în loturi cu padding; ordinea rezultatelor = ordinea intrării."""
+    import torch
+    tok, model = registry.get(component)
+    prefix = _target_prefix(tok, target_lang) if target_lang else ""
+
+    # Sortarea după lungime ține padding-ul mic în fiecare lot
+    order = sorted(range(len(sentences)), key=lambda i: len(sentences[i]))
+    results = [None] * len(sentences)
+    for start in range(0, len(order), TRANSLATE_BATCH_SIZE):
+        idx = order[start:start + TRANSLATE_BATCH_SIZE]
+        enc = tok([prefix + sentences[i] for i in idx], return_tensors="pt", padding=True,
+                  truncation=True, max_length=MAX_SENTENCE_TOKENS).to(model.device)
+        with torch.no_grad():
+            out = model.generate(**enc, max_length=MAX_SENTENCE_TOKENS)
+        for i, text in zip(idx, tok.batch_decode(out, skip_special_tokens=True)):
+            results[i] = text
+    return results
+
+
+def translate_many(texts: List[str], component: str, model_name: str, source_lang: str, target_lang: str,
+                   target_token: bool = False) -> List[str]:
+    """
+    Traduce o listă de texte cu modelul componentei `component` din registry.
+    `target_token=True` adaugă prefixul de limbă țintă cerut de modelele multilingve (en-mul).
+    """
+    pair = f"{source_lang}-{target_lang}"
+    split_texts = [_split(t) for t in texts]
+    unique = {}
+    for parts in split_texts:
+        for part in parts:
+            if isinstance(part, list):
+                for s in part:
+                    unique.setdefault((sentence_hash(s), pair, model_name), s)
+
+    with tracing.stage("translate.memory") as st:
+        known = _store.get_many(unique) if unique else {}
+        missing = [k for k in unique if k not in known]
+        st.add(sentences=len(unique), hits=len(unique) - len(missing))
+    if missing:
+        with tracing.stage("translate.generate") as st:
+            translated = _translate_sentences([unique[k] for k in missing], component,
+                                              target_lang if target_token else None)
+            st.add(sentences=len(missing))
+        new_items = dict(zip(missing, translated))
+        _store.put_many(new_items)
+        known.update(new_items)
+
+    with _stats_lock:
+        _stats["sentences"] += len(unique)
+        _stats["hits"] += len(unique) - len(missing)
+        _stats["translated"] += len(missing)
+    logger.info("Traducere %s: %d propoziții unice, %d din memorie", pair, len(unique), len(unique) - len(missing))
+
+    out = []
+    for parts in split_texts:
+        out.append("".join(
+            " ".join(known[(sentence_hash(s), pair, model_name)] for s in part) if isinstance(part, list) else part
+            for part in parts
+        ))
+    return out
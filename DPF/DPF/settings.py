@@ -154,3 +154,28 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 
 
+
+# Opțional: rezumatul și întrebările sunt trimise paginii lecției pe măsură ce se generează (server-sent events).
+# Rezumatul păstrează decodarea beam search; progresul lui vine pe bucăți ale textului, nu token cu token.
+# Fluxul SSE este un view asincron și funcționează doar sub ASGI (DPF.asgi); sub WSGI pagina face polling.
+AI_STREAMING = os.getenv('AI_STREAMING', '0') == '1'
+
+# Termenul (secunde de la cererea elevului) în care o generare AI ar trebui să fie gata; 0 = fără termen.
+# Sub presiune, worker-ul trece la mai puține beam-uri, la rezumatorul mic sau la decodare greedy.
+AI_DEADLINE_S = float(os.getenv('AI_DEADLINE_S', '0'))
+
+# Trace-ul fiecărei rulări AI (timpi și tokeni pe etape) se salvează și în tabelul TraceAI
+AI_TRACE_STORE = os.getenv('AI_TRACE_STORE', '1') == '1'
+
+# Logging: mesajele INFO ale modulelor AI (timpi de încărcare, trace-uri) ajung în consolă
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'Ai': {'handlers': ['console'], 'level': os.getenv('AI_LOG_LEVEL', 'INFO')},
+        'main': {'handlers': ['console'], 'level': os.getenv('AI_LOG_LEVEL', 'INFO')},
+    },
+}
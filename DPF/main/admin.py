@@ -4,7 +4,7 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from .models import (
     User, ElevProfile, ProfesorProfile, 
-    Materie, Lectie, MaterialDidactic
+    Materie, Lectie, MaterialDidactic, RezultatAI, JobAI, MemorieTraducere, TraceAI, TextMaterial
 )
 
 # --- 1. Admin pentru User și Profile ---
@@ -95,4 +95,43 @@ class MaterialDidacticAdmin(admin.ModelAdmin):
     """Admin pentru Materiale (listă generală)."""
     list_display = ('titlu', 'lectie', 'autor', 'fisier')
     list_filter = ('lectie__materie', 'lectie__an_studiu', 'autor')
-    search_fields = ('titlu', 'lectie__titlu')
\ No newline at end of file
+    search_fields = ('titlu', 'lectie__titlu')
+
+@admin.register(RezultatAI)
+class RezultatAIAdmin(admin.ModelAdmin):
+    """Rezultatele AI salvate (rezumat + quiz) pentru fiecare material."""
+    list_display = ('material', 'limba', 'versiune_model', 'data_crearii')
+    list_filter = ('limba', 'versiune_model')
+    readonly_fields = ('cheie', 'hash_fisier', 'versiune_model', 'parametri')
+
+
+@admin.register(JobAI)
+class JobAIAdmin(admin.ModelAdmin):
+    """Coada de joburi AI procesată de run_ai_worker."""
+    list_display = ('pk', 'material', 'status', 'incercari', 'timp_primul_token', 'data_crearii', 'data_finalizarii')
+    list_filter = ('status',)
+    readonly_fields = ('cheie', 'hash_fisier', 'parametri', 'rezultat', 'rezumat_partial', 'intrebari_partiale')
+
+
+@admin.register(MemorieTraducere)
+class MemorieTraducereAdmin(admin.ModelAdmin):
+    """Propozițiile traduse deja de pipeline-ul AI."""
+    list_display = ('pereche_limbi', 'model', 'traducere', 'data_crearii')
+    list_filter = ('pereche_limbi', 'model')
+    search_fields = ('traducere',)
+
+
+@admin.register(TraceAI)
+class TraceAIAdmin(admin.ModelAdmin):
+    """Timpii pe etape ai rulărilor AI, pentru analiza tendințelor per material."""
+    list_display = ('material', 'status', 'durata_totala', 'servire', 'versiune_model', 'data_crearii')
+    list_filter = ('status', 'versiune_model')
+    readonly_fields = ('material', 'job', 'etape', 'detalii')
+
+
+@admin.register(TextMaterial)
+class TextMaterialAdmin(admin.ModelAdmin):
+    """Textul extras din PDF-uri, refolosit de pagina materialului și de pipeline-ul AI."""
+    list_display = ('material', 'versiune_extractor', 'hash_fisier', 'data_extragerii')
+    list_filter = ('versiune_extractor',)
+    readonly_fields = ('material', 'hash_fisier', 'versiune_extractor', 'text_brut', 'text_curat')
@@ -0,0 +1,120 @@
+# DPF/main/ai_cache.py
+"""
+Cache persistent (în baza de date) pentru rezultatele pipeline-ului AI.
+
+Cheia unui rezultat = sha256(hash fișier + versiune modele + parametri generare),
+deci un fișier înlocuit sau un model schimbat nu mai găsește intrările vechi.
+"""
+import hashlib
+import json
+import os
+
+from Ai.ai_pipeline import model_version
+from .models import MemorieTraducere, RezultatAI
+
+# (cale, dimensiune, mtime) -> sha256; evită recitirea fișierului la fiecare cerere
+_hash_memo = {}
+
+
+def hash_fisier(path: str) -> str:
+    """SHA-256 al conținutului unui fișier, citit în bucăți de 1 MB."""
+    st = os.stat(path)
+    memo_key = (path, st.st_size, st.st_mtime_ns)
+    cached = _hash_memo.get(memo_key)
+    if cached:
+        return cached
+
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for bloc in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(bloc)
+    digest = h.hexdigest()
+    _hash_memo[memo_key] = digest
+    return digest
+
+
+def cheie_rezultat(hash_fis: str, versiune: str, parametri: dict) -> str:
+    payload = json.dumps({'fisier': hash_fis, 'model': versiune, 'parametri': parametri}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def parametri_lectie() -> dict:
+    """
+    Parametrii de generare folosiți de pagina lecției (lectie_ai_view). Tot ce
+    precalculează rezultate pentru lecții trebuie să-i folosească, ca cheile să coincidă.
+    """
+    return {"num_questions": 7, "max_tokens_summ": 150, "num_beams_summ": 4}
+
+
+def cauta_rezultat(material, parametri: dict):
+    """
+    Returnează (cheie, hash_fisier, RezultatAI sau None) pentru materialul dat.
+    """
+    hash_fis = hash_fisier(material.fisier.path)
+    cheie = cheie_rezultat(hash_fis, model_version(), parametri)
+    return cheie, hash_fis, RezultatAI.objects.filter(cheie=cheie).first()
+
+
+def rezultat_degradat(rezultat: RezultatAI) -> bool:
+    """Rezultatul a fost generat sub termen limită cu o configurație mai slabă decât parametrii lui."""
+    return bool((rezultat.servire or {}).get('degraded'))
+
+
+def salveaza_rezultat(material, cheie: str, hash_fis: str, parametri: dict, result: dict) -> RezultatAI:
+    """Salvează rezultatul pipeline-ului și șterge intrările cu altă versiune de model."""
+    versiune = model_version()
+    RezultatAI.objects.filter(material=material).exclude(versiune_model=versiune).delete()
+    rezultat, _ = RezultatAI.objects.update_or_create(
+        cheie=cheie,
+        defaults={
+            'material': material,
+            'hash_fisier': hash_fis,
+            'versiune_model': versiune,
+            'parametri': parametri,
+            'rezumat': result.get('final_summary', ''),
+            'quiz': result.get('quiz_results') or [],
+            'limba': result.get('original_lang', 'en'),
+            'servire': result.get('serving') or {},
+        },
+    )
+    return rezultat
+
+
+class MemorieTraduceriStore:
+    """Memoria de traduceri a Ai/translation.py, persistată în tabelul MemorieTraducere."""
+
+    def get_many(self, keys):
+        keys = list(keys)
+        if not keys:
+            return {}
+        hashes = list({k[0] for k in keys})
+        wanted = set(keys)
+        found = {}
+        # Căutăm doar după hash (indexat prin constrângerea unică); perechea și modelul se filtrează aici
+        for i in range(0, len(hashes), 500):
+            lot = hashes[i:i + 500]
+            for rand in MemorieTraducere.objects.filter(hash_propozitie__in=lot).values_list(
+                    'hash_propozitie', 'pereche_limbi', 'model', 'traducere'):
+                if rand[:3] in wanted:
+                    found[rand[:3]] = rand[3]
+        return found
+
+    def put_many(self, items):
+        MemorieTraducere.objects.bulk_create(
+            [MemorieTraducere(hash_propozitie=h, pereche_limbi=pereche, model=model, traducere=traducere)
+             for (h, pereche, model), traducere in items.items()],
+            ignore_conflicts=True,
+        )
+
+
+class LimbaMaterialStore:
+    """
+    Store-ul persistent al Ai/langid.py: limba unui material este deja salvată
+    în RezultatAI (după hash-ul fișierului), deci nu e nevoie de un tabel separat.
+    """
+
+    def get(self, key):
+        return RezultatAI.objects.filter(hash_fisier=key).values_list('limba', flat=True).first()
+
+    def put(self, key, lang):
+        pass  # limba se salvează împreună cu RezultatAI (salveaza_rezultat)
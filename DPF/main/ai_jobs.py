@@ -0,0 +1,239 @@
+# DPF/main/ai_jobs.py
+"""
+Coada de joburi AI, ținută în baza de date.
+
+Workerii web doar pun cereri în coadă (pune_in_coada); generarea efectivă
+rulează în `manage.py run_ai_worker`, care preia joburile unul câte unul.
+"""
+import logging
+import os
+import tempfile
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from Ai.ai_pipeline import PipelineContext, model_version, run_full_pipeline
+from Ai.tracing import PipelineTrace
+from . import ai_cache, text_extraction
+from .models import JobAI, RezultatAI, TraceAI
+
+logger = logging.getLogger(__name__)
+
+STATUSURI_ACTIVE = (JobAI.Status.IN_ASTEPTARE, JobAI.Status.IN_LUCRU)
+
+
+class EroareJob(Exception):
+    """Eroare „așteptată” (ex. PDF scanat), afișată ca atare utilizatorului."""
+
+
+def pune_in_coada(material, cheie: str, hash_fis: str, parametri: dict) -> JobAI:
+    """
+    Creează un job pentru cheia dată sau îl returnează pe cel deja activ,
+    astfel încât mai mulți elevi care cer aceeași lecție așteaptă același job.
+    """
+    for _ in range(2):
+        existent = JobAI.objects.filter(cheie=cheie, status__in=STATUSURI_ACTIVE).first()
+        if existent:
+            return existent
+        try:
+            with transaction.atomic():
+                return JobAI.objects.create(
+                    material=material, cheie=cheie, hash_fisier=hash_fis, parametri=parametri,
+                )
+        except IntegrityError:
+            # Altă cerere a creat jobul între verificare și insert; dacă acela s-a și
+            # terminat (ex. a eșuat imediat), încercăm încă o dată
+            pass
+    # Jobul concurent nu mai este activ: îl returnăm pe cel mai recent, cu starea lui finală
+    return JobAI.objects.filter(cheie=cheie).order_by('-data_crearii').first()
+
+
+def pozitie_in_coada(job: JobAI) -> int:
+    """Câte joburi în așteptare sunt înaintea acestuia (0 = următorul)."""
+    if job.status != JobAI.Status.IN_ASTEPTARE:
+        return 0
+    return JobAI.objects.filter(status=JobAI.Status.IN_ASTEPTARE, data_crearii__lt=job.data_crearii).count()
+
+
+def rafineaza_rezultat(rezultat: RezultatAI):
+    """
+    Pune în coadă regenerarea la calitate completă a unui rezultat degradat sub
+    termen limită (vezi termen_limita). O singură dată: nu se repune dacă pentru
+    cheie există deja un job creat după rezultat, chiar eșuat. Returnează jobul sau None.
+    """
+    if not ai_cache.rezultat_degradat(rezultat):
+        return None
+    if JobAI.objects.filter(cheie=rezultat.cheie, data_crearii__gte=rezultat.data_crearii).exists():
+        return None
+    return pune_in_coada(rezultat.material, rezultat.cheie, rezultat.hash_fisier, rezultat.parametri)
+
+
+def preia_urmatorul_job():
+    """
+    Marchează atomic primul job în așteptare ca IN_LUCRU și îl returnează.
+    UPDATE-ul condiționat pe status garantează că doi workeri nu iau același job.
+    """
+    candidati = JobAI.objects.filter(status=JobAI.Status.IN_ASTEPTARE).values_list('pk', flat=True)[:10]
+    for pk in candidati:
+        preluat = JobAI.objects.filter(pk=pk, status=JobAI.Status.IN_ASTEPTARE).update(
+            status=JobAI.Status.IN_LUCRU,
+            data_inceperii=timezone.now(),
+            incercari=F('incercari') + 1,
+            rezumat_partial='',
+            intrebari_partiale=[],
+            timp_primul_token=None,
+        )
+        if preluat:
+            return JobAI.objects.select_related('material').get(pk=pk)
+    return None
+
+
+def repune_joburi_blocate(dupa_minute: int) -> int:
+    """Joburile rămase IN_LUCRU după căderea unui worker sunt repuse în coadă."""
+    limita = timezone.now() - timedelta(minutes=dupa_minute)
+    return JobAI.objects.filter(status=JobAI.Status.IN_LUCRU, data_inceperii__lt=limita).update(
+        status=JobAI.Status.IN_ASTEPTARE,
+    )
+
+
+class ProgresJob:
+    """
+    Primește evenimentele pipeline-ului și le scrie în JobAI, de unde le citește
+    endpoint-ul SSE. Token-urile rezumatului se scriu cel mult o dată la INTERVAL secunde.
+    """
+    INTERVAL = 0.25
+
+    def __init__(self, job: JobAI):
+        self.job = job
+        self.rezumat = ''
+        self.intrebari = []
+        self._ultima_scriere = 0.0
+
+    def __call__(self, tip: str, date):
+        campuri = {}
+        if tip == 'summary_token':
+            if not self.rezumat:
+                self._primul_token(campuri)
+            self.rezumat += date
+            if time.monotonic() - self._ultima_scriere < self.INTERVAL and not campuri:
+                return
+        elif tip == 'summary':
+            self.rezumat = date
+        elif tip == 'question':
+            self.intrebari.append(date)
+        else:
+            return
+        self._ultima_scriere = time.monotonic()
+        JobAI.objects.filter(pk=self.job.pk).update(
+            rezumat_partial=self.rezumat, intrebari_partiale=self.intrebari, **campuri,
+        )
+
+    def _primul_token(self, campuri: dict):
+        acum = timezone.now()
+        dupa_preluare = (acum - self.job.data_inceperii).total_seconds() if self.job.data_inceperii else None
+        campuri['timp_primul_token'] = dupa_preluare
+        logger.info(
+            "Jobul AI #%s: primul token după %.2fs de la preluare (%.2fs de la cerere)",
+            self.job.pk, dupa_preluare or 0.0, (acum - self.job.data_crearii).total_seconds(),
+        )
+
+
+def ruleaza_pipeline_pdf(pdf_path: str, parametri: dict, on_event=None, trace=None,
+                         deadline_s: float = None, queue_depth: int = 0, hash_fis: str = None,
+                         text: str = None) -> dict:
+    """
+    Rulează pipeline-ul pe textul PDF-ului (`text`, deja extras, sau extras acum).
+    Nu scrie în baza de date, deci poate rula și într-un proces separat (precompute_lessons).
+    `hash_fis` este cheia sub care se memorează limba detectată a materialului.
+    """
+    trace = trace or PipelineTrace(os.path.basename(pdf_path))
+    if text is None:
+        with trace.stage("extract_pdf") as etapa:
+            text = text_extraction.extract_text_from_pdf_path(pdf_path)
+            etapa.add(chars=len(text))
+    if not text.strip():
+        raise EroareJob("PDF-ul pare gol sau scanat (fără text). Pentru PDF-uri scanate ai nevoie de OCR.")
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".txt", mode="w", encoding="utf-8") as tmp:
+        tmp.write(text)
+        tmp_path = tmp.name
+
+    try:
+        result = run_full_pipeline(tmp_path, **parametri, ctx=PipelineContext(content_key=hash_fis),
+                                   on_event=on_event, trace=trace, deadline_s=deadline_s, queue_depth=queue_depth)
+    finally:
+        try: os.unlink(tmp_path)
+        except OSError: pass
+
+    if not result:
+        raise EroareJob("Procesarea nu a returnat rezultat.")
+    return result
+
+
+def genereaza_rezultat(material, cheie: str, hash_fis: str, parametri: dict, on_event=None, trace=None,
+                       deadline_s: float = None, queue_depth: int = 0):
+    """Rulează pipeline-ul pe textul salvat al materialului (TextMaterial) și salvează RezultatAI."""
+    trace = trace or PipelineTrace(str(material))
+    with trace.stage("extract_text") as etapa:
+        text = text_extraction.text_material(material).text_brut
+        etapa.add(chars=len(text))
+    result = ruleaza_pipeline_pdf(material.fisier.path, parametri, on_event=on_event, trace=trace,
+                                  deadline_s=deadline_s, queue_depth=queue_depth, hash_fis=hash_fis, text=text)
+    return ai_cache.salveaza_rezultat(material, cheie, hash_fis, parametri, result)
+
+
+def executa_job(job: JobAI) -> JobAI:
+    """Rulează un job preluat și îi salvează starea finală."""
+    trace = PipelineTrace(f"job #{job.pk} {job.material}")
+    try:
+        progres = ProgresJob(job) if settings.AI_STREAMING else None
+        job.rezultat = genereaza_rezultat(job.material, job.cheie, job.hash_fisier, job.parametri,
+                                          on_event=progres, trace=trace, **termen_limita(job))
+        job.status = JobAI.Status.FINALIZAT
+        job.eroare = ''
+    except EroareJob as e:
+        job.status = JobAI.Status.ESUAT
+        job.eroare = str(e)
+    except Exception as e:
+        logger.exception("Jobul AI #%s a eșuat", job.pk)
+        job.status = JobAI.Status.ESUAT
+        job.eroare = f"Eroare la generare: {e}"
+    job.data_finalizarii = timezone.now()
+    job.save(update_fields=['rezultat', 'status', 'eroare', 'data_finalizarii'])
+    if settings.AI_TRACE_STORE:
+        salveaza_trace(job.material, trace.to_dict(), job.status, job=job)
+    return job
+
+
+def termen_limita(job: JobAI) -> dict:
+    """
+    Timpul rămas din AI_DEADLINE_S (socotit de la crearea jobului, deci include
+    așteptarea în coadă) și câte joburi așteaptă în urma acestuia. Un job pentru o
+    cheie care are deja rezultat (regenerarea unuia degradat) rulează fără termen:
+    elevii văd între timp rezultatul salvat.
+    """
+    if not settings.AI_DEADLINE_S or RezultatAI.objects.filter(cheie=job.cheie).exists():
+        return {}
+    asteptat = (timezone.now() - job.data_crearii).total_seconds()
+    return {
+        'deadline_s': max(0.0, settings.AI_DEADLINE_S - asteptat),
+        'queue_depth': JobAI.objects.filter(status=JobAI.Status.IN_ASTEPTARE).count(),
+    }
+
+
+def salveaza_trace(material, date: dict, status: str, job: JobAI = None) -> TraceAI:
+    """Salvează un trace (PipelineTrace.to_dict()) pentru material."""
+    return TraceAI.objects.create(
+        material=material,
+        job=job,
+        status=status,
+        versiune_model=model_version(),
+        durata_totala=date['total_s'],
+        servire=date['meta'].get('serving') or {},
+        etape=date['summary'],
+        detalii=date['stages'],
+    )
@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class MainConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'main'
+
+    def ready(self):
+        from . import signals  # noqa: F401 (înregistrează receiver-ele)
+
+        # Memoria de traduceri a pipeline-ului AI se păstrează în baza de date
+        from Ai import langid, translation
+        from .ai_cache import LimbaMaterialStore, MemorieTraduceriStore
+        translation.set_store(MemorieTraduceriStore())
+        langid.set_store(LimbaMaterialStore())
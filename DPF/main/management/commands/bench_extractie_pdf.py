@@ -0,0 +1,52 @@
+# DPF/main/management/commands/bench_extractie_pdf.py
+
+import glob
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main import pdf_pages
+
+
+class Command(BaseCommand):
+    help = ('Măsoară extragerea textului din PDF-urile unui director cu 1..N procese '
+            '(main/pdf_pages.py) și afișează accelerarea față de extragerea serială.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dir', default='materiale_didactice/2025/11',
+                            help='Directorul cu PDF-uri (implicit materiale_didactice/2025/11)')
+        parser.add_argument('--workers', default='',
+                            help='Numerele de procese de comparat, ex. "1,2,4" (implicit 1, 2, 4... până la numărul de nuclee)')
+        parser.add_argument('--repeats', type=int, default=3, help='Repetări; se păstrează cel mai bun timp')
+
+    def handle(self, *args, **options):
+        fisiere = sorted(glob.glob(os.path.join(options['dir'], '*.pdf')))
+        if not fisiere:
+            raise CommandError(f"Niciun PDF în {options['dir']}.")
+        nuclee = os.cpu_count() or 1
+        if options['workers']:
+            workeri = [int(w) for w in options['workers'].split(',') if int(w) >= 1]
+        else:
+            workeri = sorted({1, nuclee} | {2 ** i for i in range(1, 8) if 2 ** i <= nuclee})
+
+        pagini = {f: range(1, len(pdf_pages.PdfReader(f).pages) + 1) for f in fisiere}
+        total_pagini = sum(len(p) for p in pagini.values())
+        referinta = {f: pdf_pages.extract_pages(f, p, workers=1) for f, p in pagini.items()}
+        self.stdout.write(f"{len(fisiere)} PDF-uri, {total_pagini} pagini, {nuclee} nuclee.")
+        self.stdout.write(f"{'procese':>8} {'secunde':>9} {'pagini/s':>9} {'accelerare':>11}")
+
+        serial = None
+        for n in workeri:
+            # Prima rulare pornește procesele din pool; nu intră în măsurătoare
+            for f, p in pagini.items():
+                pdf_pages.extract_pages(f, p, workers=n, min_pages=2)
+            cel_mai_bun = float('inf')
+            for _ in range(options['repeats']):
+                start = time.perf_counter()
+                rezultate = {f: pdf_pages.extract_pages(f, p, workers=n, min_pages=2) for f, p in pagini.items()}
+                cel_mai_bun = min(cel_mai_bun, time.perf_counter() - start)
+            if rezultate != referinta:
+                raise CommandError(f"Textul extras cu {n} procese diferă de extragerea serială.")
+            serial = serial or cel_mai_bun
+            self.stdout.write(f"{n:>8} {cel_mai_bun:>9.3f} {total_pagini / cel_mai_bun:>9.1f} {serial / cel_mai_bun:>10.2f}x")
@@ -0,0 +1,50 @@
+# DPF/main/management/commands/bench_normalizare.py
+
+import glob
+import os
+import time
+import warnings
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main import text_normalizer
+from main.text_extraction import extract_text_from_pdf_path
+
+
+class Command(BaseCommand):
+    help = ('Măsoară debitul (MB/s) normalizării textului extras: vechea implementare, '
+            'main/text_normalizer.py pe textul întreg și pe bucăți.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dir', default='materiale_didactice/2025/11',
+                            help='Directorul cu PDF-uri (implicit materiale_didactice/2025/11)')
+        parser.add_argument('--mb', type=float, default=8, help='Mărimea textului de test (textul PDF-urilor repetat)')
+        parser.add_argument('--repeats', type=int, default=3, help='Repetări; se păstrează cel mai bun timp')
+
+    def handle(self, *args, **options):
+        fisiere = sorted(glob.glob(os.path.join(options['dir'], '*.pdf')))
+        if not fisiere:
+            raise CommandError(f"Niciun PDF în {options['dir']}.")
+        corpus = "\n\n".join(extract_text_from_pdf_path(f) for f in fisiere)
+        text = corpus * max(1, int(options['mb'] * 1e6 / len(corpus.encode('utf-8'))))
+        mb = len(text.encode('utf-8')) / 1e6
+        self.stdout.write(f"{len(fisiere)} PDF-uri, text de test {mb:.1f} MB.")
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', FutureWarning)
+            variante = [
+                ('vechi (10 treceri)', text_normalizer.reference_normalize),
+                ('normalize_text', text_normalizer.normalize_text),
+                ('normalize_stream', lambda t: ''.join(text_normalizer.normalize_stream([t]))),
+            ]
+            referinta = None
+            for nume, functie in variante:
+                cel_mai_bun = float('inf')
+                for _ in range(options['repeats']):
+                    start = time.perf_counter()
+                    rezultat = functie(text)
+                    cel_mai_bun = min(cel_mai_bun, time.perf_counter() - start)
+                referinta = referinta if referinta is not None else rezultat
+                if rezultat != referinta:
+                    raise CommandError(f"{nume} produce alt text decât vechea implementare.")
+                self.stdout.write(f"{nume:<20} {cel_mai_bun:>7.3f}s {mb / cel_mai_bun:>8.1f} MB/s")
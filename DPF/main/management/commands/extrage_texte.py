@@ -0,0 +1,55 @@
+# DPF/main/management/commands/extrage_texte.py
+
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from main import text_extraction
+from main.ai_cache import hash_fisier
+from main.models import MaterialDidactic, PaginaText, TextMaterial
+
+
+class Command(BaseCommand):
+    help = ('Extrage și salvează textul (TextMaterial) pentru toate materialele PDF care nu îl au încă '
+            'pentru versiunea curentă a fișierului și a extractorului.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sterge-vechi', action='store_true',
+                            help='Șterge textele vechi (fișier schimbat/șters sau altă versiune a extractorului)')
+
+    def handle(self, *args, **options):
+        materiale = MaterialDidactic.objects.exclude(fisier='').exclude(fisier__isnull=True).order_by('pk')
+        noi = existente = lipsa = 0
+        hashuri = set()
+        start = time.perf_counter()
+
+        for material in materiale.iterator():
+            if not os.path.exists(material.fisier.path):
+                lipsa += 1
+                self.stdout.write(self.style.WARNING(f"  Fișier lipsă: {material.fisier.name}"))
+                continue
+            hash_fis = hash_fisier(material.fisier.path)
+            hashuri.add(hash_fis)
+            if TextMaterial.objects.filter(hash_fisier=hash_fis,
+                                           versiune_extractor=text_extraction.EXTRACTOR_VERSION).exists():
+                existente += 1
+                continue
+            t0 = time.perf_counter()
+            text = text_extraction.text_material(material)
+            noi += 1
+            self.stdout.write(f"  {material}: {len(text.text_brut)} caractere în {time.perf_counter() - t0:.2f}s")
+
+        vechi = text_extraction.texte_vechi(hashuri)
+        pagini_vechi = text_extraction.pagini_vechi(hashuri)
+        nr_vechi, nr_pagini_vechi = vechi.count(), pagini_vechi.count()
+        self.stdout.write(self.style.SUCCESS(
+            f"Gata în {time.perf_counter() - start:.1f}s: {noi} extrase, {existente} deja salvate, "
+            f"{lipsa} fișiere lipsă, {nr_vechi} texte vechi, {nr_pagini_vechi} pagini vechi."
+        ))
+        if (nr_vechi or nr_pagini_vechi) and options['sterge_vechi']:
+            sterse, _ = TextMaterial.objects.filter(pk__in=vechi.values('pk')).delete()
+            pagini_sterse, _ = PaginaText.objects.filter(pk__in=pagini_vechi.values('pk')).delete()
+            self.stdout.write(self.style.SUCCESS(f"{sterse} texte și {pagini_sterse} pagini vechi șterse."))
+        elif nr_vechi or nr_pagini_vechi:
+            self.stdout.write("Rulați cu --sterge-vechi pentru a le șterge.")
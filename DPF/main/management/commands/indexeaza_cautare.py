@@ -0,0 +1,38 @@
+# DPF/main/management/commands/indexeaza_cautare.py
+
+import os
+import time
+
+from django.db import connection
+from django.core.management.base import BaseCommand
+
+from main import search_index, text_extraction
+from main.models import MaterialDidactic
+
+
+class Command(BaseCommand):
+    help = ('Reconstruiește indexul de căutare full-text (DocumentCautare) pentru toate materialele. '
+            'Reinstalează și indexul bazei de date (tsvector/GIN sau FTS5), dacă lipsește.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--extrage', action='store_true',
+                            help='Extrage textul PDF-urilor care nu au încă text salvat (altfel se indexează doar titlurile)')
+
+    def handle(self, *args, **options):
+        with connection.schema_editor() as schema_editor:
+            search_index.instaleaza_index(schema_editor)
+        self.stdout.write(f"Motor de căutare: {search_index.motor()}")
+
+        materiale = MaterialDidactic.objects.select_related('lectie').order_by('pk')
+        indexate = cu_text = 0
+        start = time.perf_counter()
+        for material in materiale.iterator():
+            if options['extrage'] and material.fisier and os.path.exists(material.fisier.path):
+                text_extraction.text_material(material)
+            document = search_index.indexeaza_material(material)
+            indexate += 1
+            cu_text += bool(document.text)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Gata în {time.perf_counter() - start:.1f}s: {indexate} materiale indexate, {cu_text} cu text extras."
+        ))
@@ -0,0 +1,135 @@
+# DPF/main/management/commands/precompute_lessons.py
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from main import ai_cache, ai_jobs, text_extraction
+from main.models import JobAI, Lectie, MaterialDidactic
+
+# Etapele trace-ului care trec textul prin modele (pentru tokeni/s)
+ETAPE_GENERATE = ('summarize.generate', 'quiz.generate')
+
+
+def _initializeaza_worker(fire_torch: int):
+    """Rulează o dată în fiecare proces din pool: setup Django și încărcarea modelelor."""
+    if fire_torch and not os.getenv('DPF_TORCH_THREADS'):
+        # Procesele își împart nucleele, în loc ca fiecare să le folosească pe toate
+        os.environ['DPF_TORCH_THREADS'] = str(fire_torch)
+    import django
+    django.setup()
+
+    from Ai.ai_pipeline import warm_up
+    from Ai.model_client import get_client
+    if get_client() is None:
+        warm_up(['summarize', 'quiz', 'nlp', 'translate', 'translate_back'])
+
+
+def _proceseaza(pdf_path: str, parametri: dict, hash_fis: str, text: str) -> dict:
+    """Rulează în procesul din pool; nu scrie în baza de date (o face procesul părinte)."""
+    start = time.perf_counter()
+    try:
+        result = ai_jobs.ruleaza_pipeline_pdf(pdf_path, parametri, hash_fis=hash_fis, text=text)
+    except ai_jobs.EroareJob as e:
+        return {'eroare': str(e), 'durata': time.perf_counter() - start}
+    except Exception as e:
+        return {'eroare': f"{type(e).__name__}: {e}", 'durata': time.perf_counter() - start}
+    return {'result': result, 'durata': time.perf_counter() - start}
+
+
+def _tokeni(trace: dict) -> int:
+    sumar = trace.get('summary', {})
+    return sum(sumar.get(e, {}).get('tokens_in', 0) + sumar.get(e, {}).get('tokens_out', 0) for e in ETAPE_GENERATE)
+
+
+class Command(BaseCommand):
+    help = ('Generează dinainte rezumatele și quiz-urile AI pentru materialele PDF ale lecțiilor, '
+            'folosind un pool de procese. Materialele cu rezultat deja salvat (același conținut) sunt sărite.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--an', type=int, choices=Lectie.AnStudiu.values,
+                            help='Doar lecțiile acestui an de studiu')
+        parser.add_argument('--materie', help='Doar lecțiile acestei materii (numele, fără diferențe de majuscule)')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Numărul de procese; fiecare încarcă modelele o singură dată (implicit 1)')
+        parser.add_argument('--limit', type=int, help='Procesează cel mult atâtea materiale')
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1:
+            raise CommandError('--workers trebuie să fie cel puțin 1.')
+
+        materiale = (MaterialDidactic.objects
+                     .select_related('lectie', 'lectie__materie')
+                     .exclude(fisier='').exclude(fisier__isnull=True)
+                     .order_by('lectie__an_studiu', 'lectie__materie__nume', 'lectie__titlu', 'pk'))
+        if options['an']:
+            materiale = materiale.filter(lectie__an_studiu=options['an'])
+        if options['materie']:
+            materiale = materiale.filter(lectie__materie__nume__iexact=options['materie'])
+
+        parametri = ai_cache.parametri_lectie()
+        de_procesat, sarite = self._selecteaza(materiale, parametri, options['limit'])
+        self.stdout.write(f"{len(de_procesat)} materiale de procesat, {sarite} sărite (rezultat deja salvat).")
+        if not de_procesat:
+            return
+
+        # Textul vine din TextMaterial (extras și salvat aici, în părinte, dacă lipsește)
+        texte = {material.pk: text_extraction.text_material(material).text_brut for material, _, _ in de_procesat}
+        # Procesele din pool nu trebuie să moștenească conexiunile deschise ale părintelui
+        connections.close_all()
+        fire_torch = max(1, (os.cpu_count() or 1) // options['workers'])
+
+        start = time.perf_counter()
+        ok = erori = tokeni = 0
+        with ProcessPoolExecutor(max_workers=options['workers'], initializer=_initializeaza_worker,
+                                 initargs=(fire_torch,)) as pool:
+            viitoare = {
+                pool.submit(_proceseaza, material.fisier.path, parametri, hash_fis,
+                            texte[material.pk]): (material, cheie, hash_fis)
+                for material, cheie, hash_fis in de_procesat
+            }
+            for viitor in as_completed(viitoare):
+                material, cheie, hash_fis = viitoare[viitor]
+                raspuns = viitor.result()
+                if 'eroare' in raspuns:
+                    erori += 1
+                    self.stdout.write(self.style.ERROR(f"  EȘEC {material}: {raspuns['eroare']}"))
+                    continue
+
+                # Salvarea după fiecare material face comanda reluabilă după o întrerupere
+                result = raspuns['result']
+                ai_cache.salveaza_rezultat(material, cheie, hash_fis, parametri, result)
+                if settings.AI_TRACE_STORE:
+                    ai_jobs.salveaza_trace(material, result['trace'], JobAI.Status.FINALIZAT)
+                ok += 1
+                tokeni_doc = _tokeni(result['trace'])
+                tokeni += tokeni_doc
+                self.stdout.write(f"  [{ok + erori}/{len(de_procesat)}] {material} "
+                                  f"{raspuns['durata']:.1f}s, {tokeni_doc} tokeni")
+
+        durata = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Gata: {ok} materiale, {erori} erori în {durata:.1f}s | "
+            f"{ok / durata * 60:.2f} documente/min | {tokeni / durata:.1f} tokeni/s"
+        ))
+
+    def _selecteaza(self, materiale, parametri: dict, limit=None):
+        """(material, cheie, hash) pentru materialele fără rezultat salvat; hash-ul se calculează din conținut."""
+        de_procesat, sarite, chei = [], 0, set()
+        for material in materiale.iterator():
+            if not os.path.exists(material.fisier.path):
+                self.stdout.write(self.style.WARNING(f"  Fișier lipsă: {material.fisier.name}"))
+                continue
+            cheie, hash_fis, rezultat = ai_cache.cauta_rezultat(material, parametri)
+            if rezultat or cheie in chei:  # același PDF încărcat la mai multe lecții se procesează o dată
+                sarite += 1
+                continue
+            chei.add(cheie)
+            de_procesat.append((material, cheie, hash_fis))
+            if limit and len(de_procesat) >= limit:
+                break
+        return de_procesat, sarite
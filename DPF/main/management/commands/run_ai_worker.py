@@ -0,0 +1,165 @@
+# DPF/main/management/commands/run_ai_worker.py
+
+import gc
+import os
+import signal
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+
+from main import ai_jobs, search_index
+
+
+class Command(BaseCommand):
+    help = 'Pornește workerul local care rulează joburile AI (rezumat + quiz) din coadă.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--poll', type=float, default=2.0,
+                            help='Secunde de pauză când coada este goală (implicit 2)')
+        parser.add_argument('--once', action='store_true',
+                            help='Procesează joburile existente și se oprește')
+        parser.add_argument('--warm-up', action='store_true',
+                            help='Încarcă modelele la pornire, nu la primul job')
+        parser.add_argument('--stale-minutes', type=int, default=30,
+                            help='Joburile IN_LUCRU mai vechi de atât sunt repuse în coadă (implicit 30)')
+        parser.add_argument('--procese', type=int, default=1,
+                            help='Numărul de procese worker. Cu mai multe, modelele se încarcă o dată în '
+                                 'procesul părinte, iar workerii (fork) le partajează paginile (implicit 1)')
+        parser.add_argument('--raport-memorie', action='store_true',
+                            help='Cu --procese: afișează memoria privată/partajată a fiecărui proces după pornire')
+
+    def handle(self, *args, **options):
+        repuse = ai_jobs.repune_joburi_blocate(options['stale_minutes'])
+        if repuse:
+            self.stdout.write(self.style.WARNING(f"{repuse} joburi blocate au fost repuse în coadă."))
+
+        if options['procese'] > 1:
+            self._ruleaza_procese(options)
+            return
+
+        if options['warm_up'] and not self._modele_in_server():
+            self._warm_up()
+        self.stdout.write(self.style.SUCCESS("--- Workerul AI a pornit ---"))
+        self._bucla(options)
+        self.stdout.write(self.style.SUCCESS("--- Workerul AI s-a oprit ---"))
+
+    def _modele_in_server(self) -> bool:
+        """
+        Cu DPF_AI_SOCKET, pipeline-ul rulează modelele în serverul de modele (Ai/model_server.py),
+        deci o copie locală a greutăților ar ocupa memorie fără să fie folosită.
+        """
+        from Ai.model_client import get_client
+        client = get_client()
+        if client is None:
+            return False
+        self.stdout.write(f"Modelele rulează în serverul de modele ({client.socket_path}); nu se încarcă local.")
+        return True
+
+    def _warm_up(self):
+        from Ai.ai_pipeline import warm_up
+        for nume, durata in warm_up().items():
+            stare = f"{durata:.2f}s" if durata is not None else "EȘEC"
+            self.stdout.write(f"  {nume}: {stare}")
+
+    def _bucla(self, options):
+        try:
+            while True:
+                close_old_connections()
+                job = ai_jobs.preia_urmatorul_job()
+                if job is None:
+                    # Coada e goală: textul materialelor noi intră în indexul de căutare
+                    if search_index.indexeaza_texte_lipsa():
+                        continue
+                    if options['once']:
+                        break
+                    time.sleep(options['poll'])
+                    continue
+
+                self.stdout.write(f"Job #{job.pk}: {job.material} ...")
+                start = time.perf_counter()
+                job = ai_jobs.executa_job(job)
+                durata = time.perf_counter() - start
+                if job.status == job.Status.FINALIZAT:
+                    self.stdout.write(self.style.SUCCESS(f"Job #{job.pk} finalizat în {durata:.1f}s"))
+                else:
+                    self.stdout.write(self.style.ERROR(f"Job #{job.pk} eșuat: {job.eroare}"))
+        except KeyboardInterrupt:
+            pass
+
+    def _ruleaza_procese(self, options):
+        """
+        Modelul „preload” din gunicorn: părintele încarcă modelele și apoi creează
+        workerii cu fork, fără să ruleze inferență (OpenMP nu suportă fork după o regiune paralelă).
+        Tensorii (mapați cu DPF_AI_MMAP=1 sau citiți în heap) sunt partajați copy-on-write.
+        """
+        if not hasattr(os, 'fork'):
+            raise CommandError('--procese necesită fork (Linux/macOS).')
+        from Ai.model_registry import set_torch_threads
+
+        n = options['procese']
+        fire_torch = max(1, (os.cpu_count() or 1) // n)
+        preincarcare = not self._modele_in_server()
+        if preincarcare:
+            self._warm_up()
+        # Workerii nu trebuie să moștenească conexiunile deschise ale părintelui
+        connections.close_all()
+        if preincarcare:
+            # Obiectele existente trec în generația permanentă: GC-ul din workeri nu le mai atinge
+            # (și nu le mai copiază paginile la scrierea antetelor)
+            gc.freeze()
+
+        workeri = {}
+        oprire = False
+
+        def porneste(slot):
+            pid = os.fork()
+            if pid == 0:
+                signal.signal(signal.SIGTERM, signal.default_int_handler)
+                cod = 0
+                try:
+                    set_torch_threads(fire_torch)
+                    self._bucla(options)
+                except Exception:
+                    cod = 1
+                finally:
+                    os._exit(cod)
+            workeri[pid] = slot
+
+        def opreste(signum, frame):
+            nonlocal oprire
+            oprire = True
+            for pid in workeri:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+
+        for slot in range(n):
+            porneste(slot)
+        signal.signal(signal.SIGTERM, opreste)
+        signal.signal(signal.SIGINT, opreste)
+        self.stdout.write(self.style.SUCCESS(
+            f"--- {n} workeri AI au pornit (pid {', '.join(map(str, workeri))}; {fire_torch} fire torch fiecare) ---"
+        ))
+
+        if options['raport_memorie']:
+            from Ai.memory_report import formateaza, raport
+            time.sleep(2)
+            self.stdout.write(formateaza(raport([os.getpid(), *workeri]), "(primul rând = părintele)"))
+
+        while workeri:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            slot = workeri.pop(pid, None)
+            if slot is None:
+                continue
+            if not oprire and not options['once']:
+                self.stdout.write(self.style.WARNING(f"Workerul {pid} s-a oprit (status {status}); pornesc altul."))
+                time.sleep(1)  # fără buclă strânsă dacă workerii cad imediat (ex. baza de date indisponibilă)
+                porneste(slot)
+        self.stdout.write(self.style.SUCCESS("--- Workerii AI s-au oprit ---"))
@@ -0,0 +1,14 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:12
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0002_alter_elevprofile_cod_quiz_mesaj'),
+        ('main', '0005_elevprofile_poza_profil'),
+    ]
+
+    operations = [
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0006_merge'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RezultatAI',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cheie', models.CharField(max_length=64, unique=True)),
+                ('hash_fisier', models.CharField(db_index=True, max_length=64)),
+                ('versiune_model', models.CharField(max_length=64)),
+                ('parametri', models.JSONField(default=dict)),
+                ('rezumat', models.TextField(blank=True)),
+                ('quiz', models.JSONField(default=list)),
+                ('limba', models.CharField(default='en', max_length=10)),
+                ('data_crearii', models.DateTimeField(auto_now_add=True)),
+                ('material', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rezultate_ai', to='main.materialdidactic')),
+            ],
+            options={
+                'verbose_name': 'Rezultat AI',
+                'verbose_name_plural': 'Rezultate AI',
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0007_rezultatai'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobAI',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cheie', models.CharField(db_index=True, max_length=64)),
+                ('hash_fisier', models.CharField(max_length=64)),
+                ('parametri', models.JSONField(default=dict)),
+                ('status', models.CharField(choices=[('IN_ASTEPTARE', 'În așteptare'), ('IN_LUCRU', 'În lucru'), ('FINALIZAT', 'Finalizat'), ('ESUAT', 'Eșuat')], db_index=True, default='IN_ASTEPTARE', max_length=16)),
+                ('eroare', models.TextField(blank=True)),
+                ('incercari', models.PositiveSmallIntegerField(default=0)),
+                ('data_crearii', models.DateTimeField(auto_now_add=True)),
+                ('data_inceperii', models.DateTimeField(blank=True, null=True)),
+                ('data_finalizarii', models.DateTimeField(blank=True, null=True)),
+                ('material', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='joburi_ai', to='main.materialdidactic')),
+                ('rezultat', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='joburi', to='main.rezultatai')),
+            ],
+            options={
+                'verbose_name': 'Job AI',
+                'verbose_name_plural': 'Joburi AI',
+                'ordering': ['data_crearii'],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('status__in', ['IN_ASTEPTARE', 'IN_LUCRU'])), fields=('cheie',), name='job_ai_unic_activ_per_cheie')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0008_jobai'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MemorieTraducere',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hash_propozitie', models.CharField(max_length=64)),
+                ('pereche_limbi', models.CharField(max_length=16)),
+                ('model', models.CharField(max_length=100)),
+                ('traducere', models.TextField()),
+                ('data_crearii', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Memorie traducere',
+                'verbose_name_plural': 'Memorie traduceri',
+                'constraints': [models.UniqueConstraint(fields=('hash_propozitie', 'pereche_limbi', 'model'), name='memorie_traducere_unica')],
+            },
+        ),
+    ]
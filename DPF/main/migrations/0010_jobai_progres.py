@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0009_memorietraducere'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobai',
+            name='intrebari_partiale',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='jobai',
+            name='rezumat_partial',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='jobai',
+            name='timp_primul_token',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0010_jobai_progres'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TraceAI',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(max_length=16)),
+                ('versiune_model', models.CharField(max_length=64)),
+                ('durata_totala', models.FloatField()),
+                ('etape', models.JSONField(default=dict)),
+                ('detalii', models.JSONField(default=list)),
+                ('data_crearii', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('job', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='trace_uri', to='main.jobai')),
+                ('material', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trace_uri_ai', to='main.materialdidactic')),
+            ],
+            options={
+                'verbose_name': 'Trace AI',
+                'verbose_name_plural': 'Trace-uri AI',
+                'ordering': ['-data_crearii'],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0011_traceai'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rezultatai',
+            name='servire',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='traceai',
+            name='servire',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
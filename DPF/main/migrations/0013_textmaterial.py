@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0012_servire'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TextMaterial',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hash_fisier', models.CharField(max_length=64)),
+                ('versiune_extractor', models.CharField(max_length=16)),
+                ('text_brut', models.TextField(blank=True)),
+                ('text_curat', models.TextField(blank=True)),
+                ('data_extragerii', models.DateTimeField(auto_now_add=True)),
+                ('material', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='texte_extrase', to='main.materialdidactic')),
+            ],
+            options={
+                'verbose_name': 'Text material',
+                'verbose_name_plural': 'Texte materiale',
+                'constraints': [models.UniqueConstraint(fields=('hash_fisier', 'versiune_extractor'), name='text_material_unic')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0013_textmaterial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaginaText',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hash_fisier', models.CharField(max_length=64)),
+                ('versiune_extractor', models.CharField(max_length=16)),
+                ('numar', models.PositiveIntegerField()),
+                ('text_brut', models.TextField(blank=True)),
+                ('text_curat', models.TextField(blank=True)),
+                ('data_extragerii', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Pagină text',
+                'verbose_name_plural': 'Pagini text',
+                'ordering': ['hash_fisier', 'numar'],
+                'constraints': [models.UniqueConstraint(fields=('hash_fisier', 'versiune_extractor', 'numar'), name='pagina_text_unica')],
+            },
+        ),
+    ]
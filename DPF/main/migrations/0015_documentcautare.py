@@ -0,0 +1,47 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def instaleaza_index(apps, schema_editor):
+    # tsvector + GIN în PostgreSQL, FTS5 + trigger-e în SQLite (main/search_index.py)
+    from main.search_index import instaleaza_index
+    instaleaza_index(schema_editor)
+
+
+def dezinstaleaza_index(apps, schema_editor):
+    from main.search_index import dezinstaleaza_index
+    dezinstaleaza_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0014_paginatext'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentCautare',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('an_studiu', models.IntegerField(choices=[(9, 'Clasa a 9-a'), (10, 'Clasa a 10-a'), (11, 'Clasa a 11-a'), (12, 'Clasa a 12-a')], db_index=True)),
+                ('titlu', models.CharField(max_length=255)),
+                ('lectie', models.CharField(max_length=255)),
+                ('descriere', models.TextField(blank=True)),
+                ('text', models.TextField(blank=True)),
+                ('hash_fisier', models.CharField(blank=True, db_index=True, max_length=64)),
+                ('data_actualizarii', models.DateTimeField(auto_now=True)),
+                ('autor', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('material', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='document_cautare', to='main.materialdidactic')),
+                ('materie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='main.materie')),
+            ],
+            options={
+                'verbose_name': 'Document căutare',
+                'verbose_name_plural': 'Documente căutare',
+            },
+        ),
+        migrations.RunPython(instaleaza_index, dezinstaleaza_index),
+    ]
@@ -250,3 +250,264 @@ class Mesaj(models.Model):
     def __str__(self):
         return f"De la {self.expeditor.username} către {self.destinatar.username} la {self.data_trimitere.strftime('%H:%M')}"
     
+
+class RezultatAI(models.Model):
+    """
+    Rezumatul și quiz-ul generate de AI pentru un material, salvate ca să nu
+    rulăm din nou pipeline-ul la fiecare afișare.
+    Cheia combină hash-ul fișierului, versiunea modelelor și parametrii de generare.
+    """
+    material = models.ForeignKey(
+        MaterialDidactic,
+        on_delete=models.CASCADE,
+        related_name='rezultate_ai'
+    )
+    cheie = models.CharField(max_length=64, unique=True)
+    hash_fisier = models.CharField(max_length=64, db_index=True)
+    versiune_model = models.CharField(max_length=64)
+    parametri = models.JSONField(default=dict)
+
+    rezumat = models.TextField(blank=True)
+    quiz = models.JSONField(default=list)
+    limba = models.CharField(max_length=10, default='en')
+    # Cu ce configurație a fost generat (nivel model, beam-uri, fallback greedy sub termen limită)
+    servire = models.JSONField(default=dict, blank=True)
+
+    data_crearii = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Rezultat AI"
+        verbose_name_plural = "Rezultate AI"
+
+    def __str__(self):
+        return f"AI: {self.material} ({self.cheie[:8]})"
+
+    def ca_rezultat_pipeline(self) -> dict:
+        """Returnează datele în formatul întors de run_full_pipeline."""
+        return {
+            'quiz_results': self.quiz,
+            'final_summary': self.rezumat,
+            'original_lang': self.limba,
+        }
+
+class JobAI(models.Model):
+    """
+    Cerere de generare AI (rezumat + quiz) pusă în coadă.
+    Este preluată de procesul `manage.py run_ai_worker`, nu de workerii web.
+    """
+    class Status(models.TextChoices):
+        IN_ASTEPTARE = 'IN_ASTEPTARE', 'În așteptare'
+        IN_LUCRU = 'IN_LUCRU', 'În lucru'
+        FINALIZAT = 'FINALIZAT', 'Finalizat'
+        ESUAT = 'ESUAT', 'Eșuat'
+
+    material = models.ForeignKey(
+        MaterialDidactic,
+        on_delete=models.CASCADE,
+        related_name='joburi_ai'
+    )
+    # Aceeași cheie ca RezultatAI: cererile identice se atașează aceluiași job
+    cheie = models.CharField(max_length=64, db_index=True)
+    hash_fisier = models.CharField(max_length=64)
+    parametri = models.JSONField(default=dict)
+
+    status = models.CharField(
+        max_length=16,
+        choices=Status.choices,
+        default=Status.IN_ASTEPTARE,
+        db_index=True
+    )
+    rezultat = models.ForeignKey(
+        RezultatAI,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='joburi'
+    )
+    eroare = models.TextField(blank=True)
+    incercari = models.PositiveSmallIntegerField(default=0)
+
+    # Progresul generării, citit de endpoint-ul SSE (ai_job_stream_view)
+    rezumat_partial = models.TextField(blank=True)
+    intrebari_partiale = models.JSONField(default=list, blank=True)
+    timp_primul_token = models.FloatField(null=True, blank=True)  # secunde de la preluarea jobului
+
+    data_crearii = models.DateTimeField(auto_now_add=True)
+    data_inceperii = models.DateTimeField(null=True, blank=True)
+    data_finalizarii = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['data_crearii']
+        verbose_name = "Job AI"
+        verbose_name_plural = "Joburi AI"
+        constraints = [
+            # Cel mult un job activ per cheie (evită generări duplicate în paralel)
+            models.UniqueConstraint(
+                fields=['cheie'],
+                condition=models.Q(status__in=['IN_ASTEPTARE', 'IN_LUCRU']),
+                name='job_ai_unic_activ_per_cheie',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Job AI #{self.pk} - {self.material} ({self.status})"
+
+    @property
+    def activ(self) -> bool:
+        return self.status in (self.Status.IN_ASTEPTARE, self.Status.IN_LUCRU)
+
+
+class MemorieTraducere(models.Model):
+    """
+    Memorie de traduceri la nivel de propoziție (Ai/translation.py).
+    O propoziție deja tradusă cu același model și aceeași pereche de limbi nu mai ajunge la model.
+    """
+    hash_propozitie = models.CharField(max_length=64)
+    pereche_limbi = models.CharField(max_length=16)  # ex. "ro-en"
+    model = models.CharField(max_length=100)
+    traducere = models.TextField()
+
+    data_crearii = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Memorie traducere"
+        verbose_name_plural = "Memorie traduceri"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['hash_propozitie', 'pereche_limbi', 'model'],
+                name='memorie_traducere_unica',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.pereche_limbi}: {self.traducere[:40]}"
+
+
+class TraceAI(models.Model):
+    """
+    Timpii și tokenii pe etape ai unei rulări a pipeline-ului AI (Ai/tracing.py),
+    păstrați per material pentru a urmări în timp unde se duce durata generării.
+    """
+    material = models.ForeignKey(
+        MaterialDidactic,
+        on_delete=models.CASCADE,
+        related_name='trace_uri_ai'
+    )
+    job = models.ForeignKey(
+        JobAI,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='trace_uri'
+    )
+    status = models.CharField(max_length=16)
+    versiune_model = models.CharField(max_length=64)
+    durata_totala = models.FloatField()  # secunde
+    servire = models.JSONField(default=dict, blank=True)  # nivelul modelului și beam-urile folosite
+    etape = models.JSONField(default=dict)  # agregat pe nume de etapă
+    detalii = models.JSONField(default=list)  # fiecare etapă, inclusiv fiecare apel generate
+
+    data_crearii = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ['-data_crearii']
+        verbose_name = "Trace AI"
+        verbose_name_plural = "Trace-uri AI"
+
+    def __str__(self):
+        return f"Trace {self.material} ({self.durata_totala:.1f}s)"
+
+
+class TextMaterial(models.Model):
+    """
+    Textul extras dintr-un PDF (main/text_extraction.py), salvat ca pagina
+    materialului și pipeline-ul AI să nu mai parcurgă PDF-ul la fiecare cerere.
+    Cheia este hash-ul fișierului + versiunea extractorului; un fișier schimbat
+    primește o intrare nouă.
+    """
+    material = models.ForeignKey(
+        MaterialDidactic,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='texte_extrase'
+    )
+    hash_fisier = models.CharField(max_length=64)
+    versiune_extractor = models.CharField(max_length=16)
+    text_brut = models.TextField(blank=True)  # exact cum l-a extras PyPDF2 (intrarea pipeline-ului AI)
+    text_curat = models.TextField(blank=True)  # după text_normalizer.normalize_text (afișat în pagina materialului)
+
+    data_extragerii = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Text material"
+        verbose_name_plural = "Texte materiale"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['hash_fisier', 'versiune_extractor'],
+                name='text_material_unic',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Text: {self.material} ({self.hash_fisier[:8]}, v{self.versiune_extractor})"
+
+
+class PaginaText(models.Model):
+    """
+    Textul unei singure pagini dintr-un PDF, pentru afișarea pagină cu pagină
+    a materialelor mari. Aceeași cheie ca TextMaterial, plus numărul paginii.
+    """
+    hash_fisier = models.CharField(max_length=64)
+    versiune_extractor = models.CharField(max_length=16)
+    numar = models.PositiveIntegerField()  # de la 1
+    text_brut = models.TextField(blank=True)
+    text_curat = models.TextField(blank=True)
+
+    data_extragerii = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['hash_fisier', 'numar']
+        verbose_name = "Pagină text"
+        verbose_name_plural = "Pagini text"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['hash_fisier', 'versiune_extractor', 'numar'],
+                name='pagina_text_unica',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Pagina {self.numar} ({self.hash_fisier[:8]}, v{self.versiune_extractor})"
+
+
+class DocumentCautare(models.Model):
+    """
+    Documentul unui material în indexul de căutare full-text (main/search_index.py):
+    o copie a câmpurilor căutate, plus anul, materia și autorul pentru filtre.
+    Indexul (tsvector + GIN în PostgreSQL, FTS5 în SQLite) se creează în migrare,
+    în afara modelului.
+    """
+    material = models.OneToOneField(
+        MaterialDidactic,
+        on_delete=models.CASCADE,
+        related_name='document_cautare'
+    )
+    an_studiu = models.IntegerField(choices=Lectie.AnStudiu.choices, db_index=True)
+    materie = models.ForeignKey(Materie, on_delete=models.CASCADE, related_name='+')
+    autor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name='+')
+
+    titlu = models.CharField(max_length=255)
+    lectie = models.CharField(max_length=255)  # titlul lecției
+    descriere = models.TextField(blank=True)
+    text = models.TextField(blank=True)  # TextMaterial.text_curat al fișierului curent, dacă a fost extras
+    hash_fisier = models.CharField(max_length=64, blank=True, db_index=True)
+
+    data_actualizarii = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Document căutare"
+        verbose_name_plural = "Documente căutare"
+
+    def __str__(self):
+        return f"Căutare: {self.material}"
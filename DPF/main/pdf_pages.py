@@ -0,0 +1,92 @@
+# DPF/main/pdf_pages.py
+"""
+Extragerea textului din pagini PDF, în paralel pe intervale de pagini.
+
+page.extract_text() din PyPDF2 este Python pur și ține GIL-ul, deci firele nu
+ajută; paginile se împart în intervale contigue, câte unul per proces, și fiecare
+proces deschide PDF-ul o singură dată. Rezultatele se unesc în ordinea paginilor.
+Sub PARALLEL_MIN_PAGES pagini (sau cu un singur worker) extragerea rămâne serială:
+pornirea și comunicarea cu procesele ar costa mai mult decât câștigul.
+
+Modulul nu importă Django: procesele din pool pornesc prin "forkserver"/"spawn"
+(nu fork direct din procesul web, care ar moșteni conexiunile la baza de date)
+și importă doar acest modul.
+"""
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, List, Sequence
+
+from PyPDF2 import PdfReader
+
+logger = logging.getLogger(__name__)
+
+PARALLEL_MIN_PAGES = int(os.getenv("DPF_PDF_PARALLEL_MIN_PAGES", "16"))
+WORKERS = int(os.getenv("DPF_PDF_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def extract_range(pdf_path: str, numere: Sequence[int]) -> List[str]:
+    """Textul paginilor date (numerotate de la 1), cu PDF-ul deschis o singură dată. Rulează în pool."""
+    reader = PdfReader(pdf_path)
+    return [reader.pages[n - 1].extract_text() or "" for n in numere]
+
+
+def split_ranges(numere: Sequence[int], parts: int) -> List[List[int]]:
+    """Împarte paginile în cel mult `parts` intervale contigue, de mărimi aproape egale."""
+    numere = list(numere)
+    parts = max(1, min(parts, len(numere)))
+    size, rest = divmod(len(numere), parts)
+    out, start = [], 0
+    for i in range(parts):
+        end = start + size + (1 if i < rest else 0)
+        out.append(numere[start:end])
+        start = end
+    return out
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            pool = _pools[workers] = ProcessPoolExecutor(max_workers=workers,
+                                                         mp_context=multiprocessing.get_context(method))
+        return pool
+
+
+def _reset_pool(workers: int) -> None:
+    with _pools_lock:
+        pool = _pools.pop(workers, None)
+    if pool:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def extract_pages(pdf_path: str, numere: Iterable[int], workers: int = None,
+                  min_pages: int = None) -> Dict[int, str]:
+    """
+    {număr pagină: text} pentru paginile cerute. Cu cel puțin `min_pages` pagini
+    (implicit PARALLEL_MIN_PAGES) și mai mulți workeri, intervalele rulează în pool.
+    """
+    numere = list(numere)
+    workers = WORKERS if workers is None else workers
+    min_pages = PARALLEL_MIN_PAGES if min_pages is None else min_pages
+    if workers <= 1 or len(numere) < max(2, min_pages):
+        return dict(zip(numere, extract_range(pdf_path, numere)))
+
+    ranges = split_ranges(numere, workers)
+    try:
+        pool = _get_pool(workers)
+        futures = [pool.submit(extract_range, pdf_path, r) for r in ranges]
+        texts = [t for f in futures for t in f.result()]
+    except (BrokenProcessPool, OSError) as e:
+        # Un pool stricat (worker omorât, limită de procese) nu trebuie să blocheze afișarea
+        logger.warning("Extragerea paralelă a eșuat (%s); se extrage serial.", e)
+        _reset_pool(workers)
+        return dict(zip(numere, extract_range(pdf_path, numere)))
+    return dict(zip(numere, texts))
@@ -0,0 +1,284 @@
+# DPF/main/search_index.py
+"""
+Căutarea full-text în materiale: titlul materialului, titlul lecției, descrierea
+și textul extras din PDF (TextMaterial.text_curat).
+
+Fiecare material are un DocumentCautare, cu câmpurile căutate și cu anul de
+studiu / materia / autorul pentru filtre. Indexul depinde de baza de date
+(instaleaza_index, apelat din migrarea 0015_documentcautare):
+
+  - PostgreSQL: coloana generată `vector` (tsvector, ponderi A-D: titlu, lecție,
+    descriere, text) cu index GIN;
+  - SQLite: tabela virtuală FTS5 main_documentcautare_fts (external content),
+    ținută la zi de trigger-e;
+  - altă bază de date sau SQLite fără FTS5: căutare cu icontains, fără scor.
+
+Documentele se actualizează incremental din semnale (main/signals.py), la
+salvarea unui material sau a unei lecții și când se extrage textul unui fișier.
+Textul unui fișier nou sau înlocuit se extrage în `manage.py run_ai_worker`,
+când coada de joburi AI este goală (indexeaza_texte_lipsa), nu în cererea web.
+`manage.py indexeaza_cautare` reconstruiește indexul pentru materialele existente.
+"""
+import logging
+import os
+import re
+from typing import List, Optional
+
+from django.db import OperationalError, connection
+from django.db.models import Q
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .ai_cache import hash_fisier
+from .models import DocumentCautare, MaterialDidactic, TextMaterial
+from . import text_extraction
+from .text_extraction import EXTRACTOR_VERSION
+
+logger = logging.getLogger(__name__)
+
+TABELA = DocumentCautare._meta.db_table
+TABELA_FTS = f"{TABELA}_fts"
+COLOANE = ("titlu", "lectie", "descriere", "text")
+# Diacriticele românești nu contează la căutare (FTS5 le ignoră cu remove_diacritics)
+DIACRITICE = ("ĂÂÎȘŞȚŢăâîșşțţ", "AAISSTTaaisstt")
+MAX_TERMENI = 10
+# Marcajele din fragmente; se înlocuiesc cu <mark> după escaparea textului
+MARCAJ_START, MARCAJ_STOP = "\x02", "\x03"
+
+_TERMEN = re.compile(r"\w+")
+# Fișierele (hash) a căror extragere a eșuat în procesul curent; nu se mai încearcă la fiecare ciclu
+_extrageri_esuate = set()
+_FARA_DIACRITICE = str.maketrans(*DIACRITICE)
+
+
+def _sql_postgresql() -> List[str]:
+    def vector(coloana, pondere):
+        return (f"setweight(to_tsvector('simple', translate(coalesce({coloana}, ''), "
+                f"'{DIACRITICE[0]}', '{DIACRITICE[1]}')), '{pondere}')")
+    return [
+        f"ALTER TABLE {TABELA} ADD COLUMN IF NOT EXISTS vector tsvector GENERATED ALWAYS AS ("
+        + " || ".join(vector(c, p) for c, p in zip(COLOANE, "ABCD")) + ") STORED",
+        f"CREATE INDEX IF NOT EXISTS {TABELA}_vector ON {TABELA} USING GIN (vector)",
+    ]
+
+
+def _sql_sqlite() -> List[str]:
+    coloane = ", ".join(COLOANE)
+    noi = ", ".join(f"new.{c}" for c in COLOANE)
+    vechi = ", ".join(f"old.{c}" for c in COLOANE)
+    sterge = f"INSERT INTO {TABELA_FTS}({TABELA_FTS}, rowid, {coloane}) VALUES ('delete', old.id, {vechi});"
+    adauga = f"INSERT INTO {TABELA_FTS}(rowid, {coloane}) VALUES (new.id, {noi});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABELA_FTS} USING fts5({coloane}, content='{TABELA}', "
+        f"content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {TABELA}_ai AFTER INSERT ON {TABELA} BEGIN {adauga} END",
+        f"CREATE TRIGGER IF NOT EXISTS {TABELA}_ad AFTER DELETE ON {TABELA} BEGIN {sterge} END",
+        f"CREATE TRIGGER IF NOT EXISTS {TABELA}_au AFTER UPDATE ON {TABELA} BEGIN {sterge} {adauga} END",
+        # Documentele existente intră în index (nimic de făcut pe o tabelă nouă)
+        f"INSERT INTO {TABELA_FTS}({TABELA_FTS}) VALUES ('rebuild')",
+    ]
+
+
+def instaleaza_index(schema_editor) -> None:
+    """
+    Creează indexul full-text pentru baza de date curentă (idempotent). Pe SQLite,
+    o migrare care reface tabela DocumentCautare pierde trigger-ele: se rulează din
+    nou, de exemplu prin `manage.py indexeaza_cautare`.
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        for sql in _sql_postgresql():
+            schema_editor.execute(sql)
+    elif vendor == "sqlite":
+        try:
+            for sql in _sql_sqlite():
+                schema_editor.execute(sql)
+        except OperationalError as e:
+            # SQLite compilat fără FTS5: căutarea rămâne cu icontains
+            logger.warning("Indexul FTS5 nu a putut fi creat (%s); căutarea va folosi icontains.", e)
+
+
+def dezinstaleaza_index(schema_editor) -> None:
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {TABELA}_vector")
+        schema_editor.execute(f"ALTER TABLE {TABELA} DROP COLUMN IF EXISTS vector")
+    elif vendor == "sqlite":
+        for trigger in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {TABELA}_{trigger}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {TABELA_FTS}")
+
+
+def motor() -> str:
+    """'postgresql', 'fts5' sau 'simplu' (icontains), după baza de date și indexul instalat."""
+    if connection.vendor == "postgresql":
+        return "postgresql"
+    if connection.vendor == "sqlite" and TABELA_FTS in connection.introspection.table_names():
+        return "fts5"
+    return "simplu"
+
+
+# --- Actualizarea documentelor ---
+
+def indexeaza_material(material: MaterialDidactic) -> DocumentCautare:
+    """Creează sau actualizează documentul materialului, cu textul extras deja salvat (dacă există)."""
+    hash_fis, text = "", ""
+    if material.fisier and os.path.exists(material.fisier.path):
+        hash_fis = hash_fisier(material.fisier.path)
+        text = TextMaterial.objects.filter(
+            hash_fisier=hash_fis, versiune_extractor=EXTRACTOR_VERSION
+        ).values_list("text_curat", flat=True).first() or ""
+    lectie = material.lectie
+    document, _ = DocumentCautare.objects.update_or_create(material=material, defaults={
+        "an_studiu": lectie.an_studiu,
+        "materie_id": lectie.materie_id,
+        "autor_id": material.autor_id,
+        "titlu": material.titlu,
+        "lectie": lectie.titlu,
+        "descriere": material.descriere,
+        "text": text,
+        "hash_fisier": hash_fis,
+    })
+    return document
+
+
+def actualizeaza_lectie(lectie) -> int:
+    return DocumentCautare.objects.filter(material__lectie=lectie).update(
+        an_studiu=lectie.an_studiu, materie_id=lectie.materie_id, lectie=lectie.titlu)
+
+
+def actualizeaza_text(text: TextMaterial) -> int:
+    """Pune textul extras în documentele materialelor cu același fișier."""
+    if text.versiune_extractor != EXTRACTOR_VERSION:
+        return 0
+    return DocumentCautare.objects.filter(hash_fisier=text.hash_fisier).update(text=text.text_curat)
+
+
+def indexeaza_texte_lipsa(limita: int = 5) -> int:
+    """
+    Extrage textul (TextMaterial) pentru cel mult `limita` documente al căror fișier
+    nu are încă text salvat; semnalul TextMaterial îl pune apoi în index.
+    Returnează câte documente au fost procesate (0 = nimic de făcut).
+    """
+    extrase = TextMaterial.objects.filter(versiune_extractor=EXTRACTOR_VERSION).values("hash_fisier")
+    documente = (DocumentCautare.objects.exclude(hash_fisier="").exclude(hash_fisier__in=extrase)
+                 .exclude(hash_fisier__in=_extrageri_esuate).select_related("material").order_by("pk")[:limita])
+    procesate = 0
+    for document in documente:
+        material = document.material
+        try:
+            if hash_fisier(material.fisier.path) != document.hash_fisier:
+                indexeaza_material(material)  # fișierul s-a schimbat de la indexare
+            else:
+                text_extraction.text_material(material)
+        except Exception:
+            logger.exception("Textul materialului %s nu a putut fi extras pentru căutare", material)
+            _extrageri_esuate.add(document.hash_fisier)
+        procesate += 1
+    return procesate
+
+
+# --- Căutarea ---
+
+def termeni(interogare: str) -> List[str]:
+    """Cuvintele interogării; operatorii și ghilimelele se ignoră, deci orice text e o interogare validă."""
+    return _TERMEN.findall(interogare.lower())[:MAX_TERMENI]
+
+
+def fragment_html(fragment: str) -> str:
+    return mark_safe(escape(fragment).replace(MARCAJ_START, "<mark>").replace(MARCAJ_STOP, "</mark>"))
+
+
+class RezultateCautare:
+    """
+    Materialele găsite, în ordinea scorului, fiecare cu atributele `scor` și
+    `fragment` (HTML). Se paginează cu django.core.paginator.Paginator: count()
+    și fiecare felie rulează o singură interogare.
+    """
+
+    def __init__(self, interogare: str, an_studiu: Optional[int] = None, materie_id: Optional[int] = None,
+                 autor_id: Optional[int] = None):
+        self.termeni = termeni(interogare)
+        self.filtre = {"an_studiu": an_studiu, "materie_id": materie_id, "autor_id": autor_id}
+        self.motor = motor()
+        self._count = None
+
+    def _where(self, alias: str):
+        conditii, parametri = [], []
+        for camp, valoare in self.filtre.items():
+            if valoare is not None:
+                conditii.append(f"{alias}.{camp} = %s")
+                parametri.append(valoare)
+        return "".join(f" AND {c}" for c in conditii), parametri
+
+    def _sql(self, limit: Optional[int] = None, offset: int = 0):
+        where, filtre = self._where("d")
+        if self.motor == "postgresql":
+            interogare = " & ".join(f"{t.translate(_FARA_DIACRITICE)}:*" for t in self.termeni)
+            evidentiere = " | ".join(f"{t}:*" for t in self.termeni)
+            baza = f"FROM {TABELA} d, to_tsquery('simple', %s) q WHERE d.vector @@ q{where}"
+            if limit is None:
+                return f"SELECT count(*) {baza}", [interogare] + filtre
+            optiuni = (f"StartSel={MARCAJ_START}, StopSel={MARCAJ_STOP}, MaxWords=30, MinWords=12, "
+                       f"MaxFragments=2, FragmentDelimiter=\" … \"")
+            return (f"SELECT d.material_id, ts_rank(d.vector, q) AS scor, "
+                    f"ts_headline('simple', d.descriere || ' ' || d.text, to_tsquery('simple', %s), %s) "
+                    f"{baza} ORDER BY scor DESC, d.material_id LIMIT %s OFFSET %s",
+                    [evidentiere, optiuni, interogare] + filtre + [limit, offset])
+
+        interogare = " ".join(f'"{t}"*' for t in self.termeni)
+        baza = f"FROM {TABELA_FTS} f JOIN {TABELA} d ON d.id = f.rowid WHERE {TABELA_FTS} MATCH %s{where}"
+        if limit is None:
+            return f"SELECT count(*) {baza}", [interogare] + filtre
+        # bm25: mai mic = mai relevant; ponderile urmează ordinea din COLOANE
+        return (f"SELECT d.material_id, -bm25({TABELA_FTS}, 10.0, 5.0, 2.0, 1.0) AS scor, "
+                f"snippet({TABELA_FTS}, -1, %s, %s, '…', 24) "
+                f"{baza} ORDER BY scor DESC, d.material_id LIMIT %s OFFSET %s",
+                [MARCAJ_START, MARCAJ_STOP, interogare] + filtre + [limit, offset])
+
+    def _simplu(self):
+        documente = DocumentCautare.objects.filter(**{k: v for k, v in self.filtre.items() if v is not None})
+        for termen in self.termeni:
+            documente = documente.filter(Q(titlu__icontains=termen) | Q(lectie__icontains=termen)
+                                         | Q(descriere__icontains=termen) | Q(text__icontains=termen))
+        return documente.order_by("titlu", "material_id")
+
+    def count(self) -> int:
+        if self._count is None:
+            if not self.termeni:
+                self._count = 0
+            elif self.motor == "simplu":
+                self._count = self._simplu().count()
+            else:
+                sql, parametri = self._sql()
+                with connection.cursor() as cursor:
+                    cursor.execute(sql, parametri)
+                    self._count = cursor.fetchone()[0]
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, felie: slice) -> List[MaterialDidactic]:
+        start, stop = felie.start or 0, felie.stop
+        if not self.termeni or stop <= start:
+            return []
+        if self.motor == "simplu":
+            randuri = [(material_id, 0.0, "") for material_id in
+                       self._simplu().values_list("material_id", flat=True)[start:stop]]
+        else:
+            sql, parametri = self._sql(limit=stop - start, offset=start)
+            with connection.cursor() as cursor:
+                cursor.execute(sql, parametri)
+                randuri = cursor.fetchall()
+
+        materiale = MaterialDidactic.objects.select_related("lectie", "lectie__materie", "autor").in_bulk(
+            [material_id for material_id, _, _ in randuri])
+        rezultate = []
+        for material_id, scor, fragment in randuri:
+            material = materiale.get(material_id)
+            if material:
+                material.scor = scor
+                material.fragment = fragment_html(fragment or "")
+                rezultate.append(material)
+        return rezultate
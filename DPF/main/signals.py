@@ -0,0 +1,35 @@
+# DPF/main/signals.py
+from django.db import transaction
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+
+from . import search_index
+from .models import Lectie, MaterialDidactic, RezultatAI, TextMaterial
+
+
+@receiver(pre_save, sender=MaterialDidactic)
+def invalideaza_rezultate_ai(sender, instance, **kwargs):
+    """Când fișierul unui material este înlocuit, rezultatele AI vechi nu mai sunt valabile."""
+    if not instance.pk:
+        return
+    vechi = sender.objects.filter(pk=instance.pk).values_list('fisier', flat=True).first()
+    if (vechi or '') != (instance.fisier.name or ''):
+        RezultatAI.objects.filter(material_id=instance.pk).delete()
+
+
+@receiver(post_save, sender=MaterialDidactic)
+def indexeaza_material(sender, instance, **kwargs):
+    """Documentul de căutare al materialului se reface după salvare (după commit, când fișierul e scris)."""
+    transaction.on_commit(lambda: search_index.indexeaza_material(instance))
+
+
+@receiver(post_save, sender=Lectie)
+def indexeaza_lectie(sender, instance, created, **kwargs):
+    if not created:
+        search_index.actualizeaza_lectie(instance)
+
+
+@receiver(post_save, sender=TextMaterial)
+def indexeaza_text(sender, instance, created, **kwargs):
+    """Textul extras (de run_ai_worker după încărcarea fișierului, de un job AI sau de extrage_texte) intră în index."""
+    search_index.actualizeaza_text(instance)
@@ -1,3 +1,66 @@
-from django.test import TestCase
+import glob
+import os
+import random
+import warnings
 
-# Create your tests here.
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from .text_normalizer import normalize_stream, normalize_text, reference_normalize
+
+# (text extras, rezultat așteptat) - rezultatele vechii clean_extracted_text
+GOLDEN = [
+    ("  infor-\nmation is power\r\nand more  ", "information is power and more"),
+    ("Intro:\n- first item\n- second item\n\n\n\nEnd", "Intro:\n- first item\n- second item\n\nEnd"),
+    ("Pași:\n1. Instalare\n2. Configurare\nfinal", "Pași:\n1. Instalare\n2. Configurare final"),
+    ("text\u00a0cu\u200b spații ,  și ( paranteze ) !", "text cu spații, și (paranteze)!"),
+    ("co\u00admpus și\u2010\ncuvânt", "co\u00admpus șicuvânt"),
+    ("linia unu\nlinia doi\n\nparagraf nou\t\t cu\ttab", "linia unu linia doi\n\nparagraf nou cu\ttab"),
+    ("marcaj ⏎ vechi\npe rând", "marcaj \n vechi pe rând"),
+    ("\u2022 bullet\n\u2022 altul\n* stea", "\u2022 bullet\n\u2022 altul\n* stea"),
+    ("", ""),
+]
+
+
+def _reference(text):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)
+        return reference_normalize(text)
+
+
+class TextNormalizerTests(SimpleTestCase):
+    def test_golden(self):
+        for raw, expected in GOLDEN:
+            with self.subTest(raw=raw):
+                self.assertEqual(normalize_text(raw), expected)
+                self.assertEqual(_reference(raw), expected)
+
+    def test_stream_golden(self):
+        for raw, expected in GOLDEN:
+            for size in (1, 3, 8):
+                with self.subTest(raw=raw, size=size):
+                    parts = [raw[i:i + 2] for i in range(0, len(raw), 2)]
+                    self.assertEqual("".join(normalize_stream(parts, chunk_chars=size)), expected)
+
+    def test_random_matches_reference(self):
+        # Fragmente care ating fiecare regulă, inclusiv la granițele dintre ele
+        alphabet = list("ab Ză\n\n\r\t\u00a0\u200b-\u2010\u00ad*\u202212.,;:?!()⏎_\f") + ["\r\n", "\n- ", "\n1. ", " \n"]
+        rnd = random.Random(0)
+        for _ in range(5000):
+            raw = "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 40)))
+            expected = _reference(raw)
+            self.assertEqual(normalize_text(raw), expected, repr(raw))
+            parts = [raw[i:i + 3] for i in range(0, len(raw), 3)]
+            self.assertEqual("".join(normalize_stream(parts, chunk_chars=rnd.randint(1, 8))), expected, repr(raw))
+
+    def test_pdf_materials_match_reference(self):
+        from .text_extraction import extract_text_from_pdf_path
+        pdfs = glob.glob(os.path.join(settings.MEDIA_ROOT or "media", "materiale_didactice", "**", "*.pdf"),
+                         recursive=True)
+        if not pdfs:
+            self.skipTest("Niciun PDF în media/materiale_didactice")
+        for path in pdfs[:5]:
+            raw = extract_text_from_pdf_path(path)
+            with self.subTest(path=path):
+                self.assertEqual(normalize_text(raw), _reference(raw))
+                self.assertEqual("".join(normalize_stream([raw], chunk_chars=512)), _reference(raw))
@@ -0,0 +1,122 @@
+# DPF/main/text_extraction.py
+"""
+Extragerea textului din PDF-urile materialelor, făcută o singură dată per versiune de fișier.
+
+Textul brut (pentru pipeline-ul AI) și cel curățat (pentru pagina materialului)
+se salvează în TextMaterial, după hash-ul fișierului și EXTRACTOR_VERSION. Un
+fișier înlocuit are alt hash, deci intrarea veche nu se mai potrivește (devine
+„veche” și poate fi ștearsă cu `manage.py extrage_texte --sterge-vechi`).
+
+Extragerea se face pe pagini (PaginaText), tot după hash și versiune: pagina
+materialului cere doar paginile afișate, iar textul întreg se compune din
+paginile deja salvate, extrăgându-le doar pe cele care lipsesc.
+"""
+import logging
+from typing import Dict, Iterable, List, Tuple
+
+from django.db import IntegrityError
+from PyPDF2 import PdfReader
+
+from . import pdf_pages
+from .ai_cache import hash_fisier
+from .models import PaginaText, TextMaterial
+from .text_normalizer import normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Se incrementează când se schimbă extragerea sau curățarea (invalidează textele salvate)
+EXTRACTOR_VERSION = "1"
+
+
+# hash fișier -> număr de pagini; citirea structurii PDF e ieftină, dar nu gratuită
+_nr_pagini_memo: Dict[str, int] = {}
+
+
+def extract_text_from_pdf_path(pdf_path: str) -> str:
+    numere = range(1, len(PdfReader(pdf_path).pages) + 1)
+    return "\n".join(extract_pages(pdf_path, numere).values())
+
+
+def extract_pages(pdf_path: str, numere: Iterable[int]) -> Dict[int, str]:
+    """Textul paginilor cerute (numerotate de la 1); documentele mari se extrag în paralel (main/pdf_pages.py)."""
+    return pdf_pages.extract_pages(pdf_path, numere)
+
+
+def numar_pagini(pdf_path: str, hash_fis: str) -> int:
+    total = _nr_pagini_memo.get(hash_fis)
+    if total is None:
+        total = _nr_pagini_memo[hash_fis] = len(PdfReader(pdf_path).pages)
+    return total
+
+
+def text_material(material) -> TextMaterial:
+    """
+    Textul salvat pentru fișierul curent al materialului; îl extrage și îl salvează
+    dacă lipsește (fișier nou, fișier schimbat sau EXTRACTOR_VERSION nouă).
+    """
+    path = material.fisier.path
+    hash_fis = hash_fisier(path)
+    # Același PDF atașat la mai multe materiale se extrage o singură dată
+    text = TextMaterial.objects.filter(hash_fisier=hash_fis, versiune_extractor=EXTRACTOR_VERSION).first()
+    if text:
+        return text
+
+    # Același rezultat ca extract_text_from_pdf_path, refolosind paginile deja salvate
+    pagini = _pagini(path, hash_fis, range(1, numar_pagini(path, hash_fis) + 1))
+    brut = "\n".join(p.text_brut for p in pagini)
+    try:
+        text = TextMaterial.objects.create(
+            material=material,
+            hash_fisier=hash_fis,
+            versiune_extractor=EXTRACTOR_VERSION,
+            text_brut=brut,
+            text_curat=normalize_text(brut),
+        )
+    except IntegrityError:
+        # Altă cerere a salvat între timp același fișier
+        text = TextMaterial.objects.get(hash_fisier=hash_fis, versiune_extractor=EXTRACTOR_VERSION)
+    logger.info("Text extras pentru %s (%d caractere)", material, len(brut))
+    return text
+
+
+def texte_vechi(hashuri_curente):
+    """Intrările care nu mai corespund niciunui fișier curent sau sunt dintr-o versiune veche a extractorului."""
+    return (TextMaterial.objects.exclude(versiune_extractor=EXTRACTOR_VERSION)
+            | TextMaterial.objects.exclude(hash_fisier__in=hashuri_curente))
+
+
+def _pagini(path: str, hash_fis: str, numere: Iterable[int]) -> List[PaginaText]:
+    """Paginile cerute, din PaginaText; cele lipsă se extrag acum și se salvează."""
+    numere = list(numere)
+    existente = {p.numar: p for p in PaginaText.objects.filter(
+        hash_fisier=hash_fis, versiune_extractor=EXTRACTOR_VERSION, numar__in=numere)}
+    lipsa = [n for n in numere if n not in existente]
+    if lipsa:
+        noi = [
+            PaginaText(hash_fisier=hash_fis, versiune_extractor=EXTRACTOR_VERSION, numar=n,
+                       text_brut=brut, text_curat=normalize_text(brut))
+            for n, brut in extract_pages(path, lipsa).items()
+        ]
+        # Cereri concurente pot extrage aceeași pagină; prima salvare câștigă
+        PaginaText.objects.bulk_create(noi, ignore_conflicts=True)
+        existente.update({p.numar: p for p in noi})
+        logger.info("Extrase %d pagini din %s", len(noi), path)
+    return [existente[n] for n in numere]
+
+
+def pagini_material(material, de_la: int, numar: int) -> Tuple[List[PaginaText], int]:
+    """
+    Paginile [de_la, de_la + numar) ale materialului și numărul total de pagini.
+    Se extrag doar paginile care nu sunt deja salvate.
+    """
+    path = material.fisier.path
+    hash_fis = hash_fisier(path)
+    total = numar_pagini(path, hash_fis)
+    numere = range(max(1, de_la), min(total, de_la + numar - 1) + 1)
+    return _pagini(path, hash_fis, numere), total
+
+
+def pagini_vechi(hashuri_curente):
+    """Ca texte_vechi, pentru paginile salvate."""
+    return (PaginaText.objects.exclude(versiune_extractor=EXTRACTOR_VERSION)
+            | PaginaText.objects.exclude(hash_fisier__in=hashuri_curente))
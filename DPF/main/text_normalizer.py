@@ -0,0 +1,128 @@
+# DPF/main/text_normalizer.py
+"""
+Normalizarea textului extras din PDF (pentru pagina materialului).
+
+Rezultatul este identic cu vechea funcție clean_extracted_text din views (păstrată
+aici ca reference_normalize, pentru teste și benchmark), dar cu mai puține treceri
+prin motorul re, toate cu expresii compilate o singură dată:
+
+  - rândurile: în loc de marcaj + o substituție pe fiecare \\n, expresia găsește
+    doar rândurile care rămân (rânduri goale, elemente de listă), iar restul de
+    \\n devin spații cu un singur str.replace;
+  - spațiile multiple (PyPDF2 pune des trei spații între cuvinte) se comprimă cu
+    str.replace când textul nu conține tab-uri;
+  - spațiile dinaintea punctuației și a lui „)” se șterg într-o singură trecere;
+  - expresiile încep cu un caracter fix (nu cu un lookbehind), ca motorul re să
+    sară rapid peste text.
+
+Toate regulile privesc doar vecinătatea spațiilor, a cratimelor și a marcajelor
+de listă, deci un text mare se poate normaliza pe bucăți tăiate între două
+litere (normalize_stream): tăietura nu poate cădea în interiorul unei potriviri
+și nici în contextul ei.
+"""
+import re
+from typing import Iterable, Iterator
+
+# Bucățile din normalize_stream: destul de mari cât costul per apel să nu conteze
+CHUNK_CHARS = 1 << 20
+
+# Aceleași caractere ca vechea clasă (scrisă ambiguu, cu FutureWarning):
+# cratimă, hyphen (U+2010), soft hyphen
+_HYPHENATION = re.compile(r'[\-\u2010\u00ad]\n(?<=\w[\-\u2010\u00ad]\n)(?=\w)')
+# Rândurile care nu se unesc: mai multe \n la rând sau \n înaintea unui element de listă
+_KEPT_NEWLINES = re.compile(r'\n\n+|\n(?=\s*(?:[\-\*\u2022]|[0-9]{1,2}\.)\s+)')
+_SPACES = re.compile(r'[ \t]{2,}')
+_BLANK_LINES = re.compile(r'\n{3,}')
+_SPACE_BEFORE_PUNCT = re.compile(r'\s+([,.;:?!)])')
+_SPACE_AFTER_PAREN = re.compile(r'\(\s+')
+# Tăieturi sigure pentru normalize_stream: între două litere
+_SAFE_CUT = re.compile(r'[^\W\d_](?=[^\W\d_])')
+
+
+def _mark_newlines(m: re.Match) -> str:
+    return '⏎' * len(m.group())
+
+
+def _collapse_spaces(t: str) -> str:
+    if '\t' in t:
+        return _SPACES.sub(' ', t)
+    # Doar spații: înjumătățirea repetată a perechilor dă același rezultat, mult mai repede
+    while '  ' in t:
+        t = t.replace('  ', ' ')
+    return t
+
+
+def _normalize(t: str) -> str:
+    """Normalizarea fără strip (comună pentru text întreg și bucăți)."""
+    t = t.replace("\r\n", "\n").replace("\r", "\n").replace("\u00a0", " ").replace("\u200b", "")
+    t = _HYPHENATION.sub('', t)
+    # Ca în vechea funcție, „⏎” este marcajul rândurilor păstrate (și orice „⏎” din text devine \n)
+    t = _KEPT_NEWLINES.sub(_mark_newlines, t).replace('\n', ' ').replace('⏎', '\n')
+    t = _collapse_spaces(t)
+    t = _BLANK_LINES.sub('\n\n', t)
+    t = _SPACE_BEFORE_PUNCT.sub(r'\1', t)
+    return _SPACE_AFTER_PAREN.sub('(', t)
+
+
+def normalize_text(raw: str) -> str:
+    """Textul extras din PDF, cu rânduri unite în paragrafe și spații curățate."""
+    return _normalize(raw).strip()
+
+
+def _cut(text: str, start: int) -> int:
+    """Prima tăietură sigură de la `start` încolo (între două litere) sau -1."""
+    m = _SAFE_CUT.search(text, start)
+    return m.end() if m else -1
+
+
+def normalize_stream(chunks: Iterable[str], chunk_chars: int = CHUNK_CHARS) -> Iterator[str]:
+    """
+    Ca normalize_text pe concatenarea bucăților, dar în bucăți de ~chunk_chars:
+    ''.join(normalize_stream(bucăți)) == normalize_text(''.join(bucăți)).
+    """
+    buffer, first = "", True
+    for chunk in chunks:
+        buffer += chunk
+        while len(buffer) > chunk_chars:
+            cut = _cut(buffer, chunk_chars)
+            if cut < 0:
+                break
+            out = _normalize(buffer[:cut])
+            buffer = buffer[cut:]
+            if first:
+                out, first = out.lstrip(), False
+            yield out
+    out = _normalize(buffer)
+    yield out.strip() if first else out.rstrip()
+
+
+def reference_normalize(raw: str) -> str:
+    """Vechea implementare (zece treceri), referința pentru teste și benchmark."""
+    # 1) normalize newlines/spaces
+    t = raw.replace("\r\n", "\n").replace("\r", "\n")
+    t = t.replace("\u00a0", " ")  # NBSP -> space
+    t = t.replace("\u200b", "")  # zero-width space
+
+    # 2) fix hyphenation at line breaks: "infor-\nmation" -> "information"
+    t = re.sub(r'(?<=\w)[\----‐­]\n(?=\w)', '', t)  # includes soft-hyphen variants
+
+    # 3) protect list items & headings so we don't collapse their line breaks
+    # mark newlines before bullets / numbered items / all-caps headings
+    t = re.sub(r'\n(?=\s*(?:[\-\*\u2022]|[0-9]{1,2}\.)\s+)', '⏎', t)
+
+    # 4) merge single line-breaks inside paragraphs into spaces (keep blank lines)
+    t = re.sub(r'(?<!\n)\n(?!\n)', ' ', t)
+
+    # 5) restore protected newlines
+    t = t.replace('⏎', '\n')
+
+    # 6) collapse multiple spaces/tabs and excessive blank lines
+    t = re.sub(r'[ \t]{2,}', ' ', t)
+    t = re.sub(r'\n{3,}', '\n\n', t)
+
+    # 7) tidy spacing around punctuation
+    t = re.sub(r'\s+([,.;:?!])', r'\1', t)
+    t = re.sub(r'\(\s+', '(', t)
+    t = re.sub(r'\s+\)', ')', t)
+
+    return t.strip()
@@ -12,7 +12,11 @@ urlpatterns = [
     path('import-elevi/', views.import_elevi_view, name='import_elevi'),
     path('quiz/',views.quiz_view, name='quiz'),
     path("lectii/<int:lectie_id>/ai/", views.lectie_ai_view, name="lectie_ai"),
+    path("ai/job/<int:job_id>/", views.ai_job_status_view, name="ai_job_status"),
+    path("ai/job/<int:job_id>/stream/", views.ai_job_stream_view, name="ai_job_stream"),
     path("material/<int:pk>/", views.material_text_view, name="material_text"),
+    path("material/<int:pk>/pagini/", views.material_pagini_view, name="material_pagini"),
+    path("cautare/", views.cautare_view, name="cautare"),
     path("api/summarize-selection/", views.api_summarize_selection, name="api_summarize_selection"),
     path('lectie_ai/<int:lectie_id>/', views.lectie_ai_view, name='lectie_ai'),
     path('quiz/', views.quiz_view, name='quiz'),
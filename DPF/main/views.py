@@ -1,14 +1,18 @@
 # DPF/main/views.py
+import asyncio
 import json
 import os
-import tempfile
-import re
+import time
 from pathlib import Path
 
-from PyPDF2 import PdfReader
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
-from django.http import Http404, JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.core.paginator import Paginator
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
+from django.template.loader import render_to_string
 from django.contrib.auth import login, authenticate, logout
 from django.contrib.auth.forms import AuthenticationForm
 from django.contrib import messages
@@ -16,13 +20,13 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.admin.views.decorators import staff_member_required # Importat o singură dată
 from django.db import transaction
 from django import forms # Necesar pentru 'raise forms.ValidationError'
-from Ai.ai_pipeline import run_full_pipeline  # adjust import
-from .models import MaterialDidactic, User, ElevProfile, ProfesorProfile, Lectie, Mesaj # Adaugă Mesaj
+from .models import MaterialDidactic, User, ElevProfile, ProfesorProfile, Lectie, Materie, Mesaj, JobAI # Adaugă Mesaj
+from . import ai_cache, ai_jobs, search_index, text_extraction
+from Ai.tracing import PipelineTrace
 from django.db.models import Q, Count, Max  # Asigură-te că Q este importat
 from django.http import HttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from dotenv import load_dotenv
-from openai import OpenAI
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 load_dotenv(BASE_DIR / ".env")
@@ -351,11 +355,6 @@ def quiz_view(request):
     return render(request, 'main/quiz.html', {'quiz': quiz})
 
 
-def _extract_text_from_pdf_path(pdf_path: str) -> str:
-    reader = PdfReader(pdf_path)
-    return "\n".join((page.extract_text() or "") for page in reader.pages)
-
-
 def lectie_ai_view(request, lectie_id: int):
     lectie = get_object_or_404(Lectie, pk=lectie_id)
 
@@ -372,30 +371,40 @@ def lectie_ai_view(request, lectie_id: int):
             "error": "Nu există niciun fișier PDF asociat acestei lecții."
         })
 
-    pdf_path = material.fisier.path  # local storage ⇒ this works
-
-    # If your pipeline ALREADY accepts PDFs, you can do:
-    # result = run_full_pipeline(pdf_path, num_questions=7, max_tokens_summ=150)
-
-    # Otherwise: extract text → write to a temp .txt → call run_full_pipeline(path_to_txt)
-    text = _extract_text_from_pdf_path(pdf_path)
-    if not text.strip():
+    # Rezultatele sunt salvate în DB după hash-ul fișierului + versiunea modelelor + parametri
+    parametri = ai_cache.parametri_lectie()
+    trace = PipelineTrace(f"lectie_ai {lectie_id}")
+    with trace.stage("cache_lookup"):
+        cheie, hash_fis, rezultat_salvat = ai_cache.cauta_rezultat(material, parametri)
+
+    if not rezultat_salvat:
+        # Generarea rulează în `manage.py run_ai_worker`; aici doar punem cererea în coadă
+        # (sau ne atașăm jobului deja pornit pentru aceeași lecție) și pagina face polling.
+        ultimul_job = JobAI.objects.filter(cheie=cheie).order_by("-data_crearii").first()
+        if ultimul_job and ultimul_job.status == JobAI.Status.ESUAT and not request.GET.get("reincearca"):
+            return render(request, "main/lectie_ai.html", {
+                "lectie": lectie,
+                "material": material,
+                "error": ultimul_job.eroare or "Procesarea nu a returnat rezultat.",
+                "poate_reincerca": True,
+            })
+
+        with trace.stage("enqueue"):
+            job = ai_jobs.pune_in_coada(material, cheie, hash_fis, parametri)
+        trace.log()
         return render(request, "main/lectie_ai.html", {
             "lectie": lectie,
             "material": material,
-            "error": "PDF-ul pare gol sau scanat (fără text). Pentru PDF-uri scanate ai nevoie de OCR."
+            "job": job,
+            "pozitie": ai_jobs.pozitie_in_coada(job),
+            "ai_streaming": _streaming_disponibil(request),
         })
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".txt", mode="w", encoding="utf-8") as tmp:
-        tmp.write(text)
-        tmp_path = tmp.name
-
-    try:
-        result = run_full_pipeline(tmp_path, num_questions=7, max_tokens_summ=150)
-    finally:
-        try: os.unlink(tmp_path)
-        except OSError: pass
+    # Un rezultat generat sub termen limită (model mic, mai puține beam-uri) se afișează,
+    # dar se regenerează o dată la calitate completă, sub aceeași cheie
+    ai_jobs.rafineaza_rezultat(rezultat_salvat)
 
+    result = rezultat_salvat.ca_rezultat_pipeline()
     quiz_raw = result.get("quiz_results") or []
 
     # normalize keys
@@ -407,52 +416,105 @@ def lectie_ai_view(request, lectie_id: int):
             "answer": item.get("answer") or item.get("answer_text") or "",
         })
 
-    if not result:
-        return render(request, "main/lectie_ai.html", {
+    with trace.stage("render"):
+        response = render(request, "main/lectie_ai.html", {
             "lectie": lectie,
             "material": material,
-            "error": "Procesarea nu a returnat rezultat."
+            "summary": result.get("final_summary", ""),
+            "quiz": quiz,  # <— normalized
+            "lang": result.get("original_lang", "en"),
         })
+    trace.log()
+    return response
 
-    return render(request, "main/lectie_ai.html", {
-        "lectie": lectie,
-        "material": material,
-        "summary": result.get("final_summary", ""),
-        "quiz": quiz,  # <— normalized
-        "lang": result.get("original_lang", "en"),
-    })
+# Cât ține deschisă o conexiune SSE; după aceea pagina se reîncarcă și se reconectează
+AI_STREAM_TIMEOUT = 300
+AI_STREAM_INTERVAL = 0.2
 
-@login_required # Accesibil doar utilizatorilor logați
-def material_text_view(request, pk):
-    def clean_extracted_text(raw: str) -> str:
-        # 1) normalize newlines/spaces
-        t = raw.replace("\r\n", "\n").replace("\r", "\n")
-        t = t.replace("\u00a0", " ")  # NBSP -> space
-        t = t.replace("\u200b", "")  # zero-width space
 
-        # 2) fix hyphenation at line breaks: "infor-\nmation" -> "information"
-        t = re.sub(r'(?<=\w)[\----‐­]\n(?=\w)', '', t)  # includes soft-hyphen variants
+def _eveniment_sse(tip: str, date) -> str:
+    return f"event: {tip}\ndata: {json.dumps(date, ensure_ascii=False)}\n\n"
 
-        # 3) protect list items & headings so we don't collapse their line breaks
-        # mark newlines before bullets / numbered items / all-caps headings
-        t = re.sub(r'\n(?=\s*(?:[\-\*\u2022]|[0-9]{1,2}\.)\s+)', '⏎', t)
 
-        # 4) merge single line-breaks inside paragraphs into spaces (keep blank lines)
-        t = re.sub(r'(?<!\n)\n(?!\n)', ' ', t)
+def _streaming_disponibil(request) -> bool:
+    """
+    SSE doar cu AI_STREAMING și sub un server ASGI: acolo o conexiune deschisă
+    așteaptă în bucla de evenimente. Sub WSGI (gunicorn cu workeri sync) ar ține
+    ocupat un worker web cât durează generarea, deci pagina folosește polling.
+    """
+    return settings.AI_STREAMING and isinstance(request, ASGIRequest)
 
-        # 5) restore protected newlines
-        t = t.replace('⏎', '\n')
 
-        # 6) collapse multiple spaces/tabs and excessive blank lines
-        t = re.sub(r'[ \t]{2,}', ' ', t)
-        t = re.sub(r'\n{3,}', '\n\n', t)
+async def ai_job_stream_view(request, job_id: int):
+    """
+    Progresul unui job AI ca server-sent events: `token` (fragment nou din rezumat),
+    `rezumat` (rezumatul complet, înlocuiește ce s-a afișat), `intrebare`, `stare`.
+    Jobul rulează în run_ai_worker; aici doar citim periodic progresul salvat în JobAI.
+    View asincron: între citiri conexiunea nu ocupă niciun fir de execuție.
+    """
+    if not _streaming_disponibil(request) or not await JobAI.objects.filter(pk=job_id).aexists():
+        raise Http404()
+    pozitie_in_coada = sync_to_async(ai_jobs.pozitie_in_coada)
+
+    async def evenimente():
+        rezumat_trimis, intrebari_trimise, stare_trimisa = None, 0, None
+        ultimul_mesaj = time.monotonic()
+        limita = time.monotonic() + AI_STREAM_TIMEOUT
+        while time.monotonic() < limita:
+            job = await JobAI.objects.aget(pk=job_id)
+
+            rezumat = job.rezumat_partial
+            if rezumat_trimis is not None and rezumat != rezumat_trimis and rezumat.startswith(rezumat_trimis):
+                yield _eveniment_sse("token", rezumat[len(rezumat_trimis):])
+            elif rezumat != rezumat_trimis:
+                yield _eveniment_sse("rezumat", rezumat)
+            rezumat_trimis = rezumat
+
+            intrebari = job.intrebari_partiale or []
+            if len(intrebari) < intrebari_trimise:
+                intrebari_trimise = 0  # jobul a fost reluat de la zero
+                yield _eveniment_sse("rezumat", rezumat)
+            for intrebare in intrebari[intrebari_trimise:]:
+                yield _eveniment_sse("intrebare", intrebare)
+            intrebari_trimise = len(intrebari)
+
+            stare = {"status": job.status, "pozitie": await pozitie_in_coada(job), "eroare": job.eroare}
+            if stare != stare_trimisa:
+                yield _eveniment_sse("stare", stare)
+                stare_trimisa = stare
+                ultimul_mesaj = time.monotonic()
+            if not job.activ:
+                return
+
+            if time.monotonic() - ultimul_mesaj > 15:
+                yield ": ping\n\n"  # ține conexiunea deschisă prin proxy-uri
+                ultimul_mesaj = time.monotonic()
+            await asyncio.sleep(AI_STREAM_INTERVAL)
+        yield _eveniment_sse("timeout", {})
+
+    response = StreamingHttpResponse(evenimente(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def ai_job_status_view(request, job_id: int):
+    """Starea unui job AI, interogată periodic de pagina lectie_ai."""
+    job = get_object_or_404(JobAI, pk=job_id)
+    return JsonResponse({
+        "id": job.pk,
+        "status": job.status,
+        "activ": job.activ,
+        "pozitie": ai_jobs.pozitie_in_coada(job),
+        "eroare": job.eroare,
+    })
+
+# Pagina materialului afișează imediat primele pagini; restul vin la scroll, în loturi
+PAGINI_INITIALE = 3
+PAGINI_PE_CERERE = 5
 
-        # 7) tidy spacing around punctuation
-        t = re.sub(r'\s+([,.;:?!])', r'\1', t)
-        t = re.sub(r'\(\s+', '(', t)
-        t = re.sub(r'\s+\)', ')', t)
 
-        return t.strip()
+def _material_vizibil(request, pk):
     material = get_object_or_404(MaterialDidactic.objects.select_related("lectie", "lectie__materie", "autor"),pk=pk,)
 
     # Access control similar to your materii_view
@@ -466,13 +528,86 @@ def material_text_view(request, pk):
     elif request.user.rol == User.Rol.PROFESOR:
         if material.autor_id != request.user.id:
             raise Http404()
+    return material
+
+
+@login_required # Accesibil doar utilizatorilor logați
+def material_text_view(request, pk):
+    material = _material_vizibil(request, pk)
 
-    text = _extract_text_from_pdf_path(material.fisier.path)
-    text = clean_extracted_text(text)
+    # Doar primele pagini se extrag (o dată per versiune a fișierului) înainte de răspuns
+    pagini, total = text_extraction.pagini_material(material, 1, PAGINI_INITIALE)
 
     return render(request, "main/material_text.html", {
         "material": material,
-        "text": text,
+        "pagini": pagini,
+        "total_pagini": total,
+        "urmatoarea": PAGINI_INITIALE + 1 if total > PAGINI_INITIALE else None,
+    })
+
+
+@login_required
+def material_pagini_view(request, pk):
+    """Următoarele pagini ale materialului (fragment HTML în JSON), cerute de pagina materialului la scroll."""
+    material = _material_vizibil(request, pk)
+    try:
+        de_la = max(1, int(request.GET.get("de_la", 1)))
+    except ValueError:
+        return JsonResponse({"error": "Parametrul de_la trebuie să fie un număr."}, status=400)
+
+    pagini, total = text_extraction.pagini_material(material, de_la, PAGINI_PE_CERERE)
+    urmatoarea = de_la + PAGINI_PE_CERERE
+    return JsonResponse({
+        "html": render_to_string("main/_pagini_material.html", {"pagini": pagini}, request=request),
+        "urmatoarea": urmatoarea if urmatoarea <= total else None,
+        "total": total,
+    })
+
+
+REZULTATE_PE_PAGINA = 10
+
+
+def _numar_sau_none(valoare):
+    try:
+        return int(valoare)
+    except (TypeError, ValueError):
+        return None
+
+
+@login_required
+def cautare_view(request):
+    """Căutare full-text în materialele vizibile utilizatorului, filtrată pe an de studiu și materie."""
+    interogare = request.GET.get("q", "").strip()
+    an = _numar_sau_none(request.GET.get("an"))
+    materie = _numar_sau_none(request.GET.get("materie"))
+    autor = None
+    poate_cauta = True
+
+    # Aceleași reguli ca în materii_view: elevul vede anul lui, profesorul materialele proprii
+    if request.user.rol == User.Rol.ELEV:
+        try:
+            an = request.user.elev_profile.an_studiu
+        except ElevProfile.DoesNotExist:
+            poate_cauta = False
+    elif request.user.rol == User.Rol.PROFESOR:
+        autor = request.user.id
+
+    rezultate = []
+    if interogare and poate_cauta:
+        rezultate = search_index.RezultateCautare(interogare, an_studiu=an, materie_id=materie, autor_id=autor)
+    pagina = Paginator(rezultate, REZULTATE_PE_PAGINA).get_page(request.GET.get("pagina"))
+
+    parametri = request.GET.copy()
+    parametri.pop("pagina", None)
+    return render(request, "main/cautare.html", {
+        "interogare": interogare,
+        "an": an,
+        "materie": materie,
+        "ani": Lectie.AnStudiu.choices,
+        "alege_anul": request.user.rol != User.Rol.ELEV,
+        "materii": Materie.objects.all(),
+        "pagina": pagina,
+        "parametri": parametri.urlencode(),
     })
 
 def api_summarize_selection(request):
@@ -538,6 +673,8 @@ def api_summarize_selection(request):
     # --- OpenAI call ---
     try:
         # Works with the OpenAI Python SDK v1.x
+        # Import local: SDK-ul costă ~1s la import și nu e necesar la pornirea procesului
+        from openai import OpenAI
         client = OpenAI(api_key=api_key)
 
         system_msg = (